@@ -0,0 +1,125 @@
+"""
+Command line tools for build steps, run with
+
+    python -m configurator.cli <command> [options]
+"""
+import sys
+import json
+import argparse
+
+from configurator.utils.config import Config
+from configurator.utils.configurator_exception import ConfiguratorException
+from configurator.utils.corpus_snapshot import CorpusSnapshot
+from configurator.utils.schema_defs import defs_options
+from configurator.utils.schema_export import SCHEMA_FORMATS, export_options, to_ndjson, to_zip
+from configurator.utils.summary_index import SummaryIndex
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def snapshot(args) -> int:
+    """Compile the input corpus into a snapshot file."""
+    output = args.output or Config.get_instance().CORPUS_SNAPSHOT
+    if not output:
+        logger.error("No snapshot path, use --output or set CORPUS_SNAPSHOT")
+        return 2
+    print(json.dumps(CorpusSnapshot.build(output), indent=2))
+    return 0
+
+
+def index(args) -> int:
+    """Rebuild the summary indexes of the configuration and type folders."""
+    from configurator.services.configuration_services import Configuration
+    from configurator.services.type_services import Type
+    config = Config.get_instance()
+    summary_index = SummaryIndex.get_instance()
+    summary_index.drop(config.CONFIGURATION_FOLDER)
+    summary_index.drop(config.TYPE_FOLDER)
+    print(json.dumps({
+        "collections": len(Configuration.get_collections_summary()),
+        "types": len(Type.get_types_summary()),
+    }, indent=2))
+    return 0
+
+
+def export(args) -> int:
+    """Render every configuration version to NDJSON or a zip archive."""
+    from configurator.services.configuration_services import Configuration
+    formats, _ = export_options({"formats": args.formats})
+    defs = defs_options({"defs": args.defs, "min_uses": args.min_uses, "min_size": args.min_size})
+    records = Configuration.export_schemas(formats, defs)
+    errors = []
+    def checked(records):
+        for record in records:
+            if "error" in record:
+                errors.append(record)
+            yield record
+    if args.output.endswith(".zip"):
+        counts = to_zip(checked(records), args.output)
+        print(json.dumps(counts, indent=2))
+    elif args.output == "-":
+        sys.stdout.writelines(to_ndjson(checked(records)))
+    else:
+        with open(args.output, "w") as f:
+            f.writelines(to_ndjson(checked(records)))
+    for record in errors:
+        logger.error(f"Failed to render {record['configuration']} {record['version']}")
+    return 1 if errors else 0
+
+
+def profile(args) -> int:
+    """Render one configuration version under a RenderProfile and write its
+    render stacks as a collapsed stack (flame graph) file."""
+    from configurator.services.configuration_services import Configuration
+    schema_format = "both" if args.format == "schemas" else args.format
+    _, render_profile = Configuration(args.configuration).profile_schema(args.version, schema_format)
+    if args.output == "-":
+        sys.stdout.write(render_profile.to_collapsed())
+    else:
+        with open(args.output, "w") as f:
+            f.write(render_profile.to_collapsed())
+        print(json.dumps(render_profile.to_dict(), indent=2))
+    return 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m configurator.cli", description="MongoDB Configurator build tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = commands.add_parser("snapshot", help="Compile INPUT_FOLDER into a corpus snapshot")
+    snapshot_parser.add_argument("--output", help="Snapshot file to write, defaults to CORPUS_SNAPSHOT")
+    snapshot_parser.set_defaults(handler=snapshot)
+
+    index_parser = commands.add_parser("index", help="Rebuild the collection and type summary indexes of INPUT_FOLDER")
+    index_parser.set_defaults(handler=index)
+
+    export_parser = commands.add_parser("export", help="Render every configuration version of INPUT_FOLDER")
+    export_parser.add_argument("--output", default="-", help="NDJSON file, a .zip archive, or - (default) for NDJSON on stdout")
+    export_parser.add_argument("--formats", default=",".join(SCHEMA_FORMATS), help="Comma separated schema formats (default json,bson)")
+    export_parser.add_argument("--defs", action="store_true", help="Move repeated JSON subschemas to $defs")
+    export_parser.add_argument("--min-uses", type=int, default=2, help="With --defs, minimum uses of a subschema")
+    export_parser.add_argument("--min-size", type=int, default=100, help="With --defs, minimum inline size of a subschema")
+    export_parser.set_defaults(handler=export)
+
+    profile_parser = commands.add_parser("profile", help="Profile the render of a configuration version")
+    profile_parser.add_argument("configuration", help="Configuration file name, e.g. sample.yaml")
+    profile_parser.add_argument("version", help="Version, e.g. 1.0.0.1")
+    profile_parser.add_argument("--format", choices=["json", "bson", "schemas"], default="json", help="Schema to render (default json)")
+    profile_parser.add_argument("--output", default="-", help="Collapsed stack file, or - (default) for stdout. With a file the profile summary is printed")
+    profile_parser.set_defaults(handler=profile)
+
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = create_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except ConfiguratorException as e:
+        logger.error(f"{args.command} failed: {json.dumps(e.to_dict(), default=str)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
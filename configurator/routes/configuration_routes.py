@@ -1,9 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from configurator.services.configuration_services import Configuration
 from configurator.services.template_service import TemplateService
 from configurator.utils.config import Config
 from configurator.utils.file_io import FileIO
+from configurator.utils.render_profile import profile_option
 from configurator.utils.route_decorators import event_route
+from configurator.utils.schema_defs import defs_options
+from configurator.utils.schema_export import export_options, to_ndjson, to_zip_stream
 import logging
 
 
@@ -17,7 +20,7 @@ def create_configuration_routes():
     @blueprint.route('/', methods=['GET'])
     @event_route("CFG-01", "GET_CONFIGURATIONS", "listing configurations")
     def get_configurations():
-        files = FileIO.get_documents(config.CONFIGURATION_FOLDER)
+        files = FileIO.get_documents(config.CONFIGURATION_FOLDER, request.args)
         return jsonify([file.to_dict() for file in files])
 
     @blueprint.route('/', methods=['POST'])
@@ -76,22 +79,54 @@ def create_configuration_routes():
     @event_route("CFG-ROUTES-10a", "GET_JSON_SCHEMA_LATEST", "getting JSON schema for latest version")
     def get_json_schema_latest(file_name):
         configuration = Configuration(file_name)
-        schema = configuration.get_json_schema_latest()
+        schema = configuration.get_json_schema_latest(defs_options(request.args))
         return jsonify(schema)
 
     @blueprint.route('json_schema/<file_name>/<version>/', methods=['GET'])
     @event_route("CFG-ROUTES-10", "GET_JSON_SCHEMA", "getting JSON schema")
     def get_json_schema(file_name, version):
         configuration = Configuration(file_name)
-        schema = configuration.get_json_schema(version)
+        if profile_option(request.args):
+            schema, profile = configuration.profile_schema(version, "json")
+            return jsonify({"schema": schema, "profile": profile.to_dict()})
+        schema = configuration.get_json_schema(version, defs_options(request.args))
         return jsonify(schema)
 
     @blueprint.route('bson_schema/<file_name>/<version>/', methods=['GET'])
     @event_route("CFG-ROUTES-11", "GET_BSON_SCHEMA", "getting BSON schema")
     def get_bson_schema(file_name, version):
         configuration = Configuration(file_name)
+        if profile_option(request.args):
+            schema, profile = configuration.profile_schema(version, "bson")
+            return jsonify({"schema": schema, "profile": profile.to_dict()})
         schema = configuration.get_bson_schema(version)
         return jsonify(schema)
 
+    @blueprint.route('schemas/<file_name>/<version>/', methods=['GET'])
+    @event_route("CFG-ROUTES-12", "GET_SCHEMAS", "getting JSON and BSON schemas")
+    def get_schemas(file_name, version):
+        configuration = Configuration(file_name)
+        if profile_option(request.args):
+            schemas, profile = configuration.profile_schema(version, "both")
+            return jsonify({**schemas, "profile": profile.to_dict()})
+        schemas = configuration.get_schemas(version)
+        return jsonify(schemas)
+
+    @blueprint.route('analysis/<file_name>/<version>/', methods=['GET'])
+    @event_route("CFG-ROUTES-14", "ANALYZE_SCHEMA", "analyzing schema")
+    def analyze_schema(file_name, version):
+        configuration = Configuration(file_name)
+        return jsonify(configuration.analyze(version))
+
+    @blueprint.route('export/', methods=['GET'])
+    @event_route("CFG-ROUTES-13", "EXPORT_SCHEMAS", "exporting schemas")
+    def export_schemas():
+        formats, output = export_options(request.args)
+        records = Configuration.export_schemas(formats, defs_options(request.args))
+        if output == "zip":
+            return Response(stream_with_context(to_zip_stream(records)), mimetype="application/zip",
+                            headers={"Content-Disposition": "attachment; filename=schemas.zip"})
+        return Response(stream_with_context(to_ndjson(records)), mimetype="application/x-ndjson")
+
     logger.info("configuration Flask Routes Registered")
     return blueprint 
\ No newline at end of file
@@ -3,6 +3,7 @@ from configurator.utils.config import Config
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 from configurator.utils.file_io import FileIO
 from configurator.services.dictionary_services import Dictionary
+from configurator.services.dependency_graph import DependencyGraph, DICTIONARY
 from configurator.utils.route_decorators import event_route
 import logging
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ def create_dictionary_routes():
     @dictionary_routes.route('/', methods=['GET'])
     @event_route("DIC-01", "GET_DICTIONARIES", "listing dictionaries")
     def get_dictionaries():
-        files = FileIO.get_documents(config.DICTIONARY_FOLDER)
+        files = FileIO.get_documents(config.DICTIONARY_FOLDER, request.args)
         return jsonify([file.to_dict() for file in files])
     
     # PATCH /api/dictionaries/ - Lock All Dictionaries
@@ -43,6 +44,12 @@ def create_dictionary_routes():
         result = dictionary.save()
         return jsonify(result)
     
+    # GET /api/dictionaries/<file_name>/dependents/ - Return what uses the dictionary and the schemas it affects
+    @dictionary_routes.route('/<file_name>/dependents/', methods=['GET'])
+    @event_route("DIC-06", "GET_DICTIONARY_DEPENDENTS", "getting dictionary dependents")
+    def get_dictionary_dependents(file_name):
+        return jsonify(DependencyGraph.get_instance().impact(DICTIONARY, file_name))
+
     @dictionary_routes.route('/<file_name>/', methods=['DELETE'])
     @event_route("DIC-05", "DELETE_DICTIONARY", "deleting dictionary")
     def delete_dictionary(file_name):
@@ -3,6 +3,7 @@ from configurator.utils.config import Config
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 
 from configurator.services.enumeration_service import Enumerations
+from configurator.services.enumerators import Enumerators
 from configurator.utils.route_decorators import event_route
 from configurator.utils.file_io import FileIO
 import logging
@@ -16,7 +17,7 @@ def create_enumerator_routes():
     @enumerator_routes.route('/', methods=['GET'])
     @event_route("ENU-01", "GET_ENUMERATIONS", "getting enumerations")
     def get_enumerations():
-        files = FileIO.get_documents(config.ENUMERATOR_FOLDER)
+        files = FileIO.get_documents(config.ENUMERATOR_FOLDER, request.args)
         return jsonify([file.to_dict() for file in files])
     
     # PATCH /api/enumerations - Lock all enumerations
@@ -26,6 +27,7 @@ def create_enumerator_routes():
         config.assert_local()
         # Lock all enumeration files
         event = Enumerations.lock_all()
+        Enumerators.clear()
         return jsonify(event.to_dict())
     
     # GET /api/enumerations/<file_name> - Get specific enumeration file
@@ -42,6 +44,7 @@ def create_enumerator_routes():
         config.assert_local()
         enumerations = Enumerations(file_name, request.json)
         result = enumerations.save()
+        Enumerators.clear()
         return jsonify(result)
     
     # DELETE /api/enumerations/<file_name> - Delete specific enumeration file
@@ -51,6 +54,7 @@ def create_enumerator_routes():
         config.assert_local()
         enumeration = Enumerations(file_name)
         event = enumeration.delete()
+        Enumerators.clear()
         return jsonify(event.to_dict())
 
     logger.info("Enumerator Flask Routes Registered")
@@ -16,7 +16,7 @@ def create_migration_routes():
     @migration_routes.route('/', methods=['GET'])
     @event_route("MIG-01", "GET_MIGRATIONS", "listing migrations")
     def get_migrations():
-        files = FileIO.get_documents(config.MIGRATIONS_FOLDER)
+        files = FileIO.get_documents(config.MIGRATIONS_FOLDER, request.args)
         return jsonify([file.to_dict() for file in files])
 
     # GET /api/migrations/<file_name>/ - Get a migration file
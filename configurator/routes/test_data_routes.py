@@ -19,7 +19,7 @@ def create_test_data_routes():
     @test_data_routes.route('/', methods=['GET'])
     @event_route("TST-01", "GET_TEST_DATA_FILES", "getting test data files")
     def get_data_files():
-        files = FileIO.get_documents(config.TEST_DATA_FOLDER)
+        files = FileIO.get_documents(config.TEST_DATA_FOLDER, request.args)
         return jsonify([file.to_dict() for file in files])
         
     # GET /api/test_data/<file_name> - Return a test_data file (only .json)
@@ -2,6 +2,7 @@ from flask import Blueprint, request, jsonify
 from configurator.utils.config import Config
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 from configurator.services.type_services import Type
+from configurator.services.dependency_graph import DependencyGraph, TYPE
 from configurator.utils.route_decorators import event_route
 import logging
 logger = logging.getLogger(__name__)
@@ -42,6 +43,12 @@ def create_type_routes():
         results = type.save()
         return jsonify(results)
     
+    # GET /api/types/<file_name>/dependents/ - Return what uses the type and the schemas it affects
+    @type_routes.route('/<file_name>/dependents/', methods=['GET'])
+    @event_route("TYP-06", "GET_TYPE_DEPENDENTS", "getting type dependents")
+    def get_type_dependents(file_name):
+        return jsonify(DependencyGraph.get_instance().impact(TYPE, file_name))
+
     @type_routes.route('/<file_name>/', methods=['DELETE'])
     @event_route("TYP-05", "DELETE_TYPE", "deleting type")
     def delete_type(file_name):
@@ -19,6 +19,7 @@ logger.info(f"============= Starting Server Initialization ===============")
 # Define a signal handler for SIGTERM and SIGINT
 def handle_exit(signum, frame):
     logger.info(f"Received signal {signum}. Initiating shutdown...")
+    MongoIO.shutdown()
     logger.info("============= Shutdown complete. ===============")
     sys.exit(0)
 
@@ -39,6 +40,20 @@ from prometheus_flask_exporter import PrometheusMetrics
 metrics = PrometheusMetrics(app, path='/api/health')
 metrics.info('app_info', 'Application info', version=config.BUILT_AT)
 
+# Expose parsed document and rendered schema cache counters
+from prometheus_client import Gauge
+from configurator.utils.document_cache import DocumentCache
+Gauge('document_cache_hits', 'Parsed document cache hits').set_function(lambda: DocumentCache.get_instance().hits)
+Gauge('document_cache_misses', 'Parsed document cache misses').set_function(lambda: DocumentCache.get_instance().misses)
+from configurator.utils.schema_cache import SchemaCache
+Gauge('schema_cache_hits', 'Rendered schema cache hits').set_function(lambda: SchemaCache.get_instance().hits)
+Gauge('schema_cache_misses', 'Rendered schema cache misses').set_function(lambda: SchemaCache.get_instance().misses)
+
+# Warm the document cache from a precompiled corpus snapshot
+if config.CORPUS_SNAPSHOT:
+    from configurator.utils.corpus_snapshot import CorpusSnapshot
+    CorpusSnapshot.load(config.CORPUS_SNAPSHOT)
+
 # Register flask routes
 from configurator.routes.collection_routes import create_collection_routes
 from configurator.routes.config_routes import create_config_routes
@@ -73,9 +88,12 @@ if config.AUTO_PROCESS:
         logger.error(f"Configurator error processing all configurations: {app.json.dumps(e.to_dict())}")
     except Exception as e:
         logger.error(f"Unexpected error processing all configurations: {str(e)}")
+    # Workers forked from a preloaded app (gunicorn --preload) connect on first use
+    MongoIO.shutdown()
 
 if config.EXIT_AFTER_PROCESSING:
     logger.info(f"============= Exiting After Processing ===============")
+    MongoIO.shutdown()
     sys.exit(0)
 
 # Start the server (only when run directly, not when imported by Gunicorn)
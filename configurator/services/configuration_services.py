@@ -1,8 +1,21 @@
+import os
+import json
+
 from configurator.utils.config import Config
+from configurator.utils.document_cache import MISSING
 from configurator.utils.file_io import FileIO
 from configurator.utils.mongo_io import MongoIO
+from configurator.utils.render_profile import RenderProfile
+from configurator.utils.schema_artifacts import SchemaArtifacts
+from configurator.utils.schema_cache import SchemaCache, DependencyRecorder
+from configurator.utils.schema_defs import factor_defs
+from configurator.utils.summary_index import SummaryIndex
+from configurator.utils.version_number import VersionNumber
+from configurator.utils.worker_pool import WorkerPool
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 from configurator.services.configuration_version import Version
+from configurator.services.dependency_graph import DependencyGraph
+from configurator.services.property.compiled import RENDERER_VERSION
 from configurator.services.enumerators import Enumerators
 from configurator.services.service_base import ServiceBase
 
@@ -16,6 +29,9 @@ class Configuration(ServiceBase):
         self.title = self._document.get("title", "")
         self.description = self._document.get("description", "")
         self.versions = [Version(self.collection_name, v) for v in self._document.get("versions", [])]
+        dictionaries = [version.version_number.get_schema_filename() for version in self.versions]
+        for version, dictionary in zip(self.versions, dictionaries):
+            version.shared_dictionary = dictionaries.count(dictionary) > 1
 
     def to_dict(self):
         the_dict = super().to_dict()
@@ -43,19 +59,153 @@ class Configuration(ServiceBase):
             raise ConfiguratorException(f"No versions found in configuration {self.file_name}", event)
         return max(self.versions, key=lambda v: v.version_number)
 
-    def get_json_schema_latest(self) -> dict:
+    def get_json_schema_latest(self, defs: dict = None) -> dict:
         """Get JSON schema for the latest version defined in this configuration."""
         latest_version = self.get_latest_version()
-        return self.get_json_schema(latest_version.version_str)
+        if defs is None:
+            return self.get_json_schema(latest_version.version_str)
+        return self.get_json_schema(latest_version.version_str, defs)
+
+    def _schema_key(self, version: Version, schema_format: str) -> tuple:
+        return (os.path.join(self.config.INPUT_FOLDER, self._folder_name, self.file_name), version.version_str, schema_format)
+
+    def _render(self, version: Version, render) -> tuple:
+        """Call render(version, enumerations), returns (dependencies, result)
+        where dependencies are the files the render read."""
+        # Every enumerators file is read to find the version, only that one is a dependency
+        with DependencyRecorder() as enumerator_files:
+            enumerations = Enumerators().get_version(f"{self.collection_name}.{version.version_str}")
+        with DependencyRecorder() as dependencies:
+            result = render(version, enumerations)
+        for (folder, file_name), stat in enumerator_files.items():
+            if file_name == enumerations.file_name:
+                dependencies[(folder, file_name)] = stat
+        return dependencies, result
+
+    def _get_schema(self, version: Version, schema_format: str) -> dict:
+        """Return the json or bson schema of a version from the SchemaCache if
+        none of the files it was rendered from changed, else from its
+        SchemaArtifacts if it is locked, else render it. Artifacts are only
+        written by lock_all, a read does not write files."""
+        cache = SchemaCache.get_instance()
+        key = self._schema_key(version, schema_format)
+        schema = cache.get(key)
+        if schema is not MISSING:
+            return schema
+
+        artifact = self._read_artifact(version, schema_format)
+        if artifact is not None:
+            dependencies, schema = artifact
+            return cache.put(key, dependencies, schema)
+
+        if schema_format == "json":
+            dependencies, schema = self._render(version, Version.get_json_schema)
+        else:
+            dependencies, schema = self._render(version, Version.get_bson_schema)
+        return cache.put(key, dependencies, schema)
+
+    def _get_schemas(self, version: Version) -> tuple:
+        """Return the (json, bson) schemas of a version as _get_schema does,
+        rendering both in one walk if either has to be rendered."""
+        cache = SchemaCache.get_instance()
+        json_key = self._schema_key(version, "json")
+        bson_key = self._schema_key(version, "bson")
+        json_schema = cache.get(json_key)
+        bson_schema = cache.get(bson_key)
+        if json_schema is not MISSING and bson_schema is not MISSING:
+            return json_schema, bson_schema
 
-    def get_json_schema(self, version_str: str) -> dict:
+        json_artifact = self._read_artifact(version, "json")
+        bson_artifact = self._read_artifact(version, "bson")
+        if json_artifact is not None and bson_artifact is not None:
+            return cache.put(json_key, *json_artifact), cache.put(bson_key, *bson_artifact)
+
+        dependencies, (json_schema, bson_schema) = self._render(version, Version.get_schemas)
+        return cache.put(json_key, dependencies, json_schema), cache.put(bson_key, dependencies, bson_schema)
+
+    def _read_artifact(self, version: Version, schema_format: str) -> tuple:
+        """The (dependencies, schema) of a locked version from its
+        SchemaArtifacts, or None."""
+        if not version._locked:
+            return None
+        artifact = SchemaArtifacts.read(self.collection_name, version.version_str, schema_format, RENDERER_VERSION)
+        if artifact is None:
+            return None
+        content, _, dependencies = artifact
+        return dependencies, json.loads(content)
+
+    def _write_artifact(self, version: Version, schema_format: str, schema: dict, dependencies: dict):
+        """Keep the schema of a locked version as a SchemaArtifacts file."""
+        try:
+            SchemaArtifacts.write(self.collection_name, version.version_str, schema_format, schema, dependencies, RENDERER_VERSION)
+        except OSError as e:
+            logger.warning(f"Could not write the {schema_format} schema artifact of {self.file_name} version {version.version_str}: {str(e)}")
+
+    def write_artifacts(self, version: Version):
+        """Render the schemas of a locked version and write its SchemaArtifacts."""
+        dependencies, (json_schema, bson_schema) = self._render(version, Version.get_schemas)
+        self._write_artifact(version, "json", json_schema, dependencies)
+        self._write_artifact(version, "bson", bson_schema, dependencies)
+
+    def profile_schema(self, version_str: str, schema_format: str = "json") -> tuple:
+        """Render the json or bson schema, or both, of a version under a
+        RenderProfile. The SchemaCache and SchemaArtifacts are bypassed so
+        the render is measured. Returns (schema, profile), schema is the
+        {json_schema, bson_schema} dict of get_schemas for both."""
+        event = ConfiguratorEvent("CFG-11", "PROFILE_SCHEMA")
+        event.data = {"configuration": self.file_name, "version": version_str, "format": schema_format}
+        renders = {"json": Version.get_json_schema, "bson": Version.get_bson_schema, "both": Version.get_schemas}
+        try:
+            if schema_format not in renders:
+                event.record_failure(f"Unknown schema format {schema_format}, expected one of {', '.join(renders)}")
+                raise ConfiguratorException(f"Unknown schema format {schema_format}", event)
+            version = self.get_version(version_str)
+            with RenderProfile() as profile:
+                _, schema = self._render(version, renders[schema_format])
+            if schema_format == "both":
+                schema = {"json_schema": schema[0], "bson_schema": schema[1]}
+            event.record_success()
+            return schema, profile
+        except ConfiguratorException as e:
+            if e.event is event:
+                raise
+            event.append_events([e.event])
+            event.record_failure(f"Failed to profile schema for {self.file_name} version {version_str}")
+            logger.error(f"Failed to profile schema for {self.file_name} version {version_str}: {e.event.to_dict()}")
+            raise ConfiguratorException(f"Failed to profile schema for {self.file_name} version {version_str}", event)
+
+    def analyze(self, version_str: str) -> dict:
+        """Estimate the render of a version without rendering it, see
+        Version.analyze. Returns {configuration, version, nodes, bytes, depth,
+        defs_nodes, defs_bytes, files, budget}."""
+        event = ConfiguratorEvent("CFG-12", "ANALYZE_SCHEMA")
+        event.data = {"configuration": self.file_name, "version": version_str}
+        try:
+            version = self.get_version(version_str)
+            enumerations = Enumerators().get_version(f"{self.collection_name}.{version.version_str}")
+            analysis = {"configuration": self.file_name, "version": version.version_str, **version.analyze(enumerations)}
+            event.record_success()
+            return analysis
+        except ConfiguratorException as e:
+            event.append_events([e.event])
+            event.record_failure(f"Failed to analyze schema for {self.file_name} version {version_str}")
+            logger.error(f"Failed to analyze schema for {self.file_name} version {version_str}: {e.event.to_dict()}")
+            raise ConfiguratorException(f"Failed to analyze schema for {self.file_name} version {version_str}", event)
+        except Exception as e:
+            event.record_failure(f"Unexpected error analyzing schema for {self.file_name} version {version_str}: {str(e)}")
+            logger.error(f"Unexpected error analyzing schema for {self.file_name} version {version_str}: {str(e)}")
+            raise ConfiguratorException(f"Unexpected error analyzing schema for {self.file_name} version {version_str}: {str(e)}", event)
+
+    def get_json_schema(self, version_str: str, defs: dict = None) -> dict:
+        """Get the JSON schema of a version. With defs, the factor_defs options,
+        repeated subschemas are moved to $defs and referenced with $ref."""
         event = ConfiguratorEvent("CFG-03", "GET_JSON_SCHEMA")
         event.data = {"configuration": self.file_name, "version": version_str}
         try:
             version = self.get_version(version_str)
-            enumerators = Enumerators()
-            enumerations = enumerators.get_version(f"{self.collection_name}.{version_str}")
-            schema = version.get_json_schema(enumerations)
+            schema = self._get_schema(version, "json")
+            if defs is not None:
+                schema = factor_defs(schema, **defs)
             event.record_success()
             return schema
         except ConfiguratorException as e:
@@ -73,9 +223,7 @@ class Configuration(ServiceBase):
         event.data = {"configuration": self.file_name, "version": version_str}
         try:
             version = self.get_version(version_str)
-            enumerators = Enumerators()
-            enumerations = enumerators.get_version(f"{self.collection_name}.{version_str}")
-            schema = version.get_bson_schema(enumerations)
+            schema = self._get_schema(version, "bson")
             event.record_success()
             return schema
         except ConfiguratorException as e:
@@ -88,6 +236,25 @@ class Configuration(ServiceBase):
             logger.error(f"Unexpected error getting BSON schema for {self.file_name} version {version_str}: {str(e)}")
             raise ConfiguratorException(f"Unexpected error getting BSON schema for {self.file_name} version {version_str}: {str(e)}", event)
         
+    def get_schemas(self, version_str: str) -> dict:
+        """Get the JSON and BSON schemas of a version, rendered together."""
+        event = ConfiguratorEvent("CFG-08", "GET_SCHEMAS")
+        event.data = {"configuration": self.file_name, "version": version_str}
+        try:
+            version = self.get_version(version_str)
+            json_schema, bson_schema = self._get_schemas(version)
+            event.record_success()
+            return {"json_schema": json_schema, "bson_schema": bson_schema}
+        except ConfiguratorException as e:
+            event.append_events([e.event])
+            event.record_failure(f"Failed to get schemas for {self.file_name} version {version_str}")
+            logger.error(f"Failed to get schemas for {self.file_name} version {version_str}: {e.event.to_dict()}")
+            raise ConfiguratorException(f"Failed to get schemas for {self.file_name} version {version_str}", event)
+        except Exception as e:
+            event.record_failure(f"Unexpected error getting schemas for {self.file_name} version {version_str}: {str(e)}")
+            logger.error(f"Unexpected error getting schemas for {self.file_name} version {version_str}: {str(e)}")
+            raise ConfiguratorException(f"Unexpected error getting schemas for {self.file_name} version {version_str}: {str(e)}", event)
+
     def process(self, mongo_io: MongoIO) -> ConfiguratorEvent:
         event = ConfiguratorEvent(event_id=f"CFG-05-{self.file_name}", event_type="PROCESS")
         event.data = {"configuration_name": self.file_name, "version_count": len(self.versions)}
@@ -121,9 +288,11 @@ class Configuration(ServiceBase):
                 test_data_files.add(version.test_data)
 
         # Delete orphaned dictionaries
+        graph = DependencyGraph.get_instance()
         for file_name in dictionary_files:
             if FileIO.file_exists(Config.get_instance().DICTIONARY_FOLDER, file_name):
                 FileIO.delete_document(Config.get_instance().DICTIONARY_FOLDER, file_name)
+                graph.remove(Config.get_instance().DICTIONARY_FOLDER, file_name)
                 logger.info(f"Deleted orphaned dictionary {file_name}")
 
         # Delete orphaned test_data
@@ -133,7 +302,9 @@ class Configuration(ServiceBase):
                 logger.info(f"Deleted orphaned test_data {file_name}")
 
         # Delete the configuration
-        return FileIO.delete_document(self._folder_name, self.file_name)
+        event = FileIO.delete_document(self._folder_name, self.file_name)
+        graph.remove(self._folder_name, self.file_name)
+        return event
 
     @staticmethod
     def lock_all(status: bool = True):
@@ -162,7 +333,18 @@ class Configuration(ServiceBase):
                 
                 # Save the configuration
                 configuration.save()
-                
+
+                # Keep the schemas of locked versions as artifacts
+                for version in configuration.versions:
+                    if not status:
+                        SchemaArtifacts.remove(configuration.collection_name, version.version_str)
+                        continue
+                    try:
+                        configuration.write_artifacts(version)
+                    except ConfiguratorException as e:
+                        file_event.append_events([e.event])
+                        logger.warning(f"Locked {file.file_name} version {version.version_str} without schema artifacts: {e.event.to_dict()}")
+
                 file_event.data = {
                     "file_name": file.file_name,
                     "version_count": version_count,
@@ -205,33 +387,92 @@ class Configuration(ServiceBase):
             logger.error(f"Unexpected error updating enumerators: {str(e)}")
             raise ConfiguratorException("Cannot update enumerators", event)
 
+    @staticmethod
+    def summarize(file_name: str, document: dict) -> dict:
+        """Summarize a raw configuration document, only the latest version is
+        needed so Version objects are not built."""
+        collection_name = file_name.split('.')[0]
+        versions = [(VersionNumber(f"{collection_name}.{v['version']}"), v) for v in document.get("versions", [])]
+        if not versions:
+            event = ConfiguratorEvent("CFG-02", "GET_LATEST_VERSION")
+            event.record_failure(f"No versions found in configuration {file_name}")
+            raise ConfiguratorException(f"No versions found in configuration {file_name}", event)
+        version_number, latest = max(versions, key=lambda version: version[0])
+        return {
+            "collection_name": collection_name,
+            "configuration_file": file_name,
+            "latest_dictionary_file": version_number.get_schema_filename(),
+            "latest_version": version_number.get_version_str(),
+            "_locked": latest.get("_locked", False),
+            "description": document.get("description", "") or "",
+        }
+
     @staticmethod
     def get_collections_summary() -> list:
         """
         Return a collection-centric view: one summary per configuration.
         Each item: collection_name, configuration_file, latest_dictionary_file, latest_version, _locked.
+        Configurations that can not be summarized are skipped.
+        """
+        config = Config.get_instance()
+        files = FileIO.get_documents(config.CONFIGURATION_FOLDER)
+        summaries = ServiceBase.get_summaries(config.CONFIGURATION_FOLDER, files, Configuration.summarize)
+        return [summary for file, summary in summaries if summary is not None]
+
+    @staticmethod
+    def export_schemas(formats: tuple = ("json", "bson"), defs: dict = None):
+        """Render every configuration x version x format, returns an iterator
+        of one record per schema: {configuration, version, format, schema}, or {configuration,
+        version, error} when a configuration or version can not be rendered.
+
+        Versions are rendered on the WorkerPool in batches, and the records
+        of a batch are available as soon as it completes. Renders share the dictionaries and
+        types of the ServiceRegistry, the Enumerators registry and the
+        SchemaCache. When both formats are exported a version is rendered in
+        one walk.
         """
         config = Config.get_instance()
-        result = []
+        tasks = []
         for file in FileIO.get_documents(config.CONFIGURATION_FOLDER):
             try:
                 configuration = Configuration(file.file_name)
-                latest = configuration.get_latest_version()
-                result.append({
-                    "collection_name": configuration.collection_name,
-                    "configuration_file": configuration.file_name,
-                    "latest_dictionary_file": latest.version_number.get_schema_filename(),
-                    "latest_version": latest.version_str,
-                    "_locked": latest._locked,
-                    "description": configuration.description or "",
-                })
+                tasks.extend((configuration, version.version_str) for version in configuration.versions)
             except ConfiguratorException as e:
-                logger.warning(f"Skipping {file.file_name}: {e}")
-                continue
+                tasks.append((file.file_name, e.event))
             except Exception as e:
-                logger.warning(f"Skipping {file.file_name}: {e}")
-                continue
-        return result
+                event = ConfiguratorEvent("CFG-10", "EXPORT_SCHEMAS")
+                event.record_failure(f"Unexpected error loading configuration {file.file_name}: {str(e)}")
+                tasks.append((file.file_name, event))
+
+        def render(task) -> list:
+            configuration, version_str = task
+            if not isinstance(configuration, Configuration):
+                return [{"configuration": configuration, "version": None, "error": version_str.to_dict()}]
+            record = {"configuration": configuration.file_name, "version": version_str}
+            try:
+                if "json" in formats and "bson" in formats:
+                    schemas = configuration.get_schemas(version_str)
+                    json_schema, bson_schema = schemas["json_schema"], schemas["bson_schema"]
+                    if defs is not None:
+                        json_schema = factor_defs(json_schema, **defs)
+                    schemas = {"json": json_schema, "bson": bson_schema}
+                elif "json" in formats:
+                    schemas = {"json": configuration.get_json_schema(version_str, defs)}
+                else:
+                    schemas = {"bson": configuration.get_bson_schema(version_str)}
+            except ConfiguratorException as e:
+                return [{**record, "error": e.event.to_dict()}]
+            return [{**record, "format": schema_format, "schema": schemas[schema_format]} for schema_format in formats]
+
+        def records():
+            pool = WorkerPool.get_instance()
+            batch_size = max(pool.max_workers, 1) * 4
+            for start in range(0, len(tasks), batch_size):
+                for batch in pool.map(render, tasks[start:start + batch_size]):
+                    yield from batch
+
+        # Configurations are listed and loaded before the first record is streamed
+        return records()
 
     @staticmethod
     def process_all():
@@ -240,7 +481,7 @@ class Configuration(ServiceBase):
 
         # Update enumerators
         try:
-            mongo_io = MongoIO(config.MONGO_CONNECTION_STRING, config.MONGO_DB_NAME)
+            mongo_io = MongoIO.get_instance()
             process_event.append_events([Configuration.update_enumerators(mongo_io)])
         except ConfiguratorException as e:
             process_event.append_events([e.event])
@@ -273,7 +514,7 @@ class Configuration(ServiceBase):
         process_event = ConfiguratorEvent("CFG-09-PROCESS_ONE_CONFIGURATION", "PROCESS")
             
         try:
-            mongo_io = MongoIO(config.MONGO_CONNECTION_STRING, config.MONGO_DB_NAME)
+            mongo_io = MongoIO.get_instance()
             process_event.append_events([Configuration.update_enumerators(mongo_io)])
             process_event.append_events([Configuration(file_name).process(mongo_io)])
             process_event.record_success()
@@ -287,4 +528,6 @@ class Configuration(ServiceBase):
             process_event.record_failure(f"Unexpected error {str(e)} processing configuration {file_name}")
             logger.error(f"Unexpected error {str(e)} processing configuration {file_name}: {process_event.to_dict()}")
             return process_event
-                                
\ No newline at end of file
+
+
+SummaryIndex.register("CONFIGURATION_FOLDER", Configuration.summarize)
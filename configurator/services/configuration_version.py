@@ -1,13 +1,17 @@
 import os
 from configurator.services.dictionary_services import Dictionary
 from configurator.utils.config import Config
+from configurator.utils.document_cache import MISSING
 from configurator.utils.file_io import FileIO
 from configurator.utils.mongo_io import MongoIO
+from configurator.utils.render_profile import current_profile
+from configurator.utils.schema_cache import SchemaCache, DependencyRecorder
 from configurator.utils.version_number import VersionNumber
 from configurator.utils.version_manager import VersionManager
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 from configurator.services.enumeration_service import Enumerations
 from configurator.services.enumerators import Enumerators
+from configurator.services.service_registry import ServiceRegistry
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +27,9 @@ class Version:
         self.migrations = document.get("migrations", [])
         self.test_data = document.get("test_data", None)
         self._locked = document.get("_locked", False)
+        # True when another version of the configuration renders the same
+        # dictionary, set by Configuration, see _render_dictionary
+        self.shared_dictionary = False
 
     def to_dict(self):
         the_dict = {}
@@ -34,13 +41,101 @@ class Version:
         the_dict["_locked"] = self._locked
         return the_dict
 
+    def analyze(self, enumerations: Enumerations) -> dict:
+        """The estimate of the JSON schema render (see CompiledProperty.estimate)
+        and the render budget: {max_nodes, max_bytes, over_budget, mode},
+        mode is how the schema is rendered: inline, defs or reject."""
+        dictionary = Dictionary(self.version_number.get_schema_filename())
+        estimate = dictionary.estimate(enumerations)
+        over_budget = self._over_budget(estimate)
+        mode = "inline"
+        if over_budget:
+            mode = "defs" if self.config.RENDER_OVER_BUDGET == "defs" else "reject"
+        estimate["budget"] = {
+            "max_nodes": self.config.RENDER_MAX_NODES,
+            "max_bytes": self.config.RENDER_MAX_BYTES,
+            "over_budget": over_budget,
+            "mode": mode,
+        }
+        return estimate
+
+    def _over_budget(self, estimate: dict) -> bool:
+        max_nodes, max_bytes = self.config.RENDER_MAX_NODES, self.config.RENDER_MAX_BYTES
+        return (max_nodes > 0 and estimate["nodes"] > max_nodes) or (max_bytes > 0 and estimate["bytes"] > max_bytes)
+
+    def _check_budget(self, dictionary: Dictionary, enumerations: Enumerations, schema_format: str) -> bool:
+        """Check the render of a dictionary against RENDER_MAX_NODES and
+        RENDER_MAX_BYTES (0 for no limit) before rendering, refs and custom
+        types are inlined so a render can grow exponentially with nested
+        reuse. Returns True if the JSON schema is to be rendered with
+        to_json_schema_defs, RENDER_OVER_BUDGET is defs. Otherwise a render
+        over budget raises VER-05, BSON schemas can not use $ref.
+
+        A dictionary that can not be estimated is rendered, the render
+        raises the error."""
+        if self.config.RENDER_MAX_NODES <= 0 and self.config.RENDER_MAX_BYTES <= 0:
+            return False
+        try:
+            estimate = dictionary.estimate(enumerations)
+        except ConfiguratorException:
+            return False
+        if not self._over_budget(estimate):
+            return False
+        message = (f"Schema of version {self.version_str} is estimated at {estimate['nodes']} nodes and {estimate['bytes']} bytes, "
+                   f"over the budget of {self.config.RENDER_MAX_NODES} nodes and {self.config.RENDER_MAX_BYTES} bytes")
+        if schema_format == "json" and self.config.RENDER_OVER_BUDGET == "defs":
+            logger.warning(f"{message}, rendering with $defs")
+            return True
+        event = ConfiguratorEvent("VER-05", "RENDER_OVER_BUDGET")
+        event.record_failure(message, {
+            "nodes": estimate["nodes"],
+            "bytes": estimate["bytes"],
+            "max_nodes": self.config.RENDER_MAX_NODES,
+            "max_bytes": self.config.RENDER_MAX_BYTES,
+            "files": estimate["files"][:10],
+        })
+        raise ConfiguratorException(message, event)
+
+    def _render_dictionary(self, dictionary: Dictionary, enumerations: Enumerations, schema_format: str):
+        """Render schema_format (json, bson or both) of the dictionary.
+
+        Versions that share a dictionary differ only in their enumerator
+        version, their schemas are filled from one SchemaSkeleton of the
+        dictionary kept in the SchemaCache, valid while the files it was
+        rendered from are unchanged. The filled schemas share the parts
+        without enumerators with the skeleton, the SchemaCache hands out
+        copies. Profiled renders are not filled, see RenderProfile."""
+        renders = {"json": dictionary.to_json_schema, "bson": dictionary.to_bson_schema, "both": dictionary.to_schemas}
+        cache = SchemaCache.get_instance()
+        if not self.shared_dictionary or cache.max_size <= 0 or current_profile() is not None:
+            return renders[schema_format](enumerations)
+
+        key = (os.path.join(self.config.INPUT_FOLDER, dictionary.render_key), None, f"{schema_format} skeleton")
+        skeleton = cache.get(key)
+        if skeleton is MISSING:
+            with DependencyRecorder() as dependencies:
+                shared = ServiceRegistry.get_instance().get(Dictionary, dictionary.file_name)
+                skeleton = shared.to_skeleton(schema_format)
+            skeleton.dependencies = dependencies
+            cache.put(key, dependencies, skeleton)
+        else:
+            skeleton.record_dependencies()
+        try:
+            return skeleton.fill(enumerations)
+        except ConfiguratorException:
+            # An enumerator missing from this version, the render raises it with the refs it is under
+            return renders[schema_format](enumerations)
+
     def get_json_schema(self, enumerations: Enumerations) -> dict:
         dictionary_filename: str = self.version_number.get_schema_filename()
         event = ConfiguratorEvent("VER-02", "GET_JSON_SCHEMA")
         event.data = {"version": self.version_str, "dictionary": dictionary_filename}
         try:
             dictionary = Dictionary(dictionary_filename)
-            schema = dictionary.to_json_schema(enumerations)
+            if self._check_budget(dictionary, enumerations, "json"):
+                schema = dictionary.to_json_schema_defs(enumerations)
+            else:
+                schema = self._render_dictionary(dictionary, enumerations, "json")
             event.record_success()
             return schema
         except ConfiguratorException as e:
@@ -59,7 +154,8 @@ class Version:
         event.data = {"version": self.version_str, "dictionary": dictionary_filename}
         try:
             dictionary = Dictionary(dictionary_filename)
-            schema = dictionary.to_bson_schema(enumerations)
+            self._check_budget(dictionary, enumerations, "bson")
+            schema = self._render_dictionary(dictionary, enumerations, "bson")
             event.record_success()
             return schema
         except ConfiguratorException as e:
@@ -72,6 +168,27 @@ class Version:
             logger.error(f"Unexpected error getting BSON schema for version {self.version_str}, dictionary {dictionary_filename}: {str(e)}")
             raise ConfiguratorException(f"Unexpected error getting BSON schema for version {self.version_str}, dictionary {dictionary_filename}: {str(e)}", event)
 
+    def get_schemas(self, enumerations: Enumerations) -> tuple:
+        """Render the JSON and BSON schemas in one walk of the dictionary, returns (json_schema, bson_schema)"""
+        dictionary_filename: str = self.version_number.get_schema_filename()
+        event = ConfiguratorEvent("VER-04", "GET_SCHEMAS")
+        event.data = {"version": self.version_str, "dictionary": dictionary_filename}
+        try:
+            dictionary = Dictionary(dictionary_filename)
+            self._check_budget(dictionary, enumerations, "both")
+            schemas = self._render_dictionary(dictionary, enumerations, "both")
+            event.record_success()
+            return schemas
+        except ConfiguratorException as e:
+            event.append_events([e.event])
+            event.record_failure(f"Failed to get schemas for version {self.version_str}, dictionary {dictionary_filename}")
+            logger.error(f"Failed to get schemas for version {self.version_str}, dictionary {dictionary_filename}: {e.event.to_dict()}")
+            raise ConfiguratorException(f"Failed to get schemas for version {self.version_str}, dictionary {dictionary_filename}", event)
+        except Exception as e:
+            event.record_failure(f"Unexpected error getting schemas for version {self.version_str}, dictionary {dictionary_filename}: {str(e)}")
+            logger.error(f"Unexpected error getting schemas for version {self.version_str}, dictionary {dictionary_filename}: {str(e)}")
+            raise ConfiguratorException(f"Unexpected error getting schemas for version {self.version_str}, dictionary {dictionary_filename}: {str(e)}", event)
+
     def process(self, mongo_io: MongoIO) -> ConfiguratorEvent:
         try:
             event = ConfiguratorEvent(event_id=f"PROCESS_VERSION-{self.version_str}", event_type="PROCESS")
@@ -0,0 +1,271 @@
+import time
+import threading
+
+from configurator.utils.config import Config
+from configurator.utils.file_io import FileIO
+from configurator.utils.version_number import VersionNumber
+from configurator.utils.document_cache import RACY_WINDOW_NS
+from configurator.services.property.compiled import KINDS, OBJECT, ONE_OF, ARRAY, ENUM, ENUM_ARRAY, REF, CUSTOM, _dictionary_filename
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Node kinds, a node is a (kind, name) tuple. Configuration, dictionary,
+# type and enumerations nodes are named by file name, enumerator nodes by
+# enumerator name.
+CONFIGURATION = "configuration"
+DICTIONARY = "dictionary"
+TYPE = "type"
+ENUMERATOR = "enumerator"
+ENUMERATIONS = "enumerations"
+
+
+def property_dependencies(data: dict) -> set:
+    """The dictionary, type and enumerator nodes a raw property tree uses."""
+    nodes = set()
+    stack = [data]
+    while stack:
+        data = stack.pop()
+        if not isinstance(data, dict):
+            continue
+        type_ = data.get("type", "void")
+        kind = KINDS.get(type_, CUSTOM)
+        if kind == REF:
+            nodes.add((DICTIONARY, _dictionary_filename(data.get("ref", ""))))
+        elif kind == ENUM or kind == ENUM_ARRAY:
+            nodes.add((ENUMERATOR, data.get("enums", "")))
+        elif kind == OBJECT or kind == ONE_OF:
+            stack.extend(data.get("properties") or [])
+        elif kind == ARRAY:
+            stack.append(data.get("items") or {})
+        elif kind == CUSTOM:
+            nodes.add((TYPE, f"{type_}.yaml"))
+    return nodes
+
+
+def configuration_versions(file_name: str, document: dict) -> dict:
+    """Map each version of a raw configuration to its (dictionary file,
+    enumerator version)."""
+    collection_name = file_name.split('.')[0]
+    versions = {}
+    for version in document.get("versions") or []:
+        version_number = VersionNumber(f"{collection_name}.{version['version']}")
+        versions[version_number.get_version_str()] = (version_number.get_schema_filename(), version_number.get_enumerator_version())
+    return versions
+
+
+class DependencyGraph:
+    """Process wide graph of the references between configurations,
+    dictionaries, types and enumerators.
+
+    Edges point from a node to the nodes it uses: a configuration to the
+    dictionary of each version, a dictionary or type to the dictionaries
+    (ref), types (custom types) and enumerators (enum, enum_array) in its
+    property tree. The version of each enumerations file is kept, a
+    configuration version renders with the file of its enumerator version.
+    Nodes are added from the raw documents as they are read and ServiceBase
+    updates them on save and delete. The queries answer from memory,
+    refresh re-reads the files whose listing changed so edits made outside
+    of the API are picked up. impact refreshes once and answers the
+    dependents routes of types and dictionaries, schema_entries
+    tells the SchemaCache which schemas a write invalidates.
+    """
+    _instance = None  # Singleton instance
+
+    def __init__(self):
+        self._forward = {}  # node -> nodes it uses
+        self._reverse = {}  # node -> nodes that use it
+        self._versions = {}  # configuration file -> {version_str: (dictionary file, enumerator version)}
+        self._enumerations = {}  # enumerations file -> its version
+        self._signatures = {}  # file node -> (size, mtime) it was built from, None if unknown
+        self._refreshed = False
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _kinds() -> dict:
+        """Folder name -> node kind of the folders in the graph."""
+        config = Config.get_instance()
+        return {
+            config.CONFIGURATION_FOLDER: CONFIGURATION,
+            config.DICTIONARY_FOLDER: DICTIONARY,
+            config.TYPE_FOLDER: TYPE,
+            config.ENUMERATOR_FOLDER: ENUMERATIONS,
+        }
+
+    def _set_edges(self, node: tuple, targets: set):
+        for target in self._forward.pop(node, ()):
+            sources = self._reverse.get(target)
+            sources.discard(node)
+            if not sources:
+                del self._reverse[target]
+        if targets:
+            self._forward[node] = targets
+            for target in targets:
+                self._reverse.setdefault(target, set()).add(node)
+
+    def update(self, folder_name: str, file_name: str, document: dict, file_signature: tuple = None):
+        """Replace the edges of a file from its raw document, files of other folders are ignored."""
+        kind = DependencyGraph._kinds().get(folder_name)
+        if kind is None:
+            return
+        node = (kind, file_name)
+        versions = None
+        if kind == CONFIGURATION:
+            versions = configuration_versions(file_name, document)
+            targets = {(DICTIONARY, dictionary) for dictionary, _ in versions.values()}
+        elif kind == ENUMERATIONS:
+            targets = set()
+        else:
+            targets = property_dependencies(document.get("root") or {})
+        with self._lock:
+            self._set_edges(node, targets)
+            if versions is not None:
+                self._versions[file_name] = versions
+            if kind == ENUMERATIONS:
+                self._enumerations[file_name] = document.get("version", 0)
+            self._signatures[node] = file_signature
+
+    def remove(self, folder_name: str, file_name: str):
+        """Drop the edges of a deleted file. Edges to it are kept, the files
+        that use it still do."""
+        kind = DependencyGraph._kinds().get(folder_name)
+        if kind is None:
+            return
+        node = (kind, file_name)
+        with self._lock:
+            self._set_edges(node, set())
+            if kind == CONFIGURATION:
+                self._versions.pop(file_name, None)
+            elif kind == ENUMERATIONS:
+                self._enumerations.pop(file_name, None)
+            self._signatures.pop(node, None)
+
+    def refresh(self):
+        """Bring the graph up to date with the folders, only files whose size
+        or mtime changed since they were added are read."""
+        with self._lock:
+            self._refreshed = True
+            for folder_name, kind in DependencyGraph._kinds().items():
+                try:
+                    files = FileIO.get_documents(folder_name)
+                except Exception as e:
+                    logger.warning(f"Not refreshing dependencies of {folder_name}: {e}")
+                    continue
+                listed = set()
+                for file in files:
+                    node = (kind, file.file_name)
+                    listed.add(node)
+                    file_signature = (file.size, file._updated)
+                    if node in self._signatures and self._signatures[node] == file_signature:
+                        continue
+                    # A file changed within the racy window may change again unnoticed
+                    if time.time_ns() - int(file._updated * 1e9) < RACY_WINDOW_NS:
+                        file_signature = None
+                    try:
+                        document = FileIO.get_document(folder_name, file.file_name)
+                        self.update(folder_name, file.file_name, document, file_signature)
+                    except Exception as e:
+                        logger.warning(f"Skipping dependencies of {file.file_name}: {e}")
+                        self.remove(folder_name, file.file_name)
+                        self._signatures[node] = file_signature
+                for node in [node for node in self._signatures if node[0] == kind and node not in listed]:
+                    self.remove(folder_name, node[1])
+
+    def _walk(self, edges: dict, node: tuple, transitive: bool) -> set:
+        found = set()
+        stack = [node]
+        while stack:
+            for target in edges.get(stack.pop(), ()):
+                if target not in found:
+                    found.add(target)
+                    if transitive:
+                        stack.append(target)
+        found.discard(node)
+        return found
+
+    def dependencies(self, kind: str, name: str, transitive: bool = False) -> set:
+        """The nodes a node uses, directly or (transitive) through other nodes."""
+        with self._lock:
+            return self._walk(self._forward, (kind, name), transitive)
+
+    def dependents(self, kind: str, name: str, transitive: bool = False) -> set:
+        """The nodes that use a node, directly or (transitive) through other nodes."""
+        with self._lock:
+            return self._walk(self._reverse, (kind, name), transitive)
+
+    def affected_schemas(self, kind: str, name: str) -> list:
+        """The (configuration file, version) schemas that must be rendered again
+        when a node changes, sorted."""
+        with self._lock:
+            dictionaries = {node[1] for node in self._walk(self._reverse, (kind, name), True) if node[0] == DICTIONARY}
+            if kind == DICTIONARY:
+                dictionaries.add(name)
+            return sorted(
+                (configuration, version)
+                for configuration, versions in self._versions.items()
+                for version, (dictionary, _) in versions.items()
+                if dictionary in dictionaries
+            )
+
+    def schema_entries(self, folder_name: str, file_name: str) -> set:
+        """Return the schemas rendered from a file, as (folder name, file
+        name, version) of the configuration versions and (folder name,
+        dictionary file, None) of the dictionary skeletons, see
+        SchemaCache.invalidate_file. Called before a file is written, the
+        graph holds the references of the content being replaced. The graph
+        is refreshed if it never was, writes through the services keep it
+        current. An entry the graph misses after an edit outside of the API
+        is still dropped by the SchemaCache, whose entries are only valid
+        while the files they were rendered from are unchanged."""
+        kind = DependencyGraph._kinds().get(folder_name)
+        if kind is None:
+            return set()
+        config = Config.get_instance()
+        with self._lock:
+            if not self._refreshed:
+                self.refresh()
+            if kind == CONFIGURATION:
+                return {(folder_name, file_name, version) for version in self._versions.get(file_name, {})}
+            if kind == ENUMERATIONS:
+                version = self._enumerations.get(file_name)
+                return {
+                    (config.CONFIGURATION_FOLDER, configuration, version_str)
+                    for configuration, versions in self._versions.items()
+                    for version_str, (_, enumerator_version) in versions.items()
+                    if enumerator_version == version
+                }
+            dictionaries = {node[1] for node in self._walk(self._reverse, (kind, file_name), True) if node[0] == DICTIONARY}
+            if kind == DICTIONARY:
+                dictionaries.add(file_name)
+            entries = {(config.DICTIONARY_FOLDER, dictionary, None) for dictionary in dictionaries}
+            entries.update((config.CONFIGURATION_FOLDER, configuration, version)
+                           for configuration, version in self.affected_schemas(kind, file_name))
+            return entries
+
+    def impact(self, kind: str, name: str) -> dict:
+        """Refresh the graph and return the nodes that use a node, directly or
+        through other nodes, and the schemas to render again when it changes."""
+        with self._lock:
+            self.refresh()
+            return {
+                "dependents": [{"kind": kind, "name": name} for kind, name in sorted(self.dependents(kind, name, transitive=True))],
+                "affected_schemas": [{"configuration": configuration, "version": version}
+                                     for configuration, version in self.affected_schemas(kind, name)],
+            }
+
+    def clear(self):
+        with self._lock:
+            self._forward.clear()
+            self._reverse.clear()
+            self._versions.clear()
+            self._enumerations.clear()
+            self._signatures.clear()
+            self._refreshed = False
+
+    # Singleton Getter
+    @staticmethod
+    def get_instance():
+        """Get the singleton instance of the DependencyGraph class."""
+        if DependencyGraph._instance is None:
+            DependencyGraph._instance = DependencyGraph()
+        return DependencyGraph._instance
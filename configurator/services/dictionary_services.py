@@ -4,14 +4,32 @@ from configurator.utils.file_io import FileIO
 from configurator.utils.configurator_exception import ConfiguratorException, ConfiguratorEvent
 from configurator.services.enumeration_service import Enumerations
 from configurator.services.property import Property
+from configurator.services.property.compiled import CompiledProperty, register_service, REF
 from configurator.services.service_base import ServiceBase
+from configurator.services.type_services import Type  # Registers the service custom types render through
 
 class Dictionary(ServiceBase):
     def __init__(self, file_name: str = None, document: dict = None):
         super().__init__(file_name, document, Config.get_instance().DICTIONARY_FOLDER)
         root_data = self._document.get("root", {})
         root_data = {**root_data, "name": root_data.get("name", "root")}
-        self.root = Property(root_data)
+        self._root_data = root_data
+        self._root = None
+        self._compiled = None
+
+    @property
+    def root(self) -> Property:
+        """The root property, built on first use by to_dict, renders only compile it"""
+        if self._root is None:
+            self._root = Property(self._root_data)
+        return self._root
+
+    @property
+    def compiled(self) -> CompiledProperty:
+        """The root property compiled for rendering, see CompiledProperty"""
+        if self._compiled is None:
+            self._compiled = CompiledProperty.compile(self._root_data)
+        return self._compiled
 
     def to_dict(self):
         the_dict = super().to_dict()
@@ -19,11 +37,27 @@ class Dictionary(ServiceBase):
         return the_dict
 
     def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        return self.root.to_json_schema(enumerations, ref_stack)
+        return self.compiled.to_json_schema(enumerations, [*ref_stack, self.render_key])
 
     def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        return self.root.to_bson_schema(enumerations, ref_stack)
+        return self.compiled.to_bson_schema(enumerations, [*ref_stack, self.render_key])
+
+    def to_schemas(self, enumerations: Enumerations, ref_stack: list = []):
+        return self.compiled.to_schemas(enumerations, [*ref_stack, self.render_key])
+
+    def to_json_schema_defs(self, enumerations: Enumerations, ref_stack: list = []):
+        return self.compiled.to_json_schema_defs(enumerations, [*ref_stack, self.render_key])
+
+    def to_skeleton(self, schema_format: str, ref_stack: list = []):
+        return self.compiled.to_skeleton(schema_format, [*ref_stack, self.render_key])
+
+    def estimate(self, enumerations: Enumerations, ref_stack: list = []) -> dict:
+        """Estimate the size of the JSON schema render, see CompiledProperty.estimate"""
+        return self.compiled.estimate(enumerations, [*ref_stack, self.render_key])
 
     @staticmethod
     def lock_all(status: bool = True):
         return ServiceBase.lock_all(Dictionary, Config.get_instance().DICTIONARY_FOLDER, status)
+
+
+register_service(REF, Dictionary)
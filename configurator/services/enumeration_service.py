@@ -2,7 +2,8 @@ from configurator.utils.configurator_exception import ConfiguratorEvent, Configu
 from configurator.utils.config import Config
 from configurator.services.service_base import ServiceBase
 from configurator.utils.version_number import VersionNumber
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import difflib
 
 from configurator.utils.mongo_io import MongoIO
 
@@ -11,6 +12,11 @@ class Enumerations(ServiceBase):
         super().__init__(file_name, document, Config.get_instance().ENUMERATOR_FOLDER)
         self.version = self._document.get("version", 0)
         self.enumerators = self._document.get("enumerators", [])
+        # enum name -> sorted values, the first enumerator with a name wins
+        self._enum_index = {}
+        for enumeration in self.enumerators:
+            if enumeration.get("name") not in self._enum_index:
+                self._enum_index[enumeration.get("name")] = tuple(sorted({value.get("value") for value in enumeration.get("values") or []}))
 
     def to_dict(self):
         the_dict = super().to_dict()
@@ -18,17 +24,18 @@ class Enumerations(ServiceBase):
         the_dict["enumerators"] = self.enumerators
         return the_dict
 
-    def get_enum_values(self, enum_name: str) -> List[str]:
-        the_values = set()
-        for enumeration in self.enumerators:
-            if enumeration.get("name") == enum_name:
-                for value in enumeration.get("values"): 
-                    the_values.add(value.get("value"))
-                return sorted(list(the_values)) 
+    def get_enum_values(self, enum_name: str) -> Tuple[str, ...]:
+        """Return the sorted values of an enumerator, from the index built
+        when the enumerations were loaded."""
+        values = self._enum_index.get(enum_name)
+        if values is not None:
+            return values
 
+        matches = difflib.get_close_matches(str(enum_name), [name for name in self._enum_index if isinstance(name, str)])
+        message = f"Enumeration {enum_name} not found" + (f", did you mean {', '.join(matches)}?" if matches else "")
         event = ConfiguratorEvent(event_id=f"ENU-02", event_type="ERROR", event_data=self.to_dict())
-        event.record_failure(f"Enumeration {enum_name} not found")
-        raise ConfiguratorException(f"Enumeration {enum_name} not found", event)
+        event.record_failure(message)
+        raise ConfiguratorException(message, event)
     
     def upsert(self, mongo_io: MongoIO) -> ConfiguratorEvent:
         event = ConfiguratorEvent(event_id=f"ENU-01-{self.file_name}", event_type="PROCESS", event_data=self.to_dict())
@@ -1,32 +1,83 @@
+import os
+
 from configurator.services.enumeration_service import Enumerations
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
+from configurator.utils.document_cache import signature, is_racy
 from configurator.utils.file_io import FileIO
 from configurator.utils.config import Config
+from configurator.utils.schema_cache import DependencyRecorder, record_dependency
 from configurator.utils.version_number import VersionNumber
 import logging
 
 logger = logging.getLogger(__name__)
 
 class Enumerators:
-    """A helper class for loading and accessing enumerations - not a service"""
+    """A helper class for loading and accessing enumerations - not a service
+
+    The enumerations of the enumerators folder are loaded once per process
+    and shared, with a version -> enumerations index. The registry is valid
+    while the (st_mtime_ns, st_size) of the folder and of every file in it
+    are unchanged, and is cleared when an enumerations file is written
+    through the enumerator routes. Shared enumerations must not be changed
+    by the caller.
+    """
+    # (folder, folder signature, {file_name: signature}, enumerations, {version: enumerations})
+    _registry = None
+
     def __init__(self):
         self.config = Config.get_instance()
-        self.enumerations = []
+        folder = os.path.join(self.config.INPUT_FOLDER, self.config.ENUMERATOR_FOLDER)
+        registry = Enumerators._load(folder)
+        self.enumerations = list(registry[3])
+        self._versions = registry[4]
 
-        files = FileIO.get_documents(self.config.ENUMERATOR_FOLDER)
-        for file in files:
-            self.enumerations.append(Enumerations(file.file_name))
+    @staticmethod
+    def _load(folder: str) -> tuple:
+        """Return the registry of a folder, loading it if it is not registered
+        or a file in it changed."""
+        registry = Enumerators._registry
+        if registry is not None and registry[0] == folder:
+            try:
+                valid = signature(os.stat(folder)) == registry[1]
+                stats = {file_name: os.stat(os.path.join(folder, file_name)) for file_name in registry[2]} if valid else {}
+                valid = valid and all(signature(stats[file_name]) == file_signature for file_name, file_signature in registry[2].items())
+            except OSError:
+                valid = False
+            if valid:
+                # Renders record the files they read, a registered file is not read again
+                for file_name, stat in stats.items():
+                    record_dependency(folder, file_name, stat)
+                return registry
+
+        try:
+            folder_stat = os.stat(folder)
+        except OSError:
+            folder_stat = None
+        with DependencyRecorder() as dependencies:
+            enumerations = [Enumerations(file.file_name) for file in FileIO.get_documents(Config.get_instance().ENUMERATOR_FOLDER)]
+        versions = {}
+        for enumeration in enumerations:
+            versions.setdefault(enumeration.version, enumeration)
+        stats = {enumeration.file_name: dependencies.get((folder, enumeration.file_name)) for enumeration in enumerations}
+        registry = (folder, folder_stat and signature(folder_stat), {file_name: stat and signature(stat) for file_name, stat in stats.items()}, enumerations, versions)
+        if folder_stat is not None and not is_racy(folder_stat) and all(stat is not None and not is_racy(stat) for stat in stats.values()):
+            Enumerators._registry = registry
+        return registry
+
+    @staticmethod
+    def clear():
+        """Drop the registry, the next Enumerators() reloads the folder."""
+        Enumerators._registry = None
 
     def get_version(self, version_str: str) -> Enumerations:
         """Get enumerations for a specific version string"""
         version = VersionNumber(version_str)
         version_number = version.get_enumerator_version()
-        for enumeration in self.enumerations:
-            if enumeration.version == version_number:
-                return enumeration
+        enumeration = self._versions.get(version_number)
+        if enumeration is not None:
+            return enumeration
 
         event = ConfiguratorEvent("ENU-06", "GET_ENUMERATION_VERSION")
         event.record_failure(f"Version {version_str} not found")
         logger.error(f"Version {version_str} not found")
         raise ConfiguratorException(f"Version {version_str} not found", event)
-
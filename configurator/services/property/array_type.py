@@ -1,25 +1,30 @@
-from configurator.services.enumeration_service import Enumerations
-from .base import BaseProperty
-from .property import Property
+from .base import PropertyType
+from .property import Property, property_to_dict
+
+class ArrayType(PropertyType):
+    __slots__ = ("_items_data", "_items")
 
-class ArrayType(BaseProperty):
     def __init__(self, data: dict):
         super().__init__(data)
         items_data = data.get("items", {})
-        items_data = {**items_data, "name": items_data.get("name", "items")}
-        self.items = Property(items_data)
+        self._items_data = {**items_data, "name": items_data.get("name", "items")}
+        self._items = None
+
+    @property
+    def items(self):
+        """The items property, parsed on first access"""
+        if self._items is None:
+            self._items = Property(self._items_data)
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._items = items
 
     def to_dict(self):
         the_dict = super().to_dict()
-        the_dict['items'] = self.items.to_dict()
+        if self._items is None:
+            the_dict['items'] = property_to_dict(self._items_data)
+        else:
+            the_dict['items'] = self._items.to_dict()
         return the_dict
-
-    def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = super().to_json_schema(enumerations, ref_stack)
-        the_schema['items'] = self.items.to_json_schema(enumerations, ref_stack)
-        return the_schema
-
-    def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = super().to_bson_schema(enumerations, ref_stack)
-        the_schema['items'] = self.items.to_bson_schema(enumerations, ref_stack)
-        return the_schema
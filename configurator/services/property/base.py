@@ -1,14 +1,13 @@
 """Base class for all property types"""
 
-from configurator.utils.config import Config
 from configurator.services.enumeration_service import Enumerations
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 
 class BaseProperty:
     """Base class for all property types"""
-    
+    __slots__ = ("name", "description", "type", "required")
+
     def __init__(self, data: dict):
-        self.config = Config.get_instance()
         if 'name' not in data:
             event = ConfiguratorEvent(event_id="TYP-01", event_type="MISSING_NAME", event_data=data)
             raise ConfiguratorException("Missing required name", event)
@@ -38,4 +37,36 @@ class BaseProperty:
         """Convert to BSON schema format"""
         the_schema = {}
         the_schema['bsonType'] = self.type
-        return the_schema 
\ No newline at end of file
+        return the_schema
+
+    def to_schemas(self, enumerations: Enumerations, ref_stack: list = []):
+        """Convert to JSON and BSON schema format in a single walk, returns (json_schema, bson_schema)"""
+        json_schema = {}
+        json_schema['description'] = self.description
+        json_schema['type'] = self.type
+        bson_schema = {}
+        bson_schema['bsonType'] = self.type
+        return json_schema, bson_schema
+
+
+class PropertyType(BaseProperty):
+    """Base class of the property types built by the Property factory,
+    rendered by compiling their to_dict with CompiledProperty"""
+    __slots__ = ()
+
+    def _compiled(self):
+        """The property compiled for rendering, see CompiledProperty"""
+        from .compiled import CompiledProperty  # compiled imports the services that import this package
+        return CompiledProperty.compile(self.to_dict())
+
+    def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
+        """Convert to JSON schema format, rendered by CompiledProperty"""
+        return self._compiled().to_json_schema(enumerations, ref_stack)
+
+    def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
+        """Convert to BSON schema format, rendered by CompiledProperty"""
+        return self._compiled().to_bson_schema(enumerations, ref_stack)
+
+    def to_schemas(self, enumerations: Enumerations, ref_stack: list = []):
+        """Convert to JSON and BSON schema format in a single walk, returns (json_schema, bson_schema)"""
+        return self._compiled().to_schemas(enumerations, ref_stack)
@@ -0,0 +1,634 @@
+"""Property trees compiled to a flat, array backed representation.
+
+A CompiledProperty holds one entry per node in parallel arrays, laid out
+breadth first so the children of a node are the consecutive entries
+first_child[i] .. first_child[i] + child_count[i]. Names, descriptions and
+types are indexes into a table of interned strings. The emitters render by
+visiting the nodes from last to first, every child is rendered before its
+parent, without building a Property object per node or recursing through
+the tree. Refs and custom types are rendered on an explicit stack of files
+that detects cycles and enforces RENDER_STACK_MAX_DEPTH, see _render.
+
+Compiling reads the raw property data, and follows the same rules (and
+raises the same errors) as the Property classes, which render by compiling
+their to_dict.
+
+estimate predicts the size of a render from the compiled trees of the
+files it uses, without rendering, and to_json_schema_defs renders each of
+those files once into $defs, see Version for the render budget.
+to_skeleton renders without enumerations, see SchemaSkeleton.
+"""
+import json
+from array import array
+
+from configurator.utils.config import Config
+from configurator.utils.render_profile import ROOT_FRAME, ProfiledEnumerations, current_profile
+from configurator.utils.schema_defs import def_pointer
+from configurator.utils.schema_skeleton import SchemaSkeleton, SlotEnumerations
+from configurator.services.enumeration_service import Enumerations
+from configurator.services.service_registry import ServiceRegistry
+from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
+
+# Node kinds, any other type is a custom type
+OBJECT, ARRAY, ONE_OF, SIMPLE, ENUM, ENUM_ARRAY, COMPLEX, CONSTANT, REF, CUSTOM = range(10)
+KINDS = {
+    "object": OBJECT,
+    "array": ARRAY,
+    "one_of": ONE_OF,
+    "simple": SIMPLE,
+    "enum": ENUM,
+    "enum_array": ENUM_ARRAY,
+    "complex": COMPLEX,
+    "constant": CONSTANT,
+    "ref": REF,
+}
+
+# The version of the rendered output, increment it with any change to the
+# schemas the emitters produce so schemas kept by SchemaArtifacts are
+# rendered again
+RENDERER_VERSION = 1
+
+# The services ref and custom type nodes render through, see register_service
+_services = {}
+
+
+def register_service(kind: int, service_class):
+    """Register the service class (Dictionary for REF, Type for CUSTOM) a
+    node kind renders through."""
+    _services[kind] = service_class
+
+
+def _dictionary_filename(ref: str) -> str:
+    """The dictionary file of a ref, .yaml is appended if it has no extension."""
+    if ref.endswith('.yaml') or ref.endswith('.json'):
+        return ref
+    return f"{ref}.yaml"
+
+
+# Characters of the JSON schema of a node with empty strings, see _own_size
+_JSON_SHELLS = {
+    OBJECT: len('{"description": "", "type": "", "additionalProperties": false, "properties": {}}'),
+    ARRAY: len('{"description": "", "type": "", "items": }'),
+    ONE_OF: len('{"description": "", "oneOf": []}'),
+    SIMPLE: len('{"description": ""}'),
+    ENUM: len('{"description": "", "type": "string", "enum": []}'),
+    ENUM_ARRAY: len('{"description": "", "type": "array", "items": {"type": "string", "enum": []}}'),
+    COMPLEX: len('{"description": ""}'),
+    CONSTANT: len('{"description": "", "type": "string", "const": ""}'),
+}
+# Characters of a property name as a key, '"": ' and the ', ' before the next one
+_KEY_SIZE = len('"": , ')
+# Characters of the type keyword, SIMPLE and COMPLEX nodes take it from their schema
+_TYPE_SIZE = len(', "type": ""')
+# Characters of a $ref to a $defs entry without the name, and of the
+# description a custom type adds to it
+_REF_SIZE = len('{"$ref": "#/$defs/"}')
+_DESCRIPTION_SIZE = len(', "description": ""')
+# Characters of $defs, and of an entry without its name and schema
+_DEFS_SIZE = len(', "$defs": {}')
+
+
+def _def_name(key: str) -> str:
+    """The $defs name of a file of a render stack, "folder/user.1.0.0.yaml" is user.1.0.0"""
+    name = key.rsplit("/", 1)[-1]
+    return name.rsplit(".", 1)[0] if name.endswith(('.yaml', '.json')) else name
+
+
+class CompiledProperty:
+    """A Property tree as parallel arrays, node 0 is the root."""
+    __slots__ = ("kinds", "names", "descriptions", "types", "first_child", "child_count", "values", "strings", "_size")
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.names = array('I')
+        self.descriptions = array('I')
+        self.types = array('I')
+        self.first_child = array('I')
+        self.child_count = array('I')
+        self.values = []  # Per node payload, see compile
+        self.strings = []
+        self._size = None  # See _own_size
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @staticmethod
+    def compile(data: dict) -> "CompiledProperty":
+        """Compile raw property data, as passed to Property."""
+        compiled = CompiledProperty()
+        strings = compiled.strings
+        interned = {}
+
+        def intern(value) -> int:
+            try:
+                index = interned.setdefault((type(value), value), len(strings))
+            except TypeError:
+                index = len(strings)
+            if index == len(strings):
+                strings.append(value)
+            return index
+
+        add_kind, add_name, add_description, add_type = compiled.kinds.append, compiled.names.append, compiled.descriptions.append, compiled.types.append
+        add_value, add_first_child, add_child_count = compiled.values.append, compiled.first_child.append, compiled.child_count.append
+        nodes = [data]
+        index = 0
+        while index < len(nodes):
+            data = nodes[index]
+            index += 1
+            if 'name' not in data:
+                event = ConfiguratorEvent(event_id="TYP-01", event_type="MISSING_NAME", event_data=data)
+                raise ConfiguratorException("Missing required name", event)
+
+            type_ = data.get('type', 'void')
+            kind = KINDS.get(type_, CUSTOM)
+            children = ()
+            if kind == SIMPLE:
+                value = data.get("schema", {})
+            elif kind == OBJECT:
+                children = data.get("properties", [])
+                required = tuple(child.get('name') for child in children if child.get('required', False))
+                value = (data.get("additional_properties", False), required)
+            elif kind == ARRAY:
+                value = None
+                items_data = data.get("items", {})
+                children = [{**items_data, "name": items_data.get("name", "items")}]
+            elif kind == ENUM or kind == ENUM_ARRAY:
+                value = data.get("enums", "")
+            elif kind == CONSTANT:
+                value = data.get("constant", "")
+            elif kind == COMPLEX:
+                value = (data.get("json_type", {}), data.get("bson_type", {}))
+            elif kind == ONE_OF:
+                value = None
+                children = data.get("properties", [])
+            elif kind == REF:
+                value = data.get("ref", "")
+            else:
+                value = f"{type_}.yaml"
+
+            add_kind(kind)
+            add_name(intern(data.get('name')))
+            add_description(intern(data.get('description', '')))
+            add_type(intern(type_))
+            add_value(value)
+            add_first_child(len(nodes))
+            add_child_count(len(children))
+            nodes.extend(children)
+        return compiled
+
+    def _emit_json(self, rendered: list, start: int, enumerations: Enumerations) -> int:
+        """Render the JSON schema of nodes start..0 into rendered. Returns the
+        index of the first ref or custom type node reached, -1 when done."""
+        kinds, strings, names, descriptions, types, values = self.kinds, self.strings, self.names, self.descriptions, self.types, self.values
+        first_child, child_count = self.first_child, self.child_count
+        for index in range(start, -1, -1):
+            kind = kinds[index]
+            value = values[index]
+            if kind == SIMPLE:
+                the_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]]}
+                the_schema.update(value)
+            elif kind == OBJECT:
+                first = first_child[index]
+                children = range(first, first + child_count[index])
+                the_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]], 'additionalProperties': value[0]}
+                the_schema['properties'] = {strings[names[child]]: rendered[child] for child in children}
+                if value[1]: the_schema['required'] = list(value[1])
+            elif kind == ARRAY:
+                the_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]], 'items': rendered[first_child[index]]}
+            elif kind == ENUM:
+                the_schema = {'description': strings[descriptions[index]], 'type': 'string', 'enum': list(enumerations.get_enum_values(value))}
+            elif kind == ENUM_ARRAY:
+                the_schema = {'description': strings[descriptions[index]], 'type': 'array', 'items': {'type': 'string', 'enum': list(enumerations.get_enum_values(value))}}
+            elif kind == CONSTANT:
+                the_schema = {'description': strings[descriptions[index]], 'type': 'string', 'const': value}
+            elif kind == COMPLEX:
+                the_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]]}
+                the_schema.update(value[0])
+            elif kind == ONE_OF:
+                first = first_child[index]
+                the_schema = {'description': strings[descriptions[index]], 'oneOf': rendered[first:first + child_count[index]]}
+            else:
+                return index
+            rendered[index] = the_schema
+        return -1
+
+    def _emit_bson(self, rendered: list, start: int, enumerations: Enumerations) -> int:
+        """Render the BSON schema of nodes start..0, see _emit_json."""
+        kinds, strings, names, types, values = self.kinds, self.strings, self.names, self.types, self.values
+        first_child, child_count = self.first_child, self.child_count
+        for index in range(start, -1, -1):
+            kind = kinds[index]
+            value = values[index]
+            if kind == SIMPLE:
+                the_schema = {'bsonType': strings[types[index]]}
+                the_schema.update(value)
+                the_schema["bsonType"] = the_schema["type"]
+                del the_schema["type"]
+            elif kind == OBJECT:
+                first = first_child[index]
+                children = range(first, first + child_count[index])
+                the_schema = {'bsonType': strings[types[index]], 'additionalProperties': value[0]}
+                the_schema['properties'] = {strings[names[child]]: rendered[child] for child in children}
+                if value[1]: the_schema['required'] = list(value[1])
+            elif kind == ARRAY:
+                the_schema = {'bsonType': strings[types[index]], 'items': rendered[first_child[index]]}
+            elif kind == ENUM:
+                the_schema = {'bsonType': 'string', 'enum': list(enumerations.get_enum_values(value))}
+            elif kind == ENUM_ARRAY:
+                the_schema = {'bsonType': 'array', 'items': {'bsonType': 'string', 'enum': list(enumerations.get_enum_values(value))}}
+            elif kind == CONSTANT:
+                the_schema = {'bsonType': 'string', 'enum': [value]}
+            elif kind == COMPLEX:
+                the_schema = {'bsonType': strings[types[index]]}
+                the_schema.update(value[1])
+            elif kind == ONE_OF:
+                first = first_child[index]
+                the_schema = {'oneOf': rendered[first:first + child_count[index]]}
+            else:
+                return index
+            rendered[index] = the_schema
+        return -1
+
+    def _emit_schemas(self, rendered: tuple, start: int, enumerations: Enumerations) -> int:
+        """Render the JSON and BSON schemas of nodes start..0 in one pass into
+        rendered, a (json, bson) pair of lists, see _emit_json."""
+        kinds, strings, names, descriptions, types, values = self.kinds, self.strings, self.names, self.descriptions, self.types, self.values
+        first_child, child_count = self.first_child, self.child_count
+        json_rendered, bson_rendered = rendered
+        for index in range(start, -1, -1):
+            kind = kinds[index]
+            value = values[index]
+            if kind == SIMPLE:
+                json_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]]}
+                json_schema.update(value)
+                bson_schema = {'bsonType': strings[types[index]]}
+                bson_schema.update(value)
+                bson_schema["bsonType"] = bson_schema["type"]
+                del bson_schema["type"]
+            elif kind == OBJECT:
+                first = first_child[index]
+                children = range(first, first + child_count[index])
+                json_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]], 'additionalProperties': value[0]}
+                bson_schema = {'bsonType': strings[types[index]], 'additionalProperties': value[0]}
+                json_schema['properties'] = {strings[names[child]]: json_rendered[child] for child in children}
+                bson_schema['properties'] = {strings[names[child]]: bson_rendered[child] for child in children}
+                if value[1]:
+                    json_schema['required'] = list(value[1])
+                    bson_schema['required'] = list(value[1])
+            elif kind == ARRAY:
+                json_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]], 'items': json_rendered[first_child[index]]}
+                bson_schema = {'bsonType': strings[types[index]], 'items': bson_rendered[first_child[index]]}
+            elif kind == ENUM:
+                enum_values = enumerations.get_enum_values(value)
+                json_schema = {'description': strings[descriptions[index]], 'type': 'string', 'enum': list(enum_values)}
+                bson_schema = {'bsonType': 'string', 'enum': list(enum_values)}
+            elif kind == ENUM_ARRAY:
+                enum_values = enumerations.get_enum_values(value)
+                json_schema = {'description': strings[descriptions[index]], 'type': 'array', 'items': {'type': 'string', 'enum': list(enum_values)}}
+                bson_schema = {'bsonType': 'array', 'items': {'bsonType': 'string', 'enum': list(enum_values)}}
+            elif kind == CONSTANT:
+                json_schema = {'description': strings[descriptions[index]], 'type': 'string', 'const': value}
+                bson_schema = {'bsonType': 'string', 'enum': [value]}
+            elif kind == COMPLEX:
+                json_schema = {'description': strings[descriptions[index]], 'type': strings[types[index]]}
+                json_schema.update(value[0])
+                bson_schema = {'bsonType': strings[types[index]]}
+                bson_schema.update(value[1])
+            elif kind == ONE_OF:
+                first = first_child[index]
+                json_schema = {'description': strings[descriptions[index]], 'oneOf': json_rendered[first:first + child_count[index]]}
+                bson_schema = {'oneOf': bson_rendered[first:first + child_count[index]]}
+            else:
+                return index
+            json_rendered[index] = json_schema
+            bson_rendered[index] = bson_schema
+        return -1
+
+    def _attach_json(self, rendered: list, index: int, schema: dict):
+        """Place the schema rendered for a ref or custom type node, see CustomType"""
+        if self.kinds[index] == CUSTOM:
+            schema["description"] = self.strings[self.descriptions[index]]
+        rendered[index] = schema
+
+    def _attach_bson(self, rendered: list, index: int, schema: dict):
+        rendered[index] = schema
+
+    def _attach_schemas(self, rendered: tuple, index: int, schemas: tuple):
+        self._attach_json(rendered[0], index, schemas[0])
+        rendered[1][index] = schemas[1]
+
+    def _new_rendered(self, schema_format: str):
+        if schema_format == "both":
+            return [None] * len(self.kinds), [None] * len(self.kinds)
+        return [None] * len(self.kinds)
+
+    @staticmethod
+    def _rendered_root(schema_format: str, rendered):
+        if schema_format == "both":
+            return rendered[0][0], rendered[1][0]
+        return rendered[0]
+
+    def _resolve(self, index: int):
+        """The Dictionary of a ref node or the Type of a custom type node."""
+        if self.kinds[index] == REF:
+            return ServiceRegistry.get_instance().get(_services[REF], _dictionary_filename(self.values[index]))
+        return ServiceRegistry.get_instance().get(_services[CUSTOM], self.values[index])
+
+    @staticmethod
+    def _stack_error(name: str, chain: list, key: str, max_depth: int):
+        """A ConfiguratorException if rendering key from property name would
+        close a cycle or exceed max_depth, otherwise None."""
+        path = [*chain, key]
+        if key in chain:
+            event = ConfiguratorEvent(event_id="REF-04", event_type="RENDER_CYCLE")
+            message = f"Circular reference {' -> '.join(path[path.index(key):])} in property '{name}'"
+        elif max_depth > 0 and len(path) > max_depth:
+            event = ConfiguratorEvent(event_id="REF-05", event_type="RENDER_DEPTH_EXCEEDED")
+            message = f"Render depth {max_depth} exceeded in property '{name}'"
+        else:
+            return None
+        event.record_failure(message, {"path": path, "property_name": name})
+        return ConfiguratorException(message, event)
+
+    @staticmethod
+    def _wrap_ref_error(compiled: "CompiledProperty", index: int, error: Exception, event_id: str, event_type: str, label: str) -> ConfiguratorException:
+        """Wrap an error raised under a ref node with the context of the ref, see RefType"""
+        ref = compiled.values[index]
+        name = compiled.strings[compiled.names[index]]
+        event = ConfiguratorEvent(event_id=event_id, event_type=event_type)
+        if isinstance(error, ConfiguratorException):
+            event.data = {"ref": ref, "property_name": name}
+            event.append_events([error.event])
+            event.record_failure(f"Failed to render {label} for ref '{ref}' in property '{name}'")
+            return ConfiguratorException(f"Failed to render {label} for ref '{ref}' in property '{name}'", event)
+        event.data = {"ref": ref, "property_name": name, "error": str(error)}
+        event.record_failure(f"Unexpected error rendering {label} for ref '{ref}' in property '{name}': {str(error)}")
+        return ConfiguratorException(f"Unexpected error rendering {label} for ref '{ref}' in property '{name}': {str(error)}", event)
+
+    def _render(self, schema_format: str, enumerations: Enumerations, ref_stack: list):
+        """Render this tree and the dictionaries and types it uses with an
+        explicit stack of frames, one per file being rendered.
+
+        ref_stack is the chain of files being rendered, ending with this one,
+        as "folder/file_name". Reaching a file already in the chain is a
+        cycle, a chain longer than RENDER_STACK_MAX_DEPTH (0 for no limit)
+        is an error, both are raised with the path of files.
+
+        With an active RenderProfile each frame is reported to it, see
+        RenderProfile. The profile is looked up once per render, not per node.
+        """
+        emit, attach, event_id, event_type, label = _FORMATS[schema_format]
+        max_depth = Config.get_instance().RENDER_STACK_MAX_DEPTH
+        chain = list(ref_stack)
+        if chain:
+            error = CompiledProperty._stack_error(self.strings[self.names[0]], chain[:-1], chain[-1], max_depth)
+            if error is not None:
+                raise error
+        profile = current_profile()
+        if profile is not None:
+            profile_depth = profile.depth
+            profile.enter(chain[-1] if chain else ROOT_FRAME, len(self))
+            if not isinstance(enumerations, ProfiledEnumerations):
+                enumerations = ProfiledEnumerations(enumerations, profile)
+        frames = [[self, self._new_rendered(schema_format), len(self) - 1]]  # [compiled, rendered, next index]
+        resolving = False
+        try:
+            while True:
+                frame = frames[-1]
+                compiled, rendered = frame[0], frame[1]
+                index = emit(compiled, rendered, frame[2], enumerations)
+                if index >= 0:
+                    # Paused on a ref or custom type, render its file first
+                    frame[2] = index
+                    if profile is not None:
+                        profile.tick()
+                    resolving = True
+                    service = compiled._resolve(index)
+                    resolving = False
+                    key = service.render_key
+                    error = CompiledProperty._stack_error(compiled.strings[compiled.names[index]], chain, key, max_depth)
+                    if error is not None:
+                        break
+                    chain.append(key)
+                    frames.append([service.compiled, service.compiled._new_rendered(schema_format), len(service.compiled) - 1])
+                    if profile is not None:
+                        profile.tick(f"[resolve] {key}")
+                        profile.enter(key, len(service.compiled))
+                    continue
+
+                frames.pop()
+                result = CompiledProperty._rendered_root(schema_format, rendered)
+                if not frames:
+                    if profile is not None:
+                        profile.leave()
+                    return result
+                chain.pop()
+                parent = frames[-1]
+                if profile is not None:
+                    profile.leave(parent[0].strings[parent[0].names[parent[2]]])
+                attach(parent[0], parent[1], parent[2], result)
+                parent[2] -= 1
+        except Exception as e:
+            if profile is not None:
+                profile.unwind(profile_depth)
+            # Each ref between the root and the failure adds its context, as RefType does
+            paused = frames if resolving else frames[:-1]
+            wrapped = e
+            for compiled, _, index in reversed(paused):
+                if compiled.kinds[index] == REF:
+                    wrapped = CompiledProperty._wrap_ref_error(compiled, index, wrapped, event_id, event_type, label)
+            if wrapped is e:
+                raise
+            raise wrapped
+        if profile is not None:
+            profile.unwind(profile_depth)
+        raise error
+
+    def _own_size(self) -> tuple:
+        """(nodes, characters, enums, refs, ref_characters) of this tree
+        alone: the number of nodes it renders and the estimated length of
+        their JSON schema without enum values, the enumerator of each enum
+        and enum_array node, the indexes of its ref and custom type nodes and
+        their length as a $ref, see to_json_schema_defs. Computed once,
+        compiled trees are not changed."""
+        if self._size is not None:
+            return self._size
+        kinds, strings, names, descriptions, types, values = self.kinds, self.strings, self.names, self.descriptions, self.types, self.values
+        nodes, characters, enums, refs, ref_characters = 0, 0, [], [], 0
+        for index in range(len(kinds)):
+            kind, value = kinds[index], values[index]
+            if index > 0:  # The root is rendered in place of the node that uses it
+                characters += len(strings[names[index]]) + _KEY_SIZE
+            if kind == REF or kind == CUSTOM:
+                refs.append(index)
+                ref_characters += _REF_SIZE + len(_def_name(_dictionary_filename(value) if kind == REF else value))
+                if kind == CUSTOM:
+                    ref_characters += _DESCRIPTION_SIZE + len(strings[descriptions[index]])
+                continue
+            nodes += 1
+            characters += _JSON_SHELLS[kind] + len(strings[descriptions[index]])
+            if kind == OBJECT or kind == ARRAY:
+                characters += len(strings[types[index]])
+                if kind == OBJECT and value[1]:
+                    characters += len(', "required": []') + sum(len(str(name)) + 4 for name in value[1])
+            elif kind == SIMPLE or kind == COMPLEX:
+                extra = value if kind == SIMPLE else value[0]
+                if "type" not in extra:
+                    characters += _TYPE_SIZE + len(strings[types[index]])
+                characters += len(json.dumps(extra, default=str)) if extra else 0
+            elif kind == ENUM or kind == ENUM_ARRAY:
+                enums.append(value)
+            elif kind == CONSTANT:
+                characters += len(str(value))
+        self._size = (nodes, characters, tuple(enums), tuple(refs), ref_characters)
+        return self._size
+
+    def estimate(self, enumerations: Enumerations, ref_stack: list = []) -> dict:
+        """Estimate the JSON schema render of this tree from the compiled
+        trees of the dictionaries and types it uses, without rendering.
+
+        Each file is sized once, a file's inline size is its own size plus
+        the inline size of every file it renders, times the number of nodes
+        that render it. Returns {nodes, bytes, depth} of the inline render,
+        {defs_nodes, defs_bytes} of to_json_schema_defs, and files, one
+        {file, uses, nodes, bytes, inline_nodes, inline_bytes} per file, the
+        largest contribution first. bytes are the estimated length of the
+        schema as JSON. A cycle raises the error _render would raise.
+        """
+        root = ref_stack[-1] if ref_stack else ROOT_FRAME
+        enum_sizes = {}
+        own = {}       # key -> (nodes, characters, ref_characters)
+        targets = {}   # key -> {target key: number of nodes rendering it}
+        inline = {}    # key -> (nodes, characters, depth)
+        order = []     # keys, every file after the files it renders
+        path, on_path = [], set()
+        stack = [(root, self, False)]
+        while stack:
+            key, compiled, expanded = stack.pop()
+            if expanded:
+                path.pop()
+                on_path.discard(key)
+                nodes, characters, _ = own[key]
+                depth = 1
+                for target, count in targets[key].items():
+                    target_nodes, target_characters, target_depth = inline[target]
+                    nodes += count * target_nodes
+                    characters += count * target_characters
+                    depth = max(depth, target_depth + 1)
+                inline[key] = (nodes, characters, depth)
+                order.append(key)
+                continue
+            if key in inline:
+                continue
+            path.append(key)
+            on_path.add(key)
+            stack.append((key, compiled, True))
+            nodes, characters, enums, refs, ref_characters = compiled._own_size()
+            for enum_name in enums:
+                if enum_name not in enum_sizes:
+                    enum_sizes[enum_name] = sum(len(json.dumps(value, default=str)) + 2 for value in enumerations.get_enum_values(enum_name))
+                characters += enum_sizes[enum_name]
+            own[key] = (nodes, characters, ref_characters)
+            counts = targets[key] = {}
+            for index in refs:
+                service = compiled._resolve(index)
+                target = service.render_key
+                if target in on_path:
+                    raise CompiledProperty._stack_error(compiled.strings[compiled.names[index]], path, target, 0)
+                counts[target] = counts.get(target, 0) + 1
+                if target not in inline:
+                    stack.append((target, service.compiled, False))
+
+        uses = dict.fromkeys(order, 0)
+        uses[root] = 1
+        for key in reversed(order):
+            for target, count in targets[key].items():
+                uses[target] += uses[key] * count
+        defs_characters = sum(characters + ref_characters for _, characters, ref_characters in own.values())
+        if len(order) > 1:
+            defs_characters += _DEFS_SIZE + sum(len(_def_name(key)) + _KEY_SIZE for key in order if key != root)
+        files = [
+            {"file": key, "uses": uses[key], "nodes": own[key][0], "bytes": own[key][1],
+             "inline_nodes": inline[key][0], "inline_bytes": inline[key][1]}
+            for key in order
+        ]
+        files.sort(key=lambda file: -file["uses"] * file["bytes"])
+        return {
+            "nodes": inline[root][0],
+            "bytes": inline[root][1],
+            "depth": inline[root][2],
+            "defs_nodes": sum(nodes for nodes, _, _ in own.values()) + sum(sum(counts.values()) for counts in targets.values()),
+            "defs_bytes": defs_characters,
+            "files": files,
+        }
+
+    def _render_defs(self, enumerations: Enumerations, reference) -> dict:
+        """Render the JSON schema of this tree alone, the schema of each ref
+        and custom type node is reference(index)."""
+        rendered = self._new_rendered("json")
+        index = len(self) - 1
+        while True:
+            index = self._emit_json(rendered, index, enumerations)
+            if index < 0:
+                return rendered[0]
+            self._attach_json(rendered, index, reference(self, index))
+            index -= 1
+
+    def to_json_schema_defs(self, enumerations: Enumerations, ref_stack: list = []) -> dict:
+        """Render the JSON schema with every dictionary and type it uses
+        rendered once under $defs, and each ref or custom type node as a $ref
+        to its entry. The output grows with the number of files, not with the
+        number of times they are used, see estimate."""
+        names = {}  # render key -> $defs name
+        pending = []  # ($defs name, compiled) in the order they are first referenced
+
+        def reference(compiled: "CompiledProperty", index: int) -> dict:
+            try:
+                service = compiled._resolve(index)
+            except Exception as e:
+                if compiled.kinds[index] == REF:
+                    raise CompiledProperty._wrap_ref_error(compiled, index, e, "REF-01", "RENDER_REF_JSON_SCHEMA", "JSON schema")
+                raise
+            key = service.render_key
+            if key not in names:
+                name, suffix = _def_name(key), 2
+                while name in taken:
+                    name, suffix = f"{_def_name(key)}_{suffix}", suffix + 1
+                taken.add(name)
+                names[key] = name
+                pending.append((name, service.compiled))
+            return {"$ref": def_pointer(names[key])}
+
+        taken = set()
+        schema = self._render_defs(enumerations, reference)
+        defs = {}
+        for name, compiled in pending:  # Grows as the entries reference more files
+            defs[name] = compiled._render_defs(enumerations, reference)
+        if defs:
+            schema["$defs"] = defs
+        return schema
+
+    def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
+        """Render the JSON schema, see _render for ref_stack"""
+        return self._render("json", enumerations, ref_stack)
+
+    def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
+        """Render the BSON schema, see _render for ref_stack"""
+        return self._render("bson", enumerations, ref_stack)
+
+    def to_schemas(self, enumerations: Enumerations, ref_stack: list = []):
+        """Render the JSON and BSON schemas in one pass, returns (json_schema, bson_schema)"""
+        return self._render("both", enumerations, ref_stack)
+
+    def to_skeleton(self, schema_format: str, ref_stack: list = []) -> SchemaSkeleton:
+        """Render schema_format (json, bson or both) with an enum slot in place
+        of the values of each enumerator, see SchemaSkeleton.fill"""
+        return SchemaSkeleton(self._render(schema_format, SlotEnumerations(), ref_stack))
+
+
+# schema format -> (emit, attach, ref event id, ref event type, label)
+_FORMATS = {
+    "json": (CompiledProperty._emit_json, CompiledProperty._attach_json, "REF-01", "RENDER_REF_JSON_SCHEMA", "JSON schema"),
+    "bson": (CompiledProperty._emit_bson, CompiledProperty._attach_bson, "REF-02", "RENDER_REF_BSON_SCHEMA", "BSON schema"),
+    "both": (CompiledProperty._emit_schemas, CompiledProperty._attach_schemas, "REF-03", "RENDER_REF_SCHEMAS", "schemas"),
+}
@@ -1,7 +1,8 @@
-from configurator.services.enumeration_service import Enumerations
-from .base import BaseProperty
+from .base import PropertyType
+
+class ComplexType(PropertyType):
+    __slots__ = ("bson_type", "json_type")
 
-class ComplexType(BaseProperty):
     def __init__(self, data: dict):
         super().__init__(data)
         self.bson_type = data.get("bson_type", {})
@@ -12,14 +13,3 @@ class ComplexType(BaseProperty):
         the_dict['bson_type'] = self.bson_type
         the_dict['json_type'] = self.json_type
         return the_dict
-
-    def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = super().to_json_schema(enumerations, ref_stack)
-        the_schema.update(self.json_type)
-        return the_schema
-
-    def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = super().to_bson_schema(enumerations, ref_stack)
-        the_schema.update(self.bson_type)
-        return the_schema
-
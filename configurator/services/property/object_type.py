@@ -1,33 +1,31 @@
-from configurator.services.enumeration_service import Enumerations
-from .base import BaseProperty
-from .property import Property
+from .base import PropertyType
+from .property import Property, property_to_dict
+
+class ObjectType(PropertyType):
+    __slots__ = ("additional_properties", "_properties_data", "_properties")
 
-class ObjectType(BaseProperty):
     def __init__(self, data: dict):
         super().__init__(data)
         self.additional_properties = data.get("additional_properties", False)
-        self.properties = []
-        for property in data.get("properties", []):
-            self.properties.append(Property(property))
+        self._properties_data = data.get("properties", [])
+        self._properties = None
+
+    @property
+    def properties(self) -> list:
+        """The child properties, parsed on first access"""
+        if self._properties is None:
+            self._properties = [Property(property) for property in self._properties_data]
+        return self._properties
+
+    @properties.setter
+    def properties(self, properties: list):
+        self._properties = properties
 
     def to_dict(self):
         the_dict = super().to_dict()
         the_dict['additional_properties'] = self.additional_properties
-        the_dict['properties'] = [property.to_dict() for property in self.properties]
+        if self._properties is None:
+            the_dict['properties'] = [property_to_dict(property) for property in self._properties_data]
+        else:
+            the_dict['properties'] = [property.to_dict() for property in self._properties]
         return the_dict
-
-    def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = super().to_json_schema(enumerations, ref_stack)
-        the_schema['additionalProperties'] = self.additional_properties
-        the_schema['properties'] = {prop.name: prop.to_json_schema(enumerations, ref_stack) for prop in self.properties}
-        required = [prop.name for prop in self.properties if prop.required]
-        if required: the_schema['required'] = required
-        return the_schema
-
-    def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = super().to_bson_schema(enumerations, ref_stack)
-        the_schema['additionalProperties'] = self.additional_properties
-        the_schema['properties'] = {prop.name: prop.to_bson_schema(enumerations, ref_stack) for prop in self.properties}
-        required = [prop.name for prop in self.properties if prop.required]
-        if required: the_schema['required'] = required
-        return the_schema 
\ No newline at end of file
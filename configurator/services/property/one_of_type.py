@@ -1,26 +1,29 @@
-from configurator.services.enumeration_service import Enumerations
-from .base import BaseProperty
-from .property import Property
+from .base import PropertyType
+from .property import Property, property_to_dict
+
+class OneOfType(PropertyType):
+    __slots__ = ("_properties_data", "_properties")
 
-class OneOfType(BaseProperty):
     def __init__(self, data: dict):
         super().__init__(data)
-        self.properties = []
-        for property in data.get("properties", []):
-            self.properties.append(Property(property))
+        self._properties_data = data.get("properties", [])
+        self._properties = None
+
+    @property
+    def properties(self) -> list:
+        """The alternative properties, parsed on first access"""
+        if self._properties is None:
+            self._properties = [Property(property) for property in self._properties_data]
+        return self._properties
+
+    @properties.setter
+    def properties(self, properties: list):
+        self._properties = properties
 
     def to_dict(self):
         the_dict = super().to_dict()
-        the_dict['properties'] = [property.to_dict() for property in self.properties]
+        if self._properties is None:
+            the_dict['properties'] = [property_to_dict(property) for property in self._properties_data]
+        else:
+            the_dict['properties'] = [property.to_dict() for property in self._properties]
         return the_dict
-
-    def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = {}
-        the_schema['description'] = self.description
-        the_schema['oneOf'] = [property.to_json_schema(enumerations, ref_stack) for property in self.properties]
-        return the_schema
-
-    def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_schema = {}
-        the_schema['oneOf'] = [property.to_bson_schema(enumerations, ref_stack) for property in self.properties]
-        return the_schema
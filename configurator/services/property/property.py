@@ -1,36 +1,78 @@
 """Factory function for creating property types"""
+from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
+
+# type -> property class, loaded on the first Property call. The classes
+# can not be imported with this module: ref and custom types import the
+# Dictionary and Type services, which import this package.
+_property_classes = None
+_custom_type = None
+
+
+def _load_property_classes():
+    global _property_classes, _custom_type
+    from .array_type import ArrayType
+    from .complex_type import ComplexType
+    from .constant_type import ConstantType
+    from .custom_type import CustomType
+    from .enum_array_type import EnumArrayType
+    from .enum_type import EnumType
+    from .object_type import ObjectType
+    from .one_of_type import OneOfType
+    from .ref_type import RefType
+    from .simple_type import SimpleType
+    _custom_type = CustomType
+    _property_classes = {
+        'array': ArrayType,
+        'complex': ComplexType,
+        'constant': ConstantType,
+        'enum_array': EnumArrayType,
+        'enum': EnumType,
+        'object': ObjectType,
+        'one_of': OneOfType,
+        'ref': RefType,
+        'simple': SimpleType,
+    }
+
 
 def Property(data: dict):
     """Factory function to create the appropriate property type"""
-    type_ = data.get('type', 'void')
-    
-    if type_ == 'array':
-        from .array_type import ArrayType
-        return ArrayType(data)
-    elif type_ == 'complex':
-        from .complex_type import ComplexType
-        return ComplexType(data)
-    elif type_ == 'constant':
-        from .constant_type import ConstantType
-        return ConstantType(data)
-    elif type_ == 'enum_array':
-        from .enum_array_type import EnumArrayType
-        return EnumArrayType(data)
-    elif type_ == 'enum':
-        from .enum_type import EnumType
-        return EnumType(data)
-    elif type_ == 'object':
-        from .object_type import ObjectType
-        return ObjectType(data)
-    elif type_ == 'one_of':
-        from .one_of_type import OneOfType
-        return OneOfType(data)
-    elif type_ == 'ref':
-        from .ref_type import RefType
-        return RefType(data)
-    elif type_ == 'simple':
-        from .simple_type import SimpleType
-        return SimpleType(data)
-    else:
-        from .custom_type import CustomType
-        return CustomType(data) 
\ No newline at end of file
+    if _property_classes is None:
+        _load_property_classes()
+    return _property_classes.get(data.get('type', 'void'), _custom_type)(data)
+
+
+# type -> the fields each property class adds to the BaseProperty to_dict, with
+# their defaults. Children in properties and items are converted with them.
+_TO_DICT_FIELDS = {
+    'array': (('items', {}),),
+    'complex': (('bson_type', {}), ('json_type', {})),
+    'constant': (('constant', ""),),
+    'enum_array': (('enums', ""),),
+    'enum': (('enums', ""),),
+    'object': (('additional_properties', False), ('properties', [])),
+    'one_of': (('properties', []),),
+    'ref': (('ref', ""),),
+    'simple': (('schema', {}),),
+}
+
+
+def property_to_dict(data: dict) -> dict:
+    """Return Property(data).to_dict() without building the properties. Used
+    by the to_dict of children that were never accessed."""
+    if 'name' not in data:
+        event = ConfiguratorEvent(event_id="TYP-01", event_type="MISSING_NAME", event_data=data)
+        raise ConfiguratorException("Missing required name", event)
+    the_dict = {
+        'name': data.get('name'),
+        'description': data.get('description', ''),
+        'type': data.get('type', 'void'),
+        'required': data.get('required', False),
+    }
+    for field, default in _TO_DICT_FIELDS.get(the_dict['type'], ()):
+        value = data.get(field, default)
+        if field == 'properties':
+            value = [property_to_dict(property) for property in value]
+        elif field == 'items':
+            value = property_to_dict({**value, "name": value.get("name", "items")})
+        the_dict[field] = value
+    return the_dict
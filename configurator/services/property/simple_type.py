@@ -1,7 +1,8 @@
-from configurator.services.enumeration_service import Enumerations
-from .base import BaseProperty
+from .base import PropertyType
+
+class SimpleType(PropertyType):
+    __slots__ = ("schema",)
 
-class SimpleType(BaseProperty):
     def __init__(self, data: dict):
         super().__init__(data)
         self.schema = data.get("schema", {})
@@ -10,16 +11,3 @@ class SimpleType(BaseProperty):
         the_dict = super().to_dict()
         the_dict['schema'] = self.schema
         return the_dict
-
-    def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_dict = super().to_json_schema(enumerations, ref_stack)
-        the_dict.update(self.schema)
-        return the_dict
-
-    def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        the_dict = super().to_bson_schema(enumerations, ref_stack)
-        the_dict.update(self.schema)
-        the_dict["bsonType"] = the_dict["type"]
-        del the_dict["type"]
-        return the_dict
-
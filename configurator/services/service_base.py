@@ -1,7 +1,15 @@
+import time
+import hashlib
+
 from configurator.utils.config import Config
 from configurator.utils.file_io import FileIO
+from configurator.utils.render_profile import current_profile
+from configurator.utils.summary_index import SummaryIndex, make_entry, is_current
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 
+import logging
+logger = logging.getLogger(__name__)
+
 class ServiceBase:
     def __init__(self, file_name: str = None, document: dict = None, folder_name: str = None):
         self.config = Config.get_instance()
@@ -9,12 +17,21 @@ class ServiceBase:
             event = ConfiguratorEvent(event_id="BASE_01", event_type=f"CREATE_{folder_name}", event_data=document)
             raise ConfiguratorException(f"{folder_name} file name is required", event)
         if document is None:
+            profile = current_profile()
+            started = time.perf_counter_ns()
             document = FileIO.get_document(folder_name, file_name)
+            if profile is not None:
+                profile.record_load(type(self).__name__, time.perf_counter_ns() - started)
         self.file_name = file_name
         self._locked = document.get("_locked", False)
         self._folder_name = folder_name
         self._document = document  # Store the document for subclasses
 
+    @property
+    def render_key(self) -> str:
+        """This file as an entry of a render stack, see CompiledProperty._render"""
+        return f"{self._folder_name}/{self.file_name}"
+
     def to_dict(self):
         return {
             "file_name": self.file_name,
@@ -22,13 +39,19 @@ class ServiceBase:
         }
 
     def save(self):
-        return FileIO.put_document(self._folder_name, self.file_name, self.to_dict())
+        from configurator.services.dependency_graph import DependencyGraph  # the graph imports the property renderer, which imports this module
+        document = FileIO.put_document(self._folder_name, self.file_name, self.to_dict())
+        DependencyGraph.get_instance().update(self._folder_name, self.file_name, document)
+        return document
 
     def delete(self):
         if self._locked:
             event = ConfiguratorEvent(event_id=f"{self._folder_name}-02", event_type=f"DELETE_{self._folder_name.upper()}")
             raise ConfiguratorException(f"Cannot delete locked {self._folder_name}", event)
-        return FileIO.delete_document(self._folder_name, self.file_name)
+        from configurator.services.dependency_graph import DependencyGraph  # see save
+        event = FileIO.delete_document(self._folder_name, self.file_name)
+        DependencyGraph.get_instance().remove(self._folder_name, self.file_name)
+        return event
 
     @staticmethod
     def lock_all(service_class, folder_name: str, status: bool = True):
@@ -54,3 +77,35 @@ class ServiceBase:
             file_event.record_failure(f"Unexpected error locking {folder_name}")
             lock_all_event.record_failure(f"Unexpected error locking {folder_name}")
             raise ConfiguratorException(f"Cannot lock all {folder_name}s", lock_all_event)
+
+    @staticmethod
+    def get_summaries(folder_name: str, files: list, summarize) -> list:
+        """Return (file, summary) pairs in file order, summary is None for a
+        file that could not be summarized. Summaries come from the SummaryIndex,
+        files changed since they were indexed are summarized again from the
+        raw documents by summarize(file_name, document). A file whose content
+        hash is unchanged is not parsed. Parsing holds the GIL, the files are
+        summarized one after another."""
+        index = SummaryIndex.get_instance()
+        entries = index.get_entries(folder_name)
+
+        def index_file(file):
+            entry = entries.get(file.file_name)
+            try:
+                data = FileIO.get_content(folder_name, file.file_name)
+                if entry is not None and entry.get("sha256") == hashlib.sha256(data).hexdigest():
+                    summary = entry["summary"]
+                else:
+                    summary = summarize(file.file_name, FileIO.get_document(folder_name, file.file_name))
+            except Exception as e:
+                logger.warning(f"Skipping {file.file_name}: {e}")
+                summary = None
+                data = b""
+            return make_entry(file.size, file._updated, data, summary)
+
+        current = {file.file_name: entries[file.file_name] for file in files if is_current(entries.get(file.file_name), file)}
+        stale = [file for file in files if file.file_name not in current]
+        current.update((file.file_name, index_file(file)) for file in stale)
+        if current != entries:
+            index.put_entries(folder_name, current)
+        return [(file, current[file.file_name]["summary"]) for file in files]
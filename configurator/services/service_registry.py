@@ -0,0 +1,95 @@
+import os
+import threading
+from collections import OrderedDict
+
+from configurator.utils.config import Config
+from configurator.utils.document_cache import signature, is_racy
+from configurator.utils.render_profile import current_profile
+from configurator.utils.schema_cache import DependencyRecorder, record_dependency
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Process wide, size bounded registry of constructed services.
+
+    RefType and CustomType resolve the dictionaries and types they render
+    through the registry, so each referenced file is read and its Property
+    tree built once, not once per reference. An entry is validated against
+    the (st_mtime_ns, st_size) of its file on every lookup, edits are picked
+    up on the next render. Registered services are shared and must not be
+    changed by the caller. DOCUMENT_CACHE_SIZE bounds the registry.
+    """
+    _instance = None  # Singleton instance
+
+    def __init__(self, max_size: int = None):
+        if max_size is None:
+            max_size = Config.get_instance().DOCUMENT_CACHE_SIZE
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (service_class, input_folder, file_name) -> (folder, signature, service)
+        self._lock = threading.Lock()
+
+    def get(self, service_class, file_name: str):
+        """Return the service_class(file_name) service, constructing it if it is
+        not registered or its file changed."""
+        key = (service_class, Config.get_instance().INPUT_FOLDER, file_name)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None:
+            folder, file_signature, service = entry
+            try:
+                stat = os.stat(os.path.join(folder, file_name))
+            except OSError:
+                stat = None
+            if stat is not None and signature(stat) == file_signature:
+                # Renders record the files they read, a registered service is not read again
+                record_dependency(folder, file_name, stat)
+                profile = current_profile()
+                if profile is not None:
+                    profile.record_registry_hit()
+                with self._lock:
+                    self.hits += 1
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+                return service
+
+        with DependencyRecorder() as dependencies:
+            service = service_class(file_name)
+        with self._lock:
+            self.misses += 1
+            self._entries.pop(key, None)
+        folder = os.path.join(key[1], str(getattr(service, "_folder_name", "")))
+        stat = dependencies.get((folder, file_name))
+        if self.max_size > 0 and stat is not None and not is_racy(stat):
+            with self._lock:
+                self._entries[key] = (folder, signature(stat), service)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return service
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def to_dict(self):
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # Singleton Getter
+    @staticmethod
+    def get_instance():
+        """Get the singleton instance of the ServiceRegistry class."""
+        if ServiceRegistry._instance is None:
+            ServiceRegistry._instance = ServiceRegistry()
+        return ServiceRegistry._instance
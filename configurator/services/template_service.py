@@ -1,11 +1,10 @@
 import os
 from pathlib import Path
-import yaml
 
 from configurator.services.configuration_services import Configuration
 from configurator.services.dictionary_services import Dictionary
 from configurator.utils.config import Config
-from configurator.utils.file_io import FileIO
+from configurator.utils.file_io import FileIO, load_yaml, dump_yaml
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 
 import logging
@@ -26,16 +25,16 @@ def _load_configuration_template(collection_name: str) -> dict:
 
     if override_path.exists():
         with open(override_path, "r", encoding="utf-8") as f:
-            template_content = yaml.safe_load(f)
+            template_content = load_yaml(f)
     else:
         configurator_dir = Path(__file__).parent.parent
         builtin_path = configurator_dir / "templates" / "default_new_configuration.yaml"
         with open(builtin_path, "r", encoding="utf-8") as f:
-            template_content = yaml.safe_load(f)
+            template_content = load_yaml(f)
 
-    content_str = yaml.dump(template_content)
+    content_str = dump_yaml(template_content)
     content_str = content_str.replace("{{collection_name}}", collection_name)
-    return yaml.safe_load(content_str)
+    return load_yaml(content_str)
 
 
 def _load_dictionary_template(collection_name: str, description: str = "") -> dict:
@@ -49,19 +48,19 @@ def _load_dictionary_template(collection_name: str, description: str = "") -> di
 
     if override_path.exists():
         with open(override_path, "r", encoding="utf-8") as f:
-            template_content = yaml.safe_load(f)
+            template_content = load_yaml(f)
     else:
         # Built-in default: bundled in package
         configurator_dir = Path(__file__).parent.parent
         builtin_path = configurator_dir / "templates" / "default_new_dictionary.yaml"
         with open(builtin_path, "r", encoding="utf-8") as f:
-            template_content = yaml.safe_load(f)
+            template_content = load_yaml(f)
 
     # Substitute placeholders
-    content_str = yaml.dump(template_content)
+    content_str = dump_yaml(template_content)
     content_str = content_str.replace("{{collection_name}}", collection_name)
     content_str = content_str.replace("{{description}}", description or f"A {collection_name} collection")
-    return yaml.safe_load(content_str)
+    return load_yaml(content_str)
 
 
 class TemplateService:
@@ -3,8 +3,10 @@ import yaml
 import logging
 from configurator.utils.config import Config
 from configurator.utils.file_io import FileIO
+from configurator.utils.summary_index import SummaryIndex
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 from configurator.services.property import Property
+from configurator.services.property.compiled import CompiledProperty, register_service, CUSTOM
 from configurator.services.enumeration_service import Enumerations
 from configurator.services.service_base import ServiceBase
 
@@ -14,7 +16,22 @@ logger = logging.getLogger(__name__)
 class Type(ServiceBase):
     def __init__(self, file_name: str, document: dict = None):
         super().__init__(file_name, document, Config.get_instance().TYPE_FOLDER)
-        self.root = Property(self._document.get("root", {}))
+        self._root = None
+        self._compiled = None
+
+    @property
+    def root(self) -> Property:
+        """The root property, built on first use by to_dict, renders only compile it"""
+        if self._root is None:
+            self._root = Property(self._document.get("root", {}))
+        return self._root
+
+    @property
+    def compiled(self) -> CompiledProperty:
+        """The root property compiled for rendering, see CompiledProperty"""
+        if self._compiled is None:
+            self._compiled = CompiledProperty.compile(self._document.get("root", {}))
+        return self._compiled
 
     def to_dict(self):
         the_dict = super().to_dict()
@@ -22,34 +39,42 @@ class Type(ServiceBase):
         return the_dict
 
     def to_json_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        return self.root.to_json_schema(enumerations, ref_stack)
+        return self.compiled.to_json_schema(enumerations, [*ref_stack, self.render_key])
 
     def to_bson_schema(self, enumerations: Enumerations, ref_stack: list = []):
-        return self.root.to_bson_schema(enumerations, ref_stack)
+        return self.compiled.to_bson_schema(enumerations, [*ref_stack, self.render_key])
+
+    def to_schemas(self, enumerations: Enumerations, ref_stack: list = []):
+        return self.compiled.to_schemas(enumerations, [*ref_stack, self.render_key])
     
     @staticmethod
     def lock_all(status: bool = True):
         return ServiceBase.lock_all(Type, Config.get_instance().TYPE_FOLDER, status)
 
+    @staticmethod
+    def summarize(file_name: str, document: dict) -> dict:
+        """Summarize a raw type document without full Property parsing."""
+        return {
+            "_locked": document.get("_locked", False),
+            "description": (document.get("root") or {}).get("description") or "",
+        }
+
     @staticmethod
     def get_types_summary() -> list:
         """
         Return a lightweight list of type summaries for card display.
         Each item: file_name, created_at, updated_at, size, _locked, description.
-        Uses FileIO.get_document for description extraction without full Property parsing.
+        Types that can not be summarized are listed unlocked without a description.
         """
         config = Config.get_instance()
+        files = FileIO.get_documents(config.TYPE_FOLDER)
         result = []
-        for file in FileIO.get_documents(config.TYPE_FOLDER):
+        for file, summary in ServiceBase.get_summaries(config.TYPE_FOLDER, files, Type.summarize):
             item = file.to_dict()
-            try:
-                doc = FileIO.get_document(config.TYPE_FOLDER, file.file_name)
-                item["_locked"] = doc.get("_locked", False)
-                item["description"] = (doc.get("root") or {}).get("description") or ""
-            except Exception as e:
-                logger.warning(f"Skipping {file.file_name}: {e}")
-                item["_locked"] = False
-                item["description"] = ""
+            item.update(summary or {"_locked": False, "description": ""})
             result.append(item)
         return result
 
+
+SummaryIndex.register("TYPE_FOLDER", Type.summarize)
+register_service(CUSTOM, Type)
@@ -1,5 +1,6 @@
 import os
 import json
+import hashlib
 from pathlib import Path
 from configurator.utils.configurator_exception import ConfiguratorForbiddenException, ConfiguratorEvent
 
@@ -41,9 +42,20 @@ class Config:
             self.LOAD_TEST_DATA = False
             self.ENABLE_DROP_DATABASE = False
             self.MONGODB_REQUIRE_TLS = False
+            self.ENABLE_INOTIFY = False
             self.MONGODB_DROP_SAFETY = 0
+            self.MONGODB_HEALTH_CHECK_SECONDS = 0
             self.RENDER_STACK_MAX_DEPTH = 0
+            self.DOCUMENT_CACHE_SIZE = 0
+            self.SCHEMA_CACHE_SIZE = 0
+            self.MAX_WORKERS = 0
             self.UI_HEADER = ''
+            self.CORPUS_SNAPSHOT = ''
+            self.SCHEMA_ARTIFACT_FOLDER = ''
+            self.SUMMARY_INDEX_FOLDER = ''
+            self.RENDER_MAX_NODES = 0
+            self.RENDER_MAX_BYTES = 0
+            self.RENDER_OVER_BUDGET = ''
     
             # Default Values grouped by value type            
             self.config_strings = {
@@ -61,12 +73,22 @@ class Config:
                 "API_CONFIG_FOLDER": "api_config",
                 "ENUMERATOR_FOLDER": "enumerators",
                 "UI_HEADER": "MongoDB Configurator",
+                "CORPUS_SNAPSHOT": "",
+                "SCHEMA_ARTIFACT_FOLDER": "/tmp/configurator/schema_artifacts",
+                "SUMMARY_INDEX_FOLDER": "/tmp/configurator/summary_index",
+                "RENDER_OVER_BUDGET": "reject",
             }
             self.config_ints = {
                 "API_PORT": "8081",
                 "SPA_PORT": "8082",
                 "RENDER_STACK_MAX_DEPTH": "100",
+                "RENDER_MAX_NODES": "250000",
+                "RENDER_MAX_BYTES": "33554432",
                 "MONGODB_DROP_SAFETY": "100",
+                "MONGODB_HEALTH_CHECK_SECONDS": "30",
+                "DOCUMENT_CACHE_SIZE": "1000",
+                "SCHEMA_CACHE_SIZE": "500",
+                "MAX_WORKERS": "0",
             }
             self.config_booleans = {
                 "AUTO_PROCESS": "false",
@@ -74,6 +96,7 @@ class Config:
                 "LOAD_TEST_DATA": "false",
                 "ENABLE_DROP_DATABASE": "false",
                 "MONGODB_REQUIRE_TLS": "true",
+                "ENABLE_INOTIFY": "false",
             }            
             self.config_string_secrets = {  
                 "MONGO_CONNECTION_STRING": "mongodb://mongodb:27017/"
@@ -197,6 +220,21 @@ class Config:
             "config_items": self.config_items,
         }    
 
+    def get_output_folder(self, name: str) -> str:
+        """The folder the API keeps files derived from INPUT_FOLDER in, a sub
+        folder of the folder setting name per INPUT_FOLDER. Returns None if
+        the setting is empty or inside INPUT_FOLDER, the input is never
+        written to on a read."""
+        folder = getattr(self, name, "")
+        if not folder:
+            return None
+        root = os.path.abspath(folder)
+        input_folder = os.path.abspath(self.INPUT_FOLDER)
+        if os.path.commonpath([root, input_folder]) == input_folder:
+            logger.warning(f"{name} {root} is inside INPUT_FOLDER, it is not used")
+            return None
+        return os.path.join(root, hashlib.sha256(input_folder.encode("utf-8")).hexdigest()[:16])
+
     def assert_local(self):
         """Check if BUILT_AT is from file and has value 'Local', and MONGODB_REQUIRE_TLS is False. Raises ConfiguratorForbiddenException if not."""
         built_at_item = next((item for item in self.config_items if item['name'] == 'BUILT_AT'), None)
@@ -0,0 +1,160 @@
+import os
+import json
+import mmap
+import pickle
+import hashlib
+import datetime
+
+from configurator.utils.config import Config
+from configurator.utils.document_cache import DocumentCache
+from configurator.utils.file_io import load_yaml
+from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
+
+import logging
+logger = logging.getLogger(__name__)
+
+MAGIC = b"CFGSNAP1"
+FORMAT_VERSION = 1
+
+# Parsed YAML and JSON documents only contain builtin containers and scalars,
+# plus these classes for YAML timestamps.
+ALLOWED_CLASSES = {
+    ("datetime", "date"),
+    ("datetime", "datetime"),
+    ("datetime", "timedelta"),
+    ("datetime", "timezone"),
+}
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """Unpickler that refuses anything but parsed document types."""
+
+    def find_class(self, module, name):
+        if (module, name) in ALLOWED_CLASSES:
+            return getattr(datetime, name)
+        raise pickle.UnpicklingError(f"Class {module}.{name} is not allowed in a corpus snapshot")
+
+
+def snapshot_folders() -> list[str]:
+    """The input folders compiled into a snapshot."""
+    config = Config.get_instance()
+    return [config.CONFIGURATION_FOLDER, config.DICTIONARY_FOLDER, config.TYPE_FOLDER, config.ENUMERATOR_FOLDER]
+
+
+def _parse(file_name: str, content: bytes):
+    if file_name.lower().endswith(".yaml"):
+        return load_yaml(content)
+    return json.loads(content)
+
+
+class CorpusSnapshot:
+    """Precompiled snapshot of the parsed input corpus.
+
+    The snapshot holds the parsed configuration, dictionary, type and
+    enumerator documents together with a manifest of the sha256 of each
+    source file. Loading a snapshot seeds the DocumentCache with every
+    document whose source file is unchanged, so the server starts warm.
+    Files that changed since the snapshot was built are parsed on first
+    use as usual.
+    """
+
+    @staticmethod
+    def build(output_path: str) -> dict:
+        """Parse the input corpus and write a snapshot, returns a summary."""
+        config = Config.get_instance()
+        manifest = {}
+        documents = {}
+        skipped = []
+        for folder_name in snapshot_folders():
+            folder = os.path.join(config.INPUT_FOLDER, folder_name)
+            if not os.path.isdir(folder):
+                continue
+            manifest[folder_name] = {}
+            documents[folder_name] = {}
+            for file_name in sorted(os.listdir(folder)):
+                if os.path.splitext(file_name)[1].lower() not in (".yaml", ".json"):
+                    continue
+                with open(os.path.join(folder, file_name), 'rb') as f:
+                    content = f.read()
+                try:
+                    document = _parse(file_name, content)
+                except Exception as e:
+                    logger.warning(f"Not adding {folder_name}/{file_name} to the snapshot: {str(e)}")
+                    skipped.append(f"{folder_name}/{file_name}")
+                    continue
+                manifest[folder_name][file_name] = hashlib.sha256(content).hexdigest()
+                documents[folder_name][file_name] = document
+
+        snapshot = {
+            "format": FORMAT_VERSION,
+            "built_at": datetime.datetime.now().isoformat(),
+            "manifest": manifest,
+            "documents": documents,
+        }
+        temp_path = f"{output_path}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(MAGIC)
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, output_path)
+        except Exception as e:
+            logger.error(f"Exception writing corpus snapshot to {output_path}: {str(e)}")
+            event = ConfiguratorEvent(event_id="SNP-01", event_type="BUILD_SNAPSHOT")
+            event.record_failure(str(e), {"output_path": output_path})
+            raise ConfiguratorException(f"Failed to write corpus snapshot to {output_path}", event)
+
+        return {
+            "output_path": output_path,
+            "documents": sum(len(files) for files in manifest.values()),
+            "skipped": skipped,
+            "size": os.path.getsize(output_path),
+        }
+
+    @staticmethod
+    def read(snapshot_path: str) -> dict:
+        """Read a snapshot file with a single memory mapped pass."""
+        with open(snapshot_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped[:len(MAGIC)] != MAGIC:
+                    raise ValueError("Not a corpus snapshot")
+                mapped.seek(len(MAGIC))
+                snapshot = _SnapshotUnpickler(mapped).load()
+        if snapshot.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format {snapshot.get('format')}")
+        return snapshot
+
+    @staticmethod
+    def load(snapshot_path: str) -> dict:
+        """Seed the DocumentCache from a snapshot, returns a summary.
+        A missing or unreadable snapshot is logged and ignored."""
+        summary = {"loaded": 0, "stale": 0, "missing": 0}
+        try:
+            snapshot = CorpusSnapshot.read(snapshot_path)
+        except FileNotFoundError:
+            logger.info(f"No corpus snapshot at {snapshot_path}")
+            return summary
+        except Exception as e:
+            logger.warning(f"Ignoring corpus snapshot {snapshot_path}: {str(e)}")
+            return summary
+
+        config = Config.get_instance()
+        cache = DocumentCache.get_instance()
+        for folder_name, files in snapshot["manifest"].items():
+            folder = os.path.join(config.INPUT_FOLDER, folder_name)
+            documents = snapshot["documents"][folder_name]
+            for file_name, sha256 in files.items():
+                try:
+                    with open(os.path.join(folder, file_name), 'rb') as f:
+                        stat = os.fstat(f.fileno())
+                        content = f.read()
+                except FileNotFoundError:
+                    summary["missing"] += 1
+                    continue
+                if hashlib.sha256(content).hexdigest() != sha256:
+                    summary["stale"] += 1
+                    continue
+                cache.seed(folder, file_name, stat, documents[file_name])
+                summary["loaded"] += 1
+
+        logger.info(f"Corpus snapshot {snapshot_path} built at {snapshot['built_at']}: {summary}")
+        return summary
@@ -0,0 +1,230 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+
+from configurator.utils.config import Config
+from configurator.utils.folder_watcher import FolderWatcher
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Sentinel returned on a cache miss - None is a valid (empty) document
+MISSING = object()
+
+# File system timestamps are coarse (a clock tick on most Linux file systems),
+# a change made in the same tick as the stat used to validate an entry would
+# go unnoticed. Entries modified this recently are not cached.
+RACY_WINDOW_NS = 1_000_000_000
+
+
+def signature(stat: os.stat_result) -> tuple:
+    """The validation signature of a file or folder."""
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def is_racy(stat: os.stat_result) -> bool:
+    """True if the stat is too recent to be trusted as a validator."""
+    return time.time_ns() - stat.st_mtime_ns < RACY_WINDOW_NS
+
+
+def copy_document(document):
+    """Copy a parsed document. Only containers are copied, scalars
+    produced by the YAML and JSON parsers (str, int, float, bool, None,
+    date, datetime) are immutable and can be shared safely."""
+    if isinstance(document, dict):
+        return {key: copy_document(value) for key, value in document.items()}
+    if isinstance(document, list):
+        return [copy_document(value) for value in document]
+    if isinstance(document, set):
+        return {copy_document(value) for value in document}
+    return document
+
+
+class DocumentCache:
+    """Process wide, size bounded LRU cache of parsed documents.
+
+    Entries are keyed by (folder, file_name) and validated against the
+    (st_mtime_ns, st_size) of the file when they are read, so edits made
+    outside of the API are picked up on the next read. Callers always
+    receive a copy of the cached document.
+    """
+    _instance = None  # Singleton instance
+
+    def __init__(self, max_size: int = None):
+        if max_size is None:
+            max_size = Config.get_instance().DOCUMENT_CACHE_SIZE
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, folder: str, file_name: str, stat: os.stat_result):
+        """Return a copy of the cached document, or MISSING if the file is not
+        cached or has changed since it was cached."""
+        key = (folder, file_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature(stat):
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            document = entry[1]
+        return copy_document(document)
+
+    def put(self, folder: str, file_name: str, stat: os.stat_result, document):
+        """Cache a parsed document and return a copy for the caller."""
+        self.seed(folder, file_name, stat, document)
+        return copy_document(document)
+
+    def seed(self, folder: str, file_name: str, stat: os.stat_result, document):
+        """Cache a parsed document the caller will not use or change."""
+        if self.max_size <= 0 or is_racy(stat):
+            return
+        key = (folder, file_name)
+        with self._lock:
+            self._entries[key] = (signature(stat), document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, folder: str, file_name: str):
+        """Drop a single entry, if present."""
+        with self._lock:
+            self._entries.pop((folder, file_name), None)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def to_dict(self):
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # Singleton Getter
+    @staticmethod
+    def get_instance():
+        """Get the singleton instance of the DocumentCache class."""
+        if DocumentCache._instance is None:
+            DocumentCache._instance = DocumentCache()
+        return DocumentCache._instance
+
+
+class FolderCache:
+    """Process wide cache of folder listings.
+
+    A listing is validated by the (st_mtime_ns, st_size) of the folder, which
+    changes when files are added, removed or renamed, so a cached listing
+    costs one stat. FileIO invalidates the listing when it writes a file.
+    Changes made in place by other processes do not touch the folder mtime,
+    when ENABLE_INOTIFY is set folders are also watched with inotify, which
+    catches those changes and removes the need for the stat.
+    """
+    _instance = None  # Singleton instance
+    MAX_FOLDERS = 64
+
+    def __init__(self, use_inotify: bool = None):
+        if use_inotify is None:
+            use_inotify = Config.get_instance().ENABLE_INOTIFY
+        self.use_inotify = use_inotify
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._watcher = None
+        if use_inotify:
+            self._start_watcher()
+
+    def _start_watcher(self):
+        try:
+            self._watcher = FolderWatcher()
+        except OSError as e:
+            logger.warning(f"inotify not available, using folder mtime only: {e}")
+            self._watcher = None
+            self.use_inotify = False
+
+    def _apply_events(self):
+        """Drop listings of folders with pending inotify events."""
+        if self._watcher is None:
+            return
+        if not self._watcher.is_owner():
+            # Forked child - the inherited inotify queue is shared with the parent
+            self._entries.clear()
+            self._start_watcher()
+            return
+        changed = self._watcher.changed_folders()
+        if changed is None:
+            self._entries.clear()
+            return
+        for folder in changed:
+            self._entries.pop(folder, None)
+
+    def get(self, folder: str):
+        """Return a copy of the cached listing for a folder, or MISSING."""
+        with self._lock:
+            self._apply_events()
+            entry = self._entries.get(folder)
+            watched = self._watcher is not None and self._watcher.is_watching(folder)
+            if entry is None and not watched and self._watcher is not None:
+                # Watch before the caller lists the folder so no change is missed
+                self._watcher.watch(folder)
+        if entry is not None and not watched:
+            try:
+                valid = entry[0] == signature(os.stat(folder))
+            except OSError:
+                valid = False
+            if not valid:
+                entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            self.hits += 1
+            if folder in self._entries:
+                self._entries.move_to_end(folder)
+        return list(entry[1])
+
+    def put(self, folder: str, stat: os.stat_result, files: list) -> list:
+        """Cache a listing taken after the folder was stat'ed, return a copy."""
+        if not is_racy(stat):
+            with self._lock:
+                self._entries[folder] = (signature(stat), list(files))
+                self._entries.move_to_end(folder)
+                while len(self._entries) > self.MAX_FOLDERS:
+                    self._entries.popitem(last=False)
+        return list(files)
+
+    def invalidate(self, folder: str):
+        with self._lock:
+            self._entries.pop(folder, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def to_dict(self):
+        return {
+            "size": len(self._entries),
+            "inotify": self._watcher is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # Singleton Getter
+    @staticmethod
+    def get_instance():
+        """Get the singleton instance of the FolderCache class."""
+        if FolderCache._instance is None:
+            FolderCache._instance = FolderCache()
+        return FolderCache._instance
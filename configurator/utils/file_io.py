@@ -1,36 +1,94 @@
 import os
 import json
 import yaml
+import threading
 from datetime import datetime
-from pathlib import Path
 
 from configurator.utils.config import Config
+from configurator.utils.document_cache import DocumentCache, FolderCache, MISSING, copy_document
+from configurator.utils.schema_cache import SchemaCache, record_dependency
+from configurator.utils.summary_index import SummaryIndex
 from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Use the libyaml C loader and dumper when PyYAML was built with libyaml.
+# The pure Python fallbacks load the same documents and emit the same bytes.
+# Both are the safe variants: documents hold only plain YAML values (dict,
+# list, str, int, float, bool, None, date, datetime and set, tuples are
+# written as lists). The full Dumper would write other values with python/
+# tags the safe loader cannot read back, the safe dumper refuses them.
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def load_yaml(stream):
+    """Parse a YAML string or stream."""
+    return yaml.load(stream, Loader=YamlLoader)
+
+
+def dump_yaml(document, stream=None):
+    """Serialize a document as YAML, to the stream if one is given.
+
+    Only plain YAML values are written, anything else (an object, a Decimal)
+    raises yaml.representer.RepresenterError."""
+    return yaml.dump(document, stream, Dumper=YamlDumper)
+
+
+def sort_document(document):
+    """Copy a document with its mappings in the key order dump_yaml writes
+    them, i.e. the document load_yaml would read back. Like the dumper,
+    mappings whose keys can not be compared keep their order, and tuples
+    become lists."""
+    if isinstance(document, dict):
+        try:
+            keys = sorted(document)
+        except TypeError:
+            keys = list(document)
+        return {key: sort_document(document[key]) for key in keys}
+    if isinstance(document, (list, tuple)):
+        return [sort_document(value) for value in document]
+    return copy_document(document)
+
+# put_document writes to a hidden temporary file in the target folder and
+# renames it into place, folder listings skip these files.
+TEMP_PREFIX = "."
+TEMP_SUFFIX = ".tmp"
+
+
+def is_temp_file(file_name: str) -> bool:
+    return file_name.startswith(TEMP_PREFIX) and file_name.endswith(TEMP_SUFFIX)
+
 class File:
-    """Class representing a file with its properties."""
-    
-    def __init__(self, file_path: str):
-        """Initialize a File instance with file properties."""
+    """Class representing a file with its properties.
+    Timestamps are kept raw and only formatted when serialized."""
+    __slots__ = ("file_name", "size", "_created", "_updated")
+
+    def __init__(self, file_path: str, stat: os.stat_result = None):
+        """Initialize a File instance with file properties, stat is used if provided."""
         self.file_name = os.path.basename(file_path)
-        self.created_at = None
-        self.updated_at = None
-        self.size = 0
         
         # Get file properties if file exists
         try:
-            stat = os.stat(file_path)
+            if stat is None:
+                stat = os.stat(file_path)
             self.size = stat.st_size
-            self.created_at = datetime.fromtimestamp(stat.st_ctime).isoformat()
-            self.updated_at = datetime.fromtimestamp(stat.st_mtime).isoformat()
+            self._created = stat.st_ctime
+            self._updated = stat.st_mtime
         except Exception as e:
             logger.error(f"Exception getting file properties for {file_path}: {str(e)}")
             event = ConfiguratorEvent(event_id="FIL-01", event_type="GET_FILE_PROPERTIES", event_data={"error": str(e)})
             raise ConfiguratorException(f"Failed to get file properties for {file_path}", event)
 
+    @property
+    def created_at(self) -> str:
+        return datetime.fromtimestamp(self._created).isoformat()
+
+    @property
+    def updated_at(self) -> str:
+        return datetime.fromtimestamp(self._updated).isoformat()
+
     def to_dict(self):
         """Convert file properties to dictionary matching OpenAPI schema (flat)."""
         return {
@@ -41,28 +99,30 @@ class File:
         }
 
 
+# Sort keys supported by FileIO.select_documents
+FILE_SORT_KEYS = {
+    "file_name": lambda file: file.file_name,
+    "size": lambda file: file.size,
+    "created_at": lambda file: file._created,
+    "updated_at": lambda file: file._updated,
+}
+
+
 class FileIO:
     """Class for file I/O operations."""
     
     @staticmethod
-    def get_documents(folder_name: str) -> list[File]:
-        """Get all files from a folder."""
+    def get_documents(folder_name: str, query: dict = None) -> list[File]:
+        """Get all files from a folder, or the files selected by a list query (see select_documents)."""
         config = Config.get_instance()
         folder = os.path.join(config.INPUT_FOLDER, folder_name)
-        files = []
         
         try:
-            if not os.path.exists(folder):
-                logger.error(f"Folder not found: {folder}")
-                event = ConfiguratorEvent(event_id="FIL-03", event_type="GET_DOCUMENTS")
-                event.record_failure("Folder not found")
-                raise ConfiguratorException(f"Folder not found: {folder}", event)
-            
-            for file_name in os.listdir(folder):
-                file_path = os.path.join(folder, file_name)
-                if os.path.isfile(file_path):
-                    files.append(File(file_path))
-            return files
+            cache = FolderCache.get_instance()
+            files = cache.get(folder)
+            if files is MISSING:
+                files = FileIO._list_folder(cache, folder)
+            return FileIO.select_documents(files, query) if query else files
         except ConfiguratorException as e:
             logger.error(f"ConfiguratorException getting documents from {folder}")
             raise e
@@ -71,6 +131,62 @@ class FileIO:
             event = ConfiguratorEvent(event_id="FIL-03", event_type="GET_DOCUMENTS")
             event.record_failure(str(e))
             raise ConfiguratorException(f"Failed to get documents from {folder}", event)
+
+    @staticmethod
+    def _list_folder(cache: FolderCache, folder: str) -> list[File]:
+        """List a folder with a single scandir pass, reusing the DirEntry stat data."""
+        if not os.path.exists(folder):
+            logger.error(f"Folder not found: {folder}")
+            event = ConfiguratorEvent(event_id="FIL-03", event_type="GET_DOCUMENTS")
+            event.record_failure("Folder not found")
+            raise ConfiguratorException(f"Folder not found: {folder}", event)
+
+        stat = os.stat(folder)
+        files = []
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_file() and not is_temp_file(entry.name):
+                        files.append(File(entry.path, entry.stat()))
+                except FileNotFoundError:
+                    continue  # Removed since the folder was scanned
+        return cache.put(folder, stat, files)
+
+    @staticmethod
+    def select_documents(files: list[File], query: dict) -> list[File]:
+        """Filter, sort and page a list of files. Supported query parameters
+        (all optional) are prefix, extension, sort (file_name, size, created_at,
+        updated_at), order (asc, desc), offset and limit."""
+        event = ConfiguratorEvent(event_id="FIL-11", event_type="SELECT_DOCUMENTS")
+        prefix = query.get("prefix")
+        extension = query.get("extension")
+        sort = query.get("sort")
+        order = query.get("order", "asc")
+        try:
+            offset = int(query.get("offset", 0))
+            limit = int(query["limit"]) if query.get("limit") not in (None, "") else None
+        except ValueError:
+            event.record_failure("offset and limit must be integers", {"offset": query.get("offset"), "limit": query.get("limit")})
+            raise ConfiguratorException("offset and limit must be integers", event)
+        if offset < 0 or (limit is not None and limit < 0):
+            event.record_failure("offset and limit must not be negative", {"offset": offset, "limit": limit})
+            raise ConfiguratorException("offset and limit must not be negative", event)
+        if sort is not None and sort not in FILE_SORT_KEYS:
+            event.record_failure(f"Unsupported sort {sort}", {"sort": sort, "supported": list(FILE_SORT_KEYS)})
+            raise ConfiguratorException(f"Unsupported sort {sort}", event)
+        if order not in ("asc", "desc"):
+            event.record_failure(f"Unsupported order {order}", {"order": order})
+            raise ConfiguratorException(f"Unsupported order {order}", event)
+
+        if prefix:
+            files = [file for file in files if file.file_name.startswith(prefix)]
+        if extension:
+            extension = extension if extension.startswith(".") else f".{extension}"
+            files = [file for file in files if file.file_name.endswith(extension)]
+        if sort:
+            files = sorted(files, key=FILE_SORT_KEYS[sort], reverse=(order == "desc"))
+        end = None if limit is None else offset + limit
+        return files[offset:end]
     
     @staticmethod
     def get_document(folder_name: str, file_name: str) -> dict:
@@ -88,11 +204,19 @@ class FileIO:
             raise ConfiguratorException(f"Unsupported file type: {extension}", event)
         
         try:
+            stat = os.stat(file_path)
+            record_dependency(folder, file_name, stat)
+            cache = DocumentCache.get_instance()
+            document = cache.get(folder, file_name, stat)
+            if document is not MISSING:
+                return document
+
             with open(file_path, 'r', encoding='utf-8') as f:
                 if extension == ".yaml":
-                    return yaml.safe_load(f)
+                    document = load_yaml(f)
                 elif extension == ".json":
-                    return json.loads(f.read())
+                    document = json.loads(f.read())
+            return cache.put(folder, file_name, stat, document)
         except FileNotFoundError:
             logger.error(f"File not found: {file_path}")
             event = ConfiguratorEvent(event_id="FIL-06", event_type="GET_DOCUMENT")
@@ -104,27 +228,117 @@ class FileIO:
             event.record_failure(str(e))
             raise ConfiguratorException(f"Failed to get document from {file_path}", event)
     
+    @staticmethod
+    def get_content(folder_name: str, file_name: str) -> bytes:
+        """Read the raw bytes of a file."""
+        config = Config.get_instance()
+        file_path = os.path.join(config.INPUT_FOLDER, folder_name, file_name)
+        try:
+            with open(file_path, 'rb') as f:
+                return f.read()
+        except Exception as e:
+            logger.error(f"Exception reading content of {file_path}: {str(e)}")
+            event = ConfiguratorEvent(event_id="FIL-12", event_type="GET_CONTENT")
+            event.record_failure(str(e), {"file_name": file_name, "folder_name": folder_name})
+            raise ConfiguratorException(f"Failed to read content of {file_path}", event)
+
     @staticmethod
     def put_document(folder_name: str, file_name: str, document: dict) -> dict:
-        """Write document content to a file."""
+        """Write document content to a file and return the document as it
+        will be read back. The file is replaced atomically, and is not
+        written at all if its content would not change. A YAML document
+        must hold only plain YAML values, see dump_yaml."""
         config = Config.get_instance()
         folder = os.path.join(config.INPUT_FOLDER, folder_name)
         file_path = os.path.join(folder, file_name)
         extension = os.path.splitext(file_path)[1].lower()
         
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                if extension == ".yaml":
-                    yaml.dump(document, f)
-                elif extension == ".json":
-                    f.write(json.dumps(document, indent=2))
-            return FileIO.get_document(folder_name, file_name)  
+            if extension == ".yaml":
+                content = dump_yaml(document)
+                # The safe dumper only emits types the safe loader reads back
+                # as equal values, a copy in the dumped key order is what a
+                # reread would return.
+                normalized = sort_document(document)
+            elif extension == ".json":
+                content = json.dumps(document, indent=2)
+                normalized = json.loads(content)
+            else:
+                raise ValueError(f"Unsupported file type: {extension}")
+            data = content.encode("utf-8")
+
+            cache = DocumentCache.get_instance()
+            stat = FileIO._stat_if_unchanged(file_path, data)
+            if stat is None:
+                cache.invalidate(folder, file_name)
+                SchemaCache.get_instance().invalidate_file(folder, file_name)
+                FileIO._replace_file(folder, file_path, data)
+                FolderCache.get_instance().invalidate(folder)
+                stat = os.stat(file_path)
+            SummaryIndex.get_instance().update(folder_name, file_name, stat, data, normalized)
+            return cache.put(folder, file_name, stat, normalized)
             
         except Exception as e:
             logger.error(f"Exception putting document to {file_path}: {str(e)}")
             event = ConfiguratorEvent(event_id="FIL-08", event_type="PUT_DOCUMENT")
             event.record_failure(str(e))
             raise ConfiguratorException(f"Failed to put document to {file_path}", event)
+
+    @staticmethod
+    def _stat_if_unchanged(file_path: str, data: bytes):
+        """Return the stat of the file if it already holds exactly data, else None."""
+        try:
+            stat = os.stat(file_path)
+            if stat.st_size != len(data):
+                return None
+            with open(file_path, 'rb') as f:
+                return stat if f.read() == data else None
+        except FileNotFoundError:
+            return None
+
+    _temp_counter = 0
+    _temp_lock = threading.Lock()
+
+    @staticmethod
+    def _replace_file(folder: str, file_path: str, data: bytes):
+        """Write data to a temporary file, fsync it and rename it over file_path,
+        readers see either the old or the new content, never a partial file."""
+        with FileIO._temp_lock:
+            FileIO._temp_counter += 1
+            temp_name = f"{TEMP_PREFIX}{os.path.basename(file_path)}.{os.getpid()}.{FileIO._temp_counter}{TEMP_SUFFIX}"
+        temp_path = os.path.join(folder, temp_name)
+        try:
+            mode = os.stat(file_path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = None
+
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if mode is not None:
+                    os.fchmod(f.fileno(), mode)
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+        # Persist the rename, not supported on every platform / file system
+        try:
+            dir_fd = os.open(folder, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
     
     @staticmethod
     def delete_document(folder_name: str, file_name: str) -> ConfiguratorEvent:
@@ -135,7 +349,11 @@ class FileIO:
         event = ConfiguratorEvent(event_id="FIL-09", event_type="DELETE_DOCUMENT")
         
         try:
+            DocumentCache.get_instance().invalidate(folder, file_name)
+            SchemaCache.get_instance().invalidate_file(folder, file_name)
+            FolderCache.get_instance().invalidate(folder)
             os.remove(file_path)
+            SummaryIndex.get_instance().remove(folder_name, file_name)
             event.record_success()
             return event
         except FileNotFoundError:
@@ -0,0 +1,103 @@
+import os
+import sys
+import struct
+import ctypes
+import ctypes.util
+
+import logging
+logger = logging.getLogger(__name__)
+
+# inotify event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class FolderWatcher:
+    """Optional inotify based change detection for folders (Linux only).
+
+    The watcher does not use a thread, pending events are drained with a
+    non-blocking read each time changed_folders() is called. A watcher
+    created before a fork (gunicorn --preload) is not used by the child,
+    call is_owner() and create a new watcher if it returns False.
+    """
+
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._pid = os.getpid()
+        self._folders = {}  # watch descriptor -> folder
+        self._watches = {}  # folder -> watch descriptor
+
+    def is_owner(self) -> bool:
+        """False in a forked child process."""
+        return self._pid == os.getpid()
+
+    def is_watching(self, folder: str) -> bool:
+        return folder in self._watches
+
+    def watch(self, folder: str) -> bool:
+        """Start watching a folder, returns False if the watch could not be added."""
+        if folder in self._watches:
+            return True
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), WATCH_MASK)
+        if wd < 0:
+            logger.debug(f"Unable to watch {folder}: errno {ctypes.get_errno()}")
+            return False
+        self._folders[wd] = folder
+        self._watches[folder] = wd
+        return True
+
+    def changed_folders(self):
+        """Drain pending events and return the set of changed folders,
+        or None if the event queue overflowed and anything may have changed."""
+        changed = set()
+        overflow = False
+        while True:
+            try:
+                buffer = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not buffer:
+                break
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, length = _EVENT.unpack_from(buffer, offset)
+                offset += _EVENT.size + length
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                folder = self._folders.get(wd)
+                if folder is None:
+                    continue
+                changed.add(folder)
+                if mask & IN_IGNORED:
+                    # Watch removed by the kernel (folder deleted or unmounted)
+                    del self._folders[wd]
+                    self._watches.pop(folder, None)
+        return None if overflow else changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._folders.clear()
+        self._watches.clear()
@@ -8,12 +8,22 @@ from configurator.utils.configurator_exception import ConfiguratorEvent, Configu
 
 import logging
 import os
+import threading
+import time
 from pymongo.errors import BulkWriteError
 
 logger = logging.getLogger(__name__)
 
 class MongoIO:
-    """Simplified MongoDB I/O class for configuration services."""
+    """Simplified MongoDB I/O class for configuration services.
+
+    A MongoClient is a thread safe connection pool, processing and the
+    database routes share one MongoIO per connection string and database
+    with get_instance instead of connecting for every request, see
+    get_instance and shutdown.
+    """
+    _instances = {}  # (connection_string, database_name) -> MongoIO, see get_instance
+    _lock = threading.Lock()
 
     def __init__(self, connection_string, database_name):
         try:
@@ -56,6 +66,8 @@ class MongoIO:
             )
             self.client.admin.command('ping')  # Force connection
             self.db = self.client.get_database(database_name)
+            self._pid = os.getpid()
+            self._checked = time.monotonic()
             logger.info(f"Connected to MongoDB: {database_name}")
         except ConfiguratorException:
             # Re-raise ConfiguratorException as-is
@@ -76,6 +88,67 @@ class MongoIO:
             # Clear the client reference even if close failed
             self.client = None
 
+    def is_healthy(self) -> bool:
+        """True if the client is connected and the server answers a ping."""
+        if self.client is None:
+            return False
+        try:
+            self.client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.warning(f"MongoDB health check failed: {e}")
+            return False
+
+    @staticmethod
+    def get_instance(connection_string: str = None, database_name: str = None) -> "MongoIO":
+        """The MongoIO of this process for a connection string and database,
+        MONGO_CONNECTION_STRING and MONGO_DB_NAME by default. It connects on
+        first use and is shared, callers must not disconnect it.
+
+        A shared instance is replaced when it was disconnected, when it was
+        inherited through a fork (gunicorn --preload), the client belongs to
+        the parent and is not closed by the child, and when it was last
+        used more than MONGODB_HEALTH_CHECK_SECONDS ago and does not answer
+        a ping (0 checks on every use). Raises the errors of MongoIO().
+
+        The lock only guards the shared instances, the ping and connecting
+        a replacement happen outside it so one slow server does not stall
+        every other caller. When two callers replace the same instance the
+        first swapped in is kept and the other is disconnected."""
+        config = Config.get_instance()
+        key = (connection_string or config.MONGO_CONNECTION_STRING, database_name or config.MONGO_DB_NAME)
+        with MongoIO._lock:
+            instance = MongoIO._instances.get(key)
+        unhealthy = False
+        if instance is not None and instance._pid == os.getpid() and instance.client is not None:
+            if time.monotonic() - instance._checked < config.MONGODB_HEALTH_CHECK_SECONDS or instance.is_healthy():
+                instance._checked = time.monotonic()
+                return instance
+            unhealthy = True
+
+        replacement = MongoIO(*key)
+        with MongoIO._lock:
+            current = MongoIO._instances.get(key)
+            swapped = current is instance
+            if swapped:
+                MongoIO._instances[key] = replacement
+        if not swapped:
+            replacement.disconnect()
+            return MongoIO.get_instance(*key)
+        if unhealthy:
+            instance.disconnect()
+        return replacement
+
+    @staticmethod
+    def shutdown():
+        """Disconnect the shared instances this process connected, see
+        get_instance. Instances inherited through a fork are dropped."""
+        with MongoIO._lock:
+            instances, MongoIO._instances = MongoIO._instances, {}
+        for instance in instances.values():
+            if instance._pid == os.getpid():
+                instance.disconnect()
+
     def get_collection(self, collection_name):
         """Get a collection, creating it if it doesn't exist."""
         try:
@@ -0,0 +1,162 @@
+import time
+import threading
+
+import logging
+logger = logging.getLogger(__name__)
+
+_profiles = threading.local()
+
+# The frame of a render that has no file, see CompiledProperty._render
+ROOT_FRAME = "(root)"
+
+
+def profile_option(query: dict) -> bool:
+    """True if the query parameter profile (true or false) asks for a profile."""
+    return str(query.get("profile", "false")).lower() in ("true", "1", "yes")
+
+
+def current_profile():
+    """The active RenderProfile of this thread, or None."""
+    return getattr(_profiles, "current", None)
+
+
+class RenderProfile:
+    """Context manager that profiles the schema renders of its thread.
+
+    While it is active, CompiledProperty._render reports the time spent in
+    each file of the render stack, and in each ref or custom type node that
+    renders another file. ServiceBase reports the dictionaries, types and
+    enumerations it loads, ServiceRegistry the loads it saved, and the
+    enumerations passed to the render count their lookups. Nothing is
+    measured when no profile is active.
+
+    Times are collected per render stack, the chain of files from the root
+    dictionary, so to_collapsed can write them as a flame graph.
+    """
+
+    def __init__(self):
+        self.elapsed_ns = 0
+        self.max_ref_depth = 0
+        self.registry_hits = 0
+        self.loads = {}          # service class name -> [count, ns]
+        self.enum_lookups = {}   # enum name -> count
+        self.files = {}          # render key -> [renders, nodes, total ns, self ns]
+        self.nodes = {}          # (render key, property name) -> [target render key, renders, ns]
+        self.stacks = {}         # tuple of render keys -> self ns
+        self._frames = []        # (render key, start ns) of the files being rendered
+        self._mark = 0
+        self._previous = None
+        self._started = 0
+
+    def __enter__(self) -> "RenderProfile":
+        self._previous = current_profile()
+        _profiles.current = self
+        self._started = self._mark = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.elapsed_ns += time.perf_counter_ns() - self._started
+        _profiles.current = self._previous
+        return False
+
+    def record_load(self, service_name: str, elapsed_ns: int):
+        """A dictionary, type or enumerations file read and parsed."""
+        load = self.loads.setdefault(service_name, [0, 0])
+        load[0] += 1
+        load[1] += elapsed_ns
+
+    def record_registry_hit(self):
+        """A service served by the ServiceRegistry instead of loaded."""
+        self.registry_hits += 1
+
+    def record_enum_lookup(self, enum_name: str):
+        self.enum_lookups[enum_name] = self.enum_lookups.get(enum_name, 0) + 1
+
+    def enter(self, key: str, node_count: int):
+        """Start rendering file key, it is the last frame of the render stack until leave."""
+        self.tick()
+        self.files.setdefault(key, [0, node_count, 0, 0])
+        self._frames.append((key, self._mark))
+        self.max_ref_depth = max(self.max_ref_depth, len(self._frames) - 1)
+
+    def tick(self, leaf: str = None):
+        """Charge the time since the last tick to the last frame of the
+        render stack, or to a leaf frame below it such as the resolving of
+        a ref. Leaf time is not self time of the file."""
+        now = time.perf_counter_ns()
+        elapsed_ns, self._mark = now - self._mark, now
+        if not self._frames:
+            return
+        stack = tuple(key for key, _ in self._frames)
+        if leaf is not None:
+            stack = (*stack, leaf)
+        else:
+            self.files[stack[-1]][3] += elapsed_ns
+        self.stacks[stack] = self.stacks.get(stack, 0) + elapsed_ns
+
+    def leave(self, property_name: str = None):
+        """Finish the file of the last frame, rendered for property_name of
+        the file below it (None for the root of the render)."""
+        self.tick()
+        key, started = self._frames.pop()
+        elapsed_ns = self._mark - started
+        file = self.files[key]
+        file[0] += 1
+        file[2] += elapsed_ns
+        if property_name is not None and self._frames:
+            node = self.nodes.setdefault((self._frames[-1][0], property_name), [key, 0, 0])
+            node[1] += 1
+            node[2] += elapsed_ns
+
+    def unwind(self, depth: int):
+        """Drop the frames above depth, left by a render that raised."""
+        del self._frames[depth:]
+
+    @property
+    def depth(self) -> int:
+        return len(self._frames)
+
+    def to_dict(self) -> dict:
+        """The profile, with times in milliseconds and the slowest files and nodes first."""
+        def ms(elapsed_ns: int) -> float:
+            return round(elapsed_ns / 1e6, 3)
+        files = sorted(self.files.items(), key=lambda item: -item[1][2])
+        nodes = sorted(self.nodes.items(), key=lambda item: -item[1][2])
+        return {
+            "elapsed_ms": ms(self.elapsed_ns),
+            "max_ref_depth": self.max_ref_depth,
+            "loads": {name: {"count": count, "ms": ms(elapsed)} for name, (count, elapsed) in sorted(self.loads.items())},
+            "registry_hits": self.registry_hits,
+            "enum_lookups": {"count": sum(self.enum_lookups.values()), "by_name": dict(sorted(self.enum_lookups.items()))},
+            "files": [
+                {"file": key, "renders": renders, "nodes": node_count, "total_ms": ms(total), "self_ms": ms(own)}
+                for key, (renders, node_count, total, own) in files
+            ],
+            "nodes": [
+                {"file": key, "property": name, "renders": target, "count": count, "total_ms": ms(elapsed)}
+                for (key, name), (target, count, elapsed) in nodes
+            ],
+        }
+
+    def to_collapsed(self) -> str:
+        """The render stacks in the collapsed stack format of flamegraph.pl
+        and speedscope, one "frame;frame;frame microseconds" line per stack."""
+        lines = []
+        for stack, elapsed_ns in sorted(self.stacks.items()):
+            microseconds = elapsed_ns // 1000
+            if microseconds > 0:
+                lines.append(f"{';'.join(frame.replace(';', ':') for frame in stack)} {microseconds}\n")
+        return "".join(lines)
+
+
+class ProfiledEnumerations:
+    """Enumerations that count their lookups in a RenderProfile."""
+    __slots__ = ("enumerations", "profile")
+
+    def __init__(self, enumerations, profile: RenderProfile):
+        self.enumerations = enumerations
+        self.profile = profile
+
+    def get_enum_values(self, enum_name: str):
+        self.profile.record_enum_lookup(enum_name)
+        return self.enumerations.get_enum_values(enum_name)
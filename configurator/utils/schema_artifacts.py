@@ -0,0 +1,122 @@
+import os
+import json
+import hashlib
+
+from configurator.utils.config import Config
+from configurator.utils.document_cache import signature, is_racy
+from configurator.utils.file_io import FileIO
+from configurator.utils.configurator_exception import ConfiguratorException
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Keys lock_all rewrites in the files a schema is rendered from, they do not
+# change the render
+LOCK_KEYS = ("_locked", "file_name")
+
+
+def document_digest(folder_name: str, file_name: str) -> str:
+    """The sha256 of a parsed input document without its LOCK_KEYS."""
+    document = FileIO.get_document(folder_name, file_name)
+    document = {key: value for key, value in document.items() if key not in LOCK_KEYS}
+    return hashlib.sha256(json.dumps(document, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class SchemaArtifacts:
+    """Rendered schemas of locked versions, kept as files in
+    SCHEMA_ARTIFACT_FOLDER so they outlive the process.
+
+    The folder is outside INPUT_FOLDER, reading a schema never writes to
+    the configuration repository. Artifacts are written when versions are
+    locked (Configuration.lock_all) into a sub folder per INPUT_FOLDER, an
+    empty SCHEMA_ARTIFACT_FOLDER, or one inside INPUT_FOLDER, disables
+    them.
+
+    Each schema is written to {collection}.{version}.{format}.json. A
+    .meta.json file next to it holds the sha256 of the content, the
+    version of the renderer that produced it and, for every file the schema
+    was rendered from, its (st_mtime_ns, st_size) and document_digest. An
+    artifact is served while its content matches the hash, it was rendered
+    by the current renderer and none of those files changed, which costs a
+    stat per file and no rendering. A file whose stat changed is still
+    current while its digest matches, so locking the dictionaries, types
+    and enumerators after the configurations keeps the artifacts.
+    """
+
+    @staticmethod
+    def folder() -> str:
+        """The artifact folder of INPUT_FOLDER, or None if artifacts are disabled."""
+        return Config.get_instance().get_output_folder("SCHEMA_ARTIFACT_FOLDER")
+
+    @staticmethod
+    def file_name(collection_name: str, version_str: str, schema_format: str) -> str:
+        return f"{collection_name}.{version_str}.{schema_format}.json"
+
+    @staticmethod
+    def read(collection_name: str, version_str: str, schema_format: str, renderer: int) -> tuple:
+        """Return (content, sha256, dependencies) of a valid artifact rendered
+        by renderer, else None. dependencies maps (folder, file_name) to the
+        current stat."""
+        folder = SchemaArtifacts.folder()
+        if folder is None:
+            return None
+        input_folder = Config.get_instance().INPUT_FOLDER
+        file_path = os.path.join(folder, SchemaArtifacts.file_name(collection_name, version_str, schema_format))
+        try:
+            with open(file_path, "rb") as f:
+                content = f.read()
+            with open(file_path[:-len(".json")] + ".meta.json") as f:
+                meta = json.load(f)
+            if meta.get("renderer") != renderer:
+                return None
+            dependencies = {}
+            for folder_name, dependency, mtime_ns, size, digest in meta["dependencies"]:
+                dependency_folder = os.path.join(input_folder, folder_name)
+                stat = os.stat(os.path.join(dependency_folder, dependency))
+                if signature(stat) != (mtime_ns, size) and document_digest(folder_name, dependency) != digest:
+                    return None
+                dependencies[(dependency_folder, dependency)] = stat
+        except (OSError, ValueError, KeyError, TypeError, ConfiguratorException):
+            return None
+        if hashlib.sha256(content).hexdigest() != meta.get("sha256"):
+            logger.warning(f"Ignoring schema artifact {file_path}, its content does not match its hash")
+            return None
+        return content, meta["sha256"], dependencies
+
+    @staticmethod
+    def write(collection_name: str, version_str: str, schema_format: str, schema: dict, dependencies: dict, renderer: int) -> str:
+        """Write the artifact of a schema rendered by renderer from
+        dependencies, a (folder, file_name) -> stat dict. Returns its sha256,
+        or None if artifacts are disabled or a dependency changed too
+        recently to be validated later."""
+        folder = SchemaArtifacts.folder()
+        if folder is None or not dependencies or any(is_racy(stat) for stat in dependencies.values()):
+            return None
+        input_folder = Config.get_instance().INPUT_FOLDER
+        os.makedirs(folder, exist_ok=True)
+        file_path = os.path.join(folder, SchemaArtifacts.file_name(collection_name, version_str, schema_format))
+        content = json.dumps(schema, indent=2, default=str).encode("utf-8")
+        content_hash = hashlib.sha256(content).hexdigest()
+        meta_dependencies = []
+        for (dependency_folder, dependency), stat in sorted(dependencies.items()):
+            folder_name = os.path.relpath(dependency_folder, input_folder)
+            meta_dependencies.append([folder_name, dependency, *signature(stat), document_digest(folder_name, dependency)])
+        meta = {"sha256": content_hash, "renderer": renderer, "dependencies": meta_dependencies}
+        # The meta is replaced last, a read in between sees a hash mismatch and ignores the artifact
+        FileIO._replace_file(folder, file_path, content)
+        FileIO._replace_file(folder, file_path[:-len(".json")] + ".meta.json", json.dumps(meta, indent=2).encode("utf-8"))
+        return content_hash
+
+    @staticmethod
+    def remove(collection_name: str, version_str: str):
+        """Remove the artifacts of a version."""
+        folder = SchemaArtifacts.folder()
+        if folder is None:
+            return
+        for schema_format in ("json", "bson"):
+            file_path = os.path.join(folder, SchemaArtifacts.file_name(collection_name, version_str, schema_format))
+            for path in (file_path[:-len(".json")] + ".meta.json", file_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
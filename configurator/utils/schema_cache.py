@@ -0,0 +1,158 @@
+import os
+import threading
+from collections import OrderedDict
+
+from configurator.utils.config import Config
+from configurator.utils.document_cache import MISSING, signature, is_racy, copy_document
+
+import logging
+logger = logging.getLogger(__name__)
+
+_recorders = threading.local()
+
+
+class DependencyRecorder:
+    """Context manager that collects the files read while it is active.
+
+    FileIO.get_document reports every file it reads with record_dependency,
+    the recorder maps (folder, file_name) to the stat of the file as it was
+    read. Recorders nest, a read is recorded by every active recorder of
+    the thread.
+    """
+
+    def __init__(self):
+        self.dependencies = {}
+
+    def __enter__(self) -> dict:
+        stack = getattr(_recorders, "stack", None)
+        if stack is None:
+            stack = _recorders.stack = []
+        stack.append(self.dependencies)
+        return self.dependencies
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # By identity, nested recorders can hold equal dependencies
+        stack = _recorders.stack
+        for position in range(len(stack) - 1, -1, -1):
+            if stack[position] is self.dependencies:
+                del stack[position]
+                break
+        return False
+
+
+def record_dependency(folder: str, file_name: str, stat: os.stat_result):
+    """Report a file read to the active recorders of this thread."""
+    for dependencies in getattr(_recorders, "stack", ()):
+        dependencies[(folder, file_name)] = stat
+
+
+class SchemaCache:
+    """Process wide, size bounded LRU cache of rendered schemas.
+
+    Entries are keyed by (configuration, version, format) and hold the
+    signature of every file the render read: the dictionary, the
+    dictionaries and types it references and the enumerators file of the
+    version. An entry is valid while all of those files are unchanged.
+    When FileIO writes or deletes a file, the entries the DependencyGraph
+    finds rendered from it are dropped. Callers always receive a copy of the
+    cached schema.
+
+    The SchemaSkeleton of a dictionary is cached alongside the schemas,
+    keyed by (dictionary, None, "format skeleton"), see Version. It is not
+    copied, filling a skeleton does not change it.
+    """
+    _instance = None  # Singleton instance
+
+    def __init__(self, max_size: int = None):
+        if max_size is None:
+            max_size = Config.get_instance().SCHEMA_CACHE_SIZE
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (dependencies, schema)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _is_current(dependencies: dict) -> bool:
+        for (folder, file_name), file_signature in dependencies.items():
+            try:
+                if signature(os.stat(os.path.join(folder, file_name))) != file_signature:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def get(self, key: tuple):
+        """Return a copy of the cached schema, or MISSING if it is not cached
+        or a file it was rendered from has changed."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and not self._is_current(entry[0]):
+            self.invalidate(key)
+            entry = None
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return MISSING
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_document(entry[1])
+
+    def put(self, key: tuple, dependencies: dict, schema: dict) -> dict:
+        """Cache a schema rendered from the files in dependencies, a mapping of
+        (folder, file_name) to the stat taken when the file was read. Returns
+        a copy for the caller. Renders that read no files, or files changed
+        within the racy window, are not cached."""
+        if self.max_size > 0 and dependencies and not any(is_racy(stat) for stat in dependencies.values()):
+            signatures = {dependency: signature(stat) for dependency, stat in dependencies.items()}
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = (signatures, schema)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return copy_document(schema)
+
+    def invalidate(self, key: tuple):
+        """Drop a single entry, if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_file(self, folder: str, file_name: str):
+        """Drop the entries rendered from a file, before it is written or
+        deleted. Entries are keyed by the path of their configuration or
+        dictionary and their version, see DependencyGraph.schema_entries."""
+        from configurator.services.dependency_graph import DependencyGraph  # the graph reads files through FileIO, which imports this module
+        input_folder = Config.get_instance().INPUT_FOLDER
+        rendered = {
+            (os.path.join(input_folder, folder_name, name), version)
+            for folder_name, name, version in DependencyGraph.get_instance().schema_entries(os.path.relpath(folder, input_folder), file_name)
+        }
+        if not rendered:
+            return
+        with self._lock:
+            for key in [key for key in self._entries if key[:2] in rendered]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def to_dict(self):
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    # Singleton Getter
+    @staticmethod
+    def get_instance():
+        """Get the singleton instance of the SchemaCache class."""
+        if SchemaCache._instance is None:
+            SchemaCache._instance = SchemaCache()
+        return SchemaCache._instance
@@ -0,0 +1,155 @@
+import json
+
+from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
+
+import logging
+logger = logging.getLogger(__name__)
+
+# JSON schema keywords whose values are subschemas
+SCHEMA_VALUES = ("items", "additionalProperties", "not", "contains", "if", "then", "else")
+SCHEMA_LISTS = ("oneOf", "anyOf", "allOf", "prefixItems")
+SCHEMA_MAPS = ("properties", "patternProperties")
+
+DEFAULT_MIN_USES = 2
+DEFAULT_MIN_SIZE = 100
+
+
+def defs_options(query: dict) -> dict:
+    """The factor_defs options selected by the query parameters defs (true
+    or false), min_uses and min_size, or None to render inline."""
+    if str(query.get("defs", "false")).lower() not in ("true", "1", "yes"):
+        return None
+    event = ConfiguratorEvent(event_id="DEF-01", event_type="DEFS_OPTIONS")
+    try:
+        min_uses = int(query.get("min_uses", DEFAULT_MIN_USES))
+        min_size = int(query.get("min_size", DEFAULT_MIN_SIZE))
+    except ValueError:
+        event.record_failure("min_uses and min_size must be integers", {"min_uses": query.get("min_uses"), "min_size": query.get("min_size")})
+        raise ConfiguratorException("min_uses and min_size must be integers", event)
+    if min_uses < 2 or min_size < 0:
+        event.record_failure("min_uses must be at least 2 and min_size not negative", {"min_uses": min_uses, "min_size": min_size})
+        raise ConfiguratorException("min_uses must be at least 2 and min_size not negative", event)
+    return {"min_uses": min_uses, "min_size": min_size}
+
+
+def _schema_children(schema: dict):
+    """Yield (keyword, position, subschema) for the subschemas of a schema,
+    position is None, a list index or a property name."""
+    for keyword, value in schema.items():
+        if keyword in SCHEMA_VALUES:
+            if isinstance(value, dict):
+                yield keyword, None, value
+            elif isinstance(value, list) and keyword == "items":
+                for position, item in enumerate(value):
+                    if isinstance(item, dict):
+                        yield keyword, position, item
+        elif keyword in SCHEMA_LISTS and isinstance(value, list):
+            for position, item in enumerate(value):
+                if isinstance(item, dict):
+                    yield keyword, position, item
+        elif keyword in SCHEMA_MAPS and isinstance(value, dict):
+            for position, item in value.items():
+                if isinstance(item, dict):
+                    yield keyword, position, item
+
+
+def def_pointer(name: str) -> str:
+    """The $ref of the $defs entry name, as a JSON pointer"""
+    return "#/$defs/" + name.replace("~", "~0").replace("/", "~1")
+
+
+def factor_defs(schema: dict, min_uses: int = DEFAULT_MIN_USES, min_size: int = DEFAULT_MIN_SIZE) -> dict:
+    """Return a copy of a rendered JSON schema with every subschema that
+    occurs at least min_uses times, and is at least min_size characters
+    long inline, emitted once under $defs and replaced by a $ref.
+
+    Identical subschemas are found by hash consing: every subschema gets the
+    id of its structure (its keywords, values and the ids of its own
+    subschemas) bottom up, so each one is compared in constant time.
+    """
+    ids = {}  # structure -> id
+    representative = []  # id -> first subschema with that structure
+    children = []  # id -> [(keyword, position, child id)]
+    sizes = []  # id -> inline size in characters
+    hints = []  # id -> name for $defs
+
+    # Number the subschemas bottom up, with an explicit stack
+    occurrence = {}  # id(subschema) -> id, for the subschemas of the schema being numbered
+    stack = [(schema, "root", False)]
+    order = []
+    while stack:
+        node, hint, numbered = stack.pop()
+        if not numbered:
+            stack.append((node, hint, True))
+            # Reversed, so subschemas are numbered and named in document order
+            for keyword, position, child in reversed(list(_schema_children(node))):
+                child_hint = position if keyword in SCHEMA_MAPS else (f"{hint}_{keyword}" if position is None else f"{hint}_{keyword}_{position}")
+                stack.append((child, str(child_hint), False))
+            continue
+        node_children = [(keyword, position, occurrence[id(child)]) for keyword, position, child in _schema_children(node)]
+        keywords = {keyword for keyword, _, _ in node_children}
+        opaque = json.dumps({k: v for k, v in node.items() if k not in keywords}, sort_keys=True, default=str)
+        structure = (opaque, tuple(node_children))
+        node_id = ids.get(structure)
+        if node_id is None:
+            node_id = ids[structure] = len(representative)
+            representative.append(node)
+            children.append(node_children)
+            sizes.append(len(opaque) + sum(sizes[child] + len(str(position)) + 4 for _, position, child in node_children))
+            hints.append(hint)
+        occurrence[id(node)] = node_id
+        order.append(node_id)
+    root = occurrence[id(schema)]
+
+    # Count the uses of each structure, the nodes inside a $defs entry count once
+    uses = [0] * len(representative)
+    for node_id in order:
+        uses[node_id] += 1
+    candidates = {node_id for node_id, count in enumerate(uses) if count >= min_uses and sizes[node_id] >= min_size and node_id != root}
+    references = [0] * len(representative)
+    defs = []
+    stack = [root]
+    while stack:
+        for _, _, child in reversed(children[stack.pop()]):
+            if child in candidates:
+                references[child] += 1
+                if references[child] == 1:
+                    defs.append(child)
+                    stack.append(child)
+            else:
+                stack.append(child)
+    # A candidate only used inside other $defs entries may now be used once, inline it
+    candidates = {node_id for node_id in defs if references[node_id] >= min_uses}
+    if not candidates:
+        return schema
+
+    names = {}
+    taken = set(schema.get("$defs", {}))
+    for node_id in defs:
+        if node_id in candidates:
+            name, suffix = hints[node_id], 2
+            while name in taken:
+                name, suffix = f"{hints[node_id]}_{suffix}", suffix + 1
+            taken.add(name)
+            names[node_id] = name
+
+    # Build the output bottom up, once per structure
+    built = {}
+    for node_id in order:
+        if node_id in built:
+            continue
+        node = dict(representative[node_id])
+        for keyword, position, child in children[node_id]:
+            value = {"$ref": def_pointer(names[child])} if child in candidates else built[child]
+            if position is None:
+                node[keyword] = value
+            else:
+                if node[keyword] is representative[node_id][keyword]:
+                    node[keyword] = type(node[keyword])(node[keyword])
+                node[keyword][position] = value
+        built[node_id] = node
+
+    result = built[root]
+    result["$defs"] = {**schema.get("$defs", {}), **{names[node_id]: built[node_id] for node_id in defs if node_id in candidates}}
+    logger.debug(f"Factored {len(candidates)} subschemas into $defs")
+    return result
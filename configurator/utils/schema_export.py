@@ -0,0 +1,93 @@
+import json
+import zipfile
+
+from configurator.utils.configurator_exception import ConfiguratorEvent, ConfiguratorException
+
+import logging
+logger = logging.getLogger(__name__)
+
+SCHEMA_FORMATS = ("json", "bson")
+OUTPUTS = ("ndjson", "zip")
+
+
+def export_options(query: dict) -> tuple:
+    """The (formats, output) selected by the query parameters formats (a
+    comma separated list of json and bson) and output (ndjson or zip)."""
+    formats = tuple(schema_format.strip() for schema_format in str(query.get("formats", ",".join(SCHEMA_FORMATS))).split(",") if schema_format.strip())
+    output = str(query.get("output", "ndjson"))
+    if not formats or any(schema_format not in SCHEMA_FORMATS for schema_format in formats) or output not in OUTPUTS:
+        event = ConfiguratorEvent(event_id="EXP-01", event_type="EXPORT_OPTIONS")
+        event.record_failure(f"formats must be a list of {', '.join(SCHEMA_FORMATS)} and output one of {', '.join(OUTPUTS)}", {"formats": query.get("formats"), "output": query.get("output")})
+        raise ConfiguratorException("Invalid schema export options", event)
+    return tuple(dict.fromkeys(formats)), output
+
+
+def dumps(record: dict) -> str:
+    """Serialize a record, dates and ObjectIds are written as strings."""
+    return json.dumps(record, default=str)
+
+
+def to_ndjson(records):
+    """Yield each export record as a line of JSON."""
+    for record in records:
+        yield dumps(record) + "\n"
+
+
+def _write_zip(records, file, counts: dict):
+    """Write the export records to a zip archive, yielding after each entry.
+    counts is filled with the number of schemas and errors written."""
+    errors = []
+    counts["schemas"] = 0
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for record in records:
+            if "error" in record:
+                errors.append(record)
+                continue
+            collection_name = record["configuration"].rsplit(".", 1)[0]
+            archive.writestr(f"{record['format']}_schema/{collection_name}.{record['version']}.json", json.dumps(record["schema"], indent=2, default=str))
+            counts["schemas"] += 1
+            yield
+        archive.writestr("errors.json", json.dumps(errors, indent=2, default=str))
+        counts["errors"] = len(errors)
+        yield
+    yield
+
+
+def to_zip(records, file) -> dict:
+    """Write the export records to a zip archive: one
+    {format}_schema/{configuration}.{version}.json file per schema and an
+    errors.json with the records that failed. Returns the counts."""
+    counts = {}
+    for _ in _write_zip(records, file, counts):
+        pass
+    return counts
+
+
+class _Chunks:
+    """A write only stream that keeps what was written until it is taken."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def to_zip_stream(records):
+    """Yield the zip archive of to_zip in chunks, one per entry, as it is
+    written. The archive is written without seeking, only the entry being
+    written is held in memory."""
+    stream = _Chunks()
+    for _ in _write_zip(records, stream, {}):
+        data = stream.take()
+        if data:
+            yield data
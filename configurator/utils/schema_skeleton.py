@@ -0,0 +1,130 @@
+from configurator.utils.schema_cache import record_dependency
+
+
+class EnumSlot:
+    """The placeholder a skeleton is rendered with in place of the values of
+    an enumerator, see SlotEnumerations."""
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+
+class SlotEnumerations:
+    """Stands in for Enumerations when rendering a skeleton, every enumerator
+    renders as [EnumSlot(name)]."""
+
+    def __init__(self):
+        self._slots = {}
+
+    def get_enum_values(self, enum_name) -> tuple:
+        slot = self._slots.get(enum_name)
+        if slot is None:
+            slot = self._slots[enum_name] = (EnumSlot(enum_name),)
+        return slot
+
+
+class SchemaSkeleton:
+    """A schema rendered once without enumerations, filled with the values of
+    each enumerator version that uses it.
+
+    Versions that differ only in their enumerator version render the same
+    dictionary, its skeleton is the render with SlotEnumerations. fill
+    copies the containers on the path from the root to each enum slot and
+    shares everything else with the skeleton, so the schemas it returns must
+    not be changed by the caller, see Version.
+
+    The skeleton of "both" formats is a (json, bson) tuple and is filled as
+    one. dependencies are the files the skeleton was rendered from, as
+    recorded by a DependencyRecorder, see record_dependencies.
+    """
+
+    def __init__(self, schema, dependencies: dict = None):
+        self.is_pair = isinstance(schema, tuple)
+        self.schema = list(schema) if self.is_pair else schema
+        self.dependencies = dependencies or {}
+        # (index of the parent step, key in the parent, container or EnumSlot)
+        # in pre-order, every container is copied before its children
+        self._steps = self._plan(self.schema)
+
+    @staticmethod
+    def _plan(schema) -> list:
+        """The steps of fill: the root, the containers holding an enum slot
+        below them and the slots, found in one walk of the skeleton. Slots
+        are rendered as the enum of a schema, the walk follows the
+        subschemas a render nests, see CompiledProperty._emit_json."""
+        steps = [(-1, None, schema)]
+        found = []  # steps of the enum slots
+        if isinstance(schema, list):
+            stack = [(0, position, subschema) for position, subschema in enumerate(schema)]
+        else:
+            stack = [(-1, None, schema)]
+        while stack:
+            parent, key, node = stack.pop()
+            enum = node.get("enum")
+            properties = node.get("properties")
+            items = node.get("items")
+            one_of = node.get("oneOf")
+            if not (properties or one_of or isinstance(items, dict) or enum is not None):
+                continue  # A leaf without an enum slot
+            if parent < 0:
+                step = 0  # The root
+            else:
+                step = len(steps)
+                steps.append((parent, key, node))
+            if enum is not None and len(enum) == 1 and isinstance(enum[0], EnumSlot):
+                found.append(len(steps))
+                steps.append((step, "enum", enum[0]))
+            if properties:
+                steps.append((step, "properties", properties))
+                stack.extend((len(steps) - 1, name, subschema) for name, subschema in properties.items())
+            if isinstance(items, dict):
+                stack.append((step, "items", items))
+            if one_of:
+                steps.append((step, "oneOf", one_of))
+                stack.extend((len(steps) - 1, position, subschema) for position, subschema in enumerate(one_of))
+        marked = [False] * len(steps)  # per step, True if it is or holds an enum slot
+        for step in found:
+            marked[step] = True
+        for step in found:
+            parent = steps[step][0]
+            while parent >= 0 and not marked[parent]:
+                marked[parent] = True
+                parent = steps[parent][0]
+        marked[0] = True
+
+        # Keep the marked steps, renumbered, parents before their children
+        kept = {}
+        plan = []
+        for step, mark in enumerate(marked):
+            if mark:
+                parent, key, source = steps[step]
+                kept[step] = len(plan)
+                plan.append((kept[parent] if parent >= 0 else -1, key, source))
+        return plan
+
+    @property
+    def slots(self) -> int:
+        """The number of enum slots of the skeleton."""
+        return sum(1 for _, _, source in self._steps if isinstance(source, EnumSlot))
+
+    def record_dependencies(self):
+        """Report the files the skeleton was rendered from to the active
+        DependencyRecorders, as a render would when it reads them."""
+        for (folder, file_name), stat in self.dependencies.items():
+            record_dependency(folder, file_name, stat)
+
+    def fill(self, enumerations):
+        """The schema with the values of enumerations in its enum slots.
+        Raises the error of enumerations.get_enum_values for an enumerator
+        the version does not have."""
+        copies = []
+        for parent, key, source in self._steps:
+            if isinstance(source, EnumSlot):
+                value = list(enumerations.get_enum_values(source.name))
+            else:
+                value = source.copy()
+            copies.append(value)
+            if parent >= 0:
+                copies[parent][key] = value
+        return tuple(copies[0]) if self.is_pair else copies[0]
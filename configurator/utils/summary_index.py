@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+from configurator.utils.config import Config
+from configurator.utils.document_cache import signature, is_racy, RACY_WINDOW_NS
+
+import logging
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+def index_file_name(folder_name: str) -> str:
+    """The sidecar file of a folder, kept in the SUMMARY_INDEX_FOLDER of INPUT_FOLDER."""
+    return f"{folder_name}.index.json"
+
+
+def make_entry(size: int, updated: float, data: bytes, summary) -> dict:
+    """An index entry for a file, summary is None if the file could not be summarized.
+    A file changed again within the racy window would keep the same mtime, so
+    a recent mtime is left out and the next read checks the hash instead."""
+    if time.time_ns() - int(updated * 1e9) < RACY_WINDOW_NS:
+        updated = None
+    return {
+        "size": size,
+        "updated": updated,
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "summary": summary,
+    }
+
+
+def is_current(entry: dict, file) -> bool:
+    """True if the entry was taken from the file as it is listed now."""
+    return (entry is not None and entry.get("updated") is not None
+            and entry.get("size") == file.size and entry.get("updated") == file._updated)
+
+
+class SummaryIndex:
+    """Process wide, persistent index of the card summaries of a folder.
+
+    The index of a folder is a sidecar JSON file in SUMMARY_INDEX_FOLDER
+    holding, for every file, its size, mtime and sha256 and the summary
+    fields derived from its document (None if it could not be summarized).
+    FileIO keeps entries current when it writes or deletes a file,
+    ServiceBase.get_summaries refreshes entries of files changed outside of
+    the API. The sidecar is read once and then served from memory until it
+    changes on disk. Sidecars are never written into INPUT_FOLDER, with an
+    empty SUMMARY_INDEX_FOLDER, or one inside INPUT_FOLDER, the index is
+    kept in memory only.
+
+    Services register the summarize(file_name, document) function of their
+    folder, folders without one are not indexed.
+    """
+    _instance = None  # Singleton instance
+    _summarizers = {}  # Config folder setting -> summarize function
+
+    def __init__(self):
+        self._indexes = {}  # (sidecar path, folder_name) -> (sidecar signature, entries)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def register(folder_setting: str, summarize):
+        """Index the folder named by a Config setting, e.g. TYPE_FOLDER."""
+        SummaryIndex._summarizers[folder_setting] = summarize
+
+    @staticmethod
+    def get_summarizer(folder_name: str):
+        config = Config.get_instance()
+        for folder_setting, summarize in SummaryIndex._summarizers.items():
+            if getattr(config, folder_setting, None) == folder_name:
+                return summarize
+        return None
+
+    def _path(self, folder_name: str) -> str:
+        """The sidecar of a folder, or None if indexes are kept in memory."""
+        folder = Config.get_instance().get_output_folder("SUMMARY_INDEX_FOLDER")
+        if folder is None:
+            return None
+        return os.path.join(folder, index_file_name(folder_name))
+
+    def _key(self, path: str, folder_name: str) -> tuple:
+        # In memory indexes are kept per INPUT_FOLDER
+        return (path or Config.get_instance().INPUT_FOLDER, folder_name)
+
+    @staticmethod
+    def _stat(path: str):
+        if path is None:
+            return None
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def get_entries(self, folder_name: str) -> dict:
+        """Return a copy of the entries of a folder, keyed by file name."""
+        path = self._path(folder_name)
+        with self._lock:
+            stat = self._stat(path)
+            cached = self._indexes.get(self._key(path, folder_name))
+            if cached is not None and cached[0] == (signature(stat) if stat else None) and not (stat and is_racy(stat)):
+                return dict(cached[1])
+            entries = {}
+            if stat is not None:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        index = json.load(f)
+                    if index.get("format") == FORMAT_VERSION:
+                        entries = index["files"]
+                    else:
+                        logger.info(f"Ignoring summary index {path} with format {index.get('format')}")
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable summary index {path}: {str(e)}")
+            self._indexes[self._key(path, folder_name)] = (signature(stat) if stat else None, entries)
+            return dict(entries)
+
+    def put_entries(self, folder_name: str, entries: dict):
+        """Replace the entries of a folder and write the sidecar. A sidecar
+        that can not be written (e.g. a read only SUMMARY_INDEX_FOLDER) is
+        logged and the entries are kept in memory."""
+        path = self._path(folder_name)
+        with self._lock:
+            if path is not None:
+                content = json.dumps({"format": FORMAT_VERSION, "files": entries}, separators=(",", ":"))
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(temp_path, 'w', encoding='utf-8') as f:
+                        f.write(content)
+                    os.replace(temp_path, path)
+                except OSError as e:
+                    logger.warning(f"Summary index {path} not written: {str(e)}")
+                    try:
+                        os.remove(temp_path)
+                    except OSError:
+                        pass
+            stat = self._stat(path)
+            self._indexes[self._key(path, folder_name)] = (signature(stat) if stat else None, dict(entries))
+
+    def update(self, folder_name: str, file_name: str, stat: os.stat_result, data: bytes, document):
+        """Index a file FileIO has written, does nothing for folders that are not indexed."""
+        summarize = SummaryIndex.get_summarizer(folder_name)
+        if summarize is None:
+            return
+        try:
+            summary = summarize(file_name, document)
+        except Exception as e:
+            logger.warning(f"Not summarizing {file_name}: {str(e)}")
+            summary = None
+        entry = make_entry(stat.st_size, stat.st_mtime, data, summary)
+        with self._lock:
+            entries = self.get_entries(folder_name)
+            if entries.get(file_name) == entry:
+                return
+            entries[file_name] = entry
+            self.put_entries(folder_name, entries)
+
+    def remove(self, folder_name: str, file_name: str):
+        """Drop the entry of a file FileIO has deleted."""
+        if SummaryIndex.get_summarizer(folder_name) is None:
+            return
+        with self._lock:
+            entries = self.get_entries(folder_name)
+            if entries.pop(file_name, None) is not None:
+                self.put_entries(folder_name, entries)
+
+    def drop(self, folder_name: str):
+        """Delete the index of a folder, the next summary read rebuilds it."""
+        path = self._path(folder_name)
+        with self._lock:
+            self._indexes.pop(self._key(path, folder_name), None)
+            if path is None:
+                return
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """Forget the in memory copies, sidecar files are kept."""
+        with self._lock:
+            self._indexes.clear()
+
+    # Singleton Getter
+    @staticmethod
+    def get_instance():
+        """Get the singleton instance of the SummaryIndex class."""
+        if SummaryIndex._instance is None:
+            SummaryIndex._instance = SummaryIndex()
+        return SummaryIndex._instance
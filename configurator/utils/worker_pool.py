@@ -0,0 +1,78 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from configurator.utils.config import Config
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def available_cpus() -> int:
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class WorkerPool:
+    """Process wide, bounded thread pool for fanning out per file work.
+
+    map() returns results in the order of the items, like the builtin map.
+    Work submitted from inside a worker runs inline so nested fan outs can
+    not exhaust the pool and deadlock. A pool inherited through a fork
+    (gunicorn --preload) has no threads in the child and is replaced.
+
+    MAX_WORKERS sets the pool size, 0 sizes it to the available CPUs (at
+    most DEFAULT_MAX_WORKERS). With a single CPU all work runs inline.
+    """
+    _instance = None  # Singleton instance
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers: int = None):
+        if max_workers is None:
+            max_workers = Config.get_instance().MAX_WORKERS
+        if max_workers <= 0:
+            max_workers = min(WorkerPool.DEFAULT_MAX_WORKERS, available_cpus())
+        self.max_workers = max_workers
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="configurator-worker")
+                self._pid = os.getpid()
+            return self._executor
+
+    def _run(self, function, item):
+        self._local.in_worker = True
+        try:
+            return function(item)
+        finally:
+            self._local.in_worker = False
+
+    def map(self, function, items) -> list:
+        """Call function on each item and return the results in item order.
+        The first exception raised by a call is raised to the caller."""
+        items = list(items)
+        if self.max_workers <= 1 or len(items) <= 1 or getattr(self._local, "in_worker", False):
+            return [function(item) for item in items]
+        executor = self._get_executor()
+        return list(executor.map(lambda item: self._run(function, item), items))
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None and self._pid == os.getpid():
+                self._executor.shutdown(wait=True)
+            self._executor = None
+
+    # Singleton Getter
+    @staticmethod
+    def get_instance():
+        """Get the singleton instance of the WorkerPool class."""
+        if WorkerPool._instance is None:
+            WorkerPool._instance = WorkerPool()
+        return WorkerPool._instance
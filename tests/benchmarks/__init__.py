@@ -0,0 +1,3 @@
+"""
+Benchmarks - run with `pipenv run benchmark`, not part of the unit test suite
+"""
@@ -0,0 +1,6 @@
+"""Run all benchmarks: python -m tests.benchmarks"""
+from tests.benchmarks import bench_yaml, bench_summaries, bench_render
+
+for benchmark in [bench_yaml, bench_summaries, bench_render]:
+    print(f"===== {benchmark.__name__}")
+    benchmark.main()
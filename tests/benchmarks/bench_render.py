@@ -0,0 +1,111 @@
+"""Compare the memory and build time of a large dictionary as a fully
+materialized Property tree and as a CompiledProperty, and measure its render
+time. Property children are parsed on first access, the tree is walked to
+parse all of them, as a to_dict of an edited dictionary would. The dictionary is generated: objects of
+PROPERTIES_PER_OBJECT properties (simple, enum, constant, arrays of
+objects), nested until it holds about PROPERTY_COUNT properties. A SchemaSkeleton of
+the dictionary is filled as a version that only changes its enumerator
+version would be."""
+import gc
+import time
+import tracemalloc
+
+from configurator.services.enumeration_service import Enumerations
+from configurator.services.property import Property
+from configurator.services.property.compiled import CompiledProperty
+
+PROPERTY_COUNT = 10_000
+PROPERTIES_PER_OBJECT = 20
+ITERATIONS = 20
+
+
+def build_dictionary(count: int = PROPERTY_COUNT) -> dict:
+    """Raw root property data of a dictionary with about `count` properties."""
+    root = {"name": "root", "description": "Generated dictionary", "type": "object", "properties": []}
+    objects = [root]
+    created = 0
+    while created < count:
+        parent = objects.pop(0)
+        for index in range(PROPERTIES_PER_OBJECT):
+            name = f"property_{created}"
+            if index % 5 == 0:
+                child = {"name": f"object_{created}", "description": "Nested", "type": "object", "properties": []}
+                parent["properties"].append({"name": name, "description": "List", "type": "array", "items": child})
+                objects.append(child)
+                created += 1
+            elif index % 5 == 1:
+                parent["properties"].append({"name": name, "description": "Status", "type": "enum", "enums": "status", "required": True})
+            elif index % 5 == 2:
+                parent["properties"].append({"name": name, "description": "Version", "type": "constant", "constant": "1.0"})
+            else:
+                parent["properties"].append({"name": name, "description": "A word", "type": "simple", "schema": {"type": "string", "maxLength": 40}})
+            created += 1
+    return root
+
+
+def materialize(data: dict):
+    """A Property tree with every lazily parsed child parsed."""
+    root = Property(data)
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        stack.extend(getattr(node, "properties", None) or ())
+        items = getattr(node, "items", None)
+        if items is not None:
+            stack.append(items)
+    return root
+
+
+def measure(build) -> tuple:
+    """Return (result, bytes retained) of build()."""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def best_time(render) -> float:
+    """Best wall time of ITERATIONS calls, without garbage collection."""
+    best = None
+    gc.disable()
+    try:
+        for _ in range(ITERATIONS):
+            start = time.perf_counter()
+            render()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        gc.enable()
+    return best
+
+
+def main():
+    data = build_dictionary()
+    enumerations = Enumerations(file_name="bench.yaml", document={"version": 1, "enumerators": [
+        {"name": "status", "values": [{"value": "active"}, {"value": "archived"}]}
+    ]})
+
+    _, tree_size = measure(lambda: materialize(data))
+    compiled, compiled_size = measure(lambda: CompiledProperty.compile(data))
+    tree_build = best_time(lambda: materialize(data))
+    compiled_build = best_time(lambda: CompiledProperty.compile(data))
+    print(f"Dictionary: {len(compiled)} properties")
+    print(f"{'':16} {'memory':>10} {'per node':>9} {'build':>10}")
+    for name, size, build in [("Property tree", tree_size, tree_build), ("CompiledProperty", compiled_size, compiled_build)]:
+        print(f"{name:16} {size / 1024:8.0f} KB {size / len(compiled):7.0f} B {build * 1000:7.1f} ms")
+
+    json_time = best_time(lambda: compiled.to_json_schema(enumerations))
+    bson_time = best_time(lambda: compiled.to_bson_schema(enumerations))
+    both_time = best_time(lambda: compiled.to_schemas(enumerations))
+    print(f"Render: json {json_time * 1000:.1f} ms, bson {bson_time * 1000:.1f} ms, "
+          f"both {both_time * 1000:.1f} ms ({1 - both_time / (json_time + bson_time):.0%} less than json + bson)")
+
+    skeleton_build = best_time(lambda: compiled.to_skeleton("both"))
+    skeleton = compiled.to_skeleton("both")
+    fill_time = best_time(lambda: skeleton.fill(enumerations))
+    print(f"SchemaSkeleton: {skeleton.slots} enum slots, built in {skeleton_build * 1000:.1f} ms, filled in {fill_time * 1000:.1f} ms (both)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare Type.get_types_summary and Configuration.get_collections_summary
+wall time on a folder of copies of the passing_process corpus. Cold runs drop
+the parsed document cache and the summary indexes and parse every file,
+touched runs change the mtime of every file so each is hashed but none is
+parsed, indexed runs answer from the SummaryIndex."""
+import os
+import time
+import shutil
+import tempfile
+
+from configurator.utils.config import Config
+from configurator.utils.document_cache import DocumentCache, FolderCache
+from configurator.utils.summary_index import SummaryIndex
+from configurator.services.type_services import Type
+from configurator.services.configuration_services import Configuration
+
+CORPUS = "./tests/test_cases/passing_process"
+COPIES = 100
+ITERATIONS = 5
+
+
+def build_corpus(target: str, copies: int = COPIES):
+    """Copy each type and configuration file `copies` times under new names."""
+    for folder in ["types", "configurations"]:
+        os.makedirs(os.path.join(target, folder))
+        for file_name in os.listdir(os.path.join(CORPUS, folder)):
+            source = os.path.join(CORPUS, folder, file_name)
+            name, extension = file_name.split(".", 1)
+            for copy in range(copies):
+                shutil.copy(source, os.path.join(target, folder, f"{name}_{copy}.{extension}"))
+
+
+def touch(folder: str, seconds: float):
+    """Set the mtime of every file in the folder `seconds` in the past."""
+    past = time.time() - seconds
+    for root, _, files in os.walk(folder):
+        for name in files + [root]:
+            path = os.path.join(root, name) if name != root else root
+            os.utime(path, (past, past))
+
+
+def time_summaries(summary, mode: str) -> float:
+    config = Config.get_instance()
+    summary()  # warm up the folder listing and the index
+    elapsed = 0.0
+    for iteration in range(ITERATIONS):
+        DocumentCache.get_instance().clear()
+        if mode == "cold":
+            SummaryIndex.get_instance().drop(config.TYPE_FOLDER)
+            SummaryIndex.get_instance().drop(config.CONFIGURATION_FOLDER)
+        elif mode == "touched":
+            touch(config.INPUT_FOLDER, 20 + iteration)
+            FolderCache.get_instance().clear()
+        start = time.perf_counter()
+        summary()
+        elapsed += time.perf_counter() - start
+    return elapsed / ITERATIONS
+
+
+def main():
+    config = Config.get_instance()
+    original_input_folder = config.INPUT_FOLDER
+    temp_dir = tempfile.mkdtemp()
+    try:
+        build_corpus(temp_dir)
+        config.INPUT_FOLDER = temp_dir
+        FolderCache.get_instance().clear()
+        touch(temp_dir, 10)
+
+        print(f"Corpus: {len(os.listdir(os.path.join(temp_dir, 'types')))} types, "
+              f"{len(os.listdir(os.path.join(temp_dir, 'configurations')))} configurations")
+        for name, summary in [("get_types_summary", Type.get_types_summary),
+                              ("get_collections_summary", Configuration.get_collections_summary)]:
+            times = {mode: time_summaries(summary, mode) for mode in ["cold", "touched", "indexed"]}
+            print(f"{name:24} " + "  ".join(f"{mode} {elapsed * 1000:8.1f} ms" for mode, elapsed in times.items()))
+    finally:
+        config.INPUT_FOLDER = original_input_folder
+        SummaryIndex.get_instance().clear()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare YAML parse and dump throughput of the pure Python and libyaml
+implementations on the passing_process corpus."""
+import os
+import time
+import yaml
+
+CORPUS = "./tests/test_cases/passing_process"
+FOLDERS = ["configurations", "dictionaries", "enumerators", "types"]
+ITERATIONS = 20
+
+
+def load_corpus(corpus: str = CORPUS) -> list[str]:
+    """Read every YAML input file in the corpus into memory."""
+    texts = []
+    for folder in FOLDERS:
+        folder_path = os.path.join(corpus, folder)
+        for file_name in sorted(os.listdir(folder_path)):
+            if file_name.endswith(".yaml"):
+                with open(os.path.join(folder_path, file_name), "r", encoding="utf-8") as f:
+                    texts.append(f.read())
+    return texts
+
+
+def time_it(function, iterations: int = ITERATIONS) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return time.perf_counter() - start
+
+
+def main():
+    texts = load_corpus()
+    total_bytes = sum(len(text.encode("utf-8")) for text in texts)
+    documents = [yaml.safe_load(text) for text in texts]
+    print(f"Corpus: {CORPUS} - {len(texts)} files, {total_bytes / 1024:.1f} KiB, {ITERATIONS} iterations")
+
+    implementations = [("SafeLoader/SafeDumper (Python)", yaml.SafeLoader, yaml.SafeDumper)]
+    if hasattr(yaml, "CSafeLoader"):
+        implementations.append(("CSafeLoader/CSafeDumper (libyaml)", yaml.CSafeLoader, yaml.CSafeDumper))
+    else:
+        print("PyYAML was built without libyaml - only the Python implementation is available")
+
+    baseline = None
+    for name, loader, dumper in implementations:
+        parse = time_it(lambda: [yaml.load(text, Loader=loader) for text in texts])
+        dump = time_it(lambda: [yaml.dump(document, Dumper=dumper) for document in documents])
+        parse_rate = len(texts) * ITERATIONS / parse
+        baseline = baseline or parse_rate
+        print(f"{name:36} parse {parse_rate:9.0f} docs/s {total_bytes * ITERATIONS / parse / 1048576:6.2f} MiB/s "
+              f"({parse_rate / baseline:4.1f}x)  dump {len(documents) * ITERATIONS / dump:9.0f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
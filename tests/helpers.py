@@ -0,0 +1,35 @@
+"""Helpers shared by the unit tests."""
+import os
+import time
+
+
+def age(path: str, seconds: int = 10):
+    """Move the mtime of a path into the past so it is not racy."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def age_tree(folder: str, seconds: int = 10):
+    """Move the mtime of every file below a folder into the past, see age."""
+    past = time.time() - seconds
+    for root, _, files in os.walk(folder):
+        for name in files:
+            os.utime(os.path.join(root, name), (past, past))
+
+
+def reset_caches():
+    """Drop the process wide caches and registries, so a test starts from,
+    and leaves behind, files read from disk."""
+    from configurator.utils.document_cache import DocumentCache, FolderCache
+    from configurator.utils.schema_cache import SchemaCache
+    from configurator.utils.summary_index import SummaryIndex
+    from configurator.services.dependency_graph import DependencyGraph
+    from configurator.services.enumerators import Enumerators
+    from configurator.services.service_registry import ServiceRegistry
+    SchemaCache._instance = None
+    ServiceRegistry._instance = None
+    SummaryIndex._instance = None
+    DependencyGraph._instance = None
+    Enumerators.clear()
+    DocumentCache.get_instance().clear()
+    FolderCache.get_instance().clear()
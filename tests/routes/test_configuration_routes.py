@@ -1,6 +1,9 @@
+import io
+import json
 import unittest
 import os
 import tempfile
+import zipfile
 from pathlib import Path
 from unittest.mock import patch, Mock
 from flask import Flask
@@ -486,6 +489,92 @@ class TestConfigurationRoutes(unittest.TestCase):
         # For successful responses, expect data directly, not wrapped in event envelope
         self.assertEqual(response_data, {"type": "object"})
 
+    @patch('configurator.routes.configuration_routes.Configuration')
+    def test_get_json_schema_with_defs(self, mock_configuration_class):
+        """Test GET /api/configurations/json_schema/<file_name>/<version>/?defs=true passes the defs options."""
+        # Arrange
+        mock_configuration = Mock()
+        mock_configuration.get_json_schema.return_value = {"type": "object", "$defs": {}}
+        mock_configuration_class.return_value = mock_configuration
+
+        # Act
+        response = self.client.get('/api/configurations/json_schema/test_config/1.0.0/?defs=true&min_uses=3')
+        invalid = self.client.get('/api/configurations/json_schema/test_config/1.0.0/?defs=true&min_uses=one')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        mock_configuration.get_json_schema.assert_called_once_with("1.0.0", {"min_uses": 3, "min_size": 100})
+        self.assertEqual(invalid.status_code, 500)
+        self.assertEqual(invalid.json["sub_events"][0]["id"], "DEF-01")
+
+    @patch('configurator.routes.configuration_routes.Configuration')
+    def test_get_schemas_with_profile(self, mock_configuration_class):
+        """Test ?profile=true returns the schema with the profile of its render."""
+        # Arrange
+        mock_profile = Mock()
+        mock_profile.to_dict.return_value = {"elapsed_ms": 1.0}
+        mock_configuration = Mock()
+        mock_configuration.profile_schema.side_effect = lambda version, schema_format: (
+            {"json_schema": {}, "bson_schema": {}} if schema_format == "both" else {"type": "object"}, mock_profile)
+        mock_configuration_class.return_value = mock_configuration
+
+        # Act
+        json_response = self.client.get('/api/configurations/json_schema/test_config/1.0.0/?profile=true')
+        bson_response = self.client.get('/api/configurations/bson_schema/test_config/1.0.0/?profile=true')
+        schemas_response = self.client.get('/api/configurations/schemas/test_config/1.0.0/?profile=true')
+
+        # Assert
+        self.assertEqual(json_response.json, {"schema": {"type": "object"}, "profile": {"elapsed_ms": 1.0}})
+        self.assertEqual(bson_response.status_code, 200)
+        self.assertEqual(schemas_response.json, {"json_schema": {}, "bson_schema": {}, "profile": {"elapsed_ms": 1.0}})
+        mock_configuration.profile_schema.assert_any_call("1.0.0", "bson")
+        mock_configuration.get_json_schema.assert_not_called()
+
+    @patch('configurator.routes.configuration_routes.Configuration')
+    def test_analyze_schema(self, mock_configuration_class):
+        """Test GET /api/configurations/analysis/<file_name>/<version>/ returns the estimate."""
+        # Arrange
+        analysis = {"configuration": "test_config", "version": "1.0.0", "nodes": 4, "bytes": 500, "budget": {"mode": "inline"}}
+        mock_configuration = Mock()
+        mock_configuration.analyze.return_value = analysis
+        mock_configuration_class.return_value = mock_configuration
+
+        # Act
+        response = self.client.get('/api/configurations/analysis/test_config/1.0.0/')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, analysis)
+        mock_configuration.analyze.assert_called_once_with("1.0.0")
+
+    @patch('configurator.routes.configuration_routes.Configuration')
+    def test_export_schemas(self, mock_configuration_class):
+        """Test GET /api/configurations/export/ streams NDJSON or a zip archive."""
+        # Arrange
+        records = [{"configuration": "sample.yaml", "version": "1.0.0.1", "format": "bson", "schema": {"bsonType": "object"}}]
+        mock_configuration_class.export_schemas.side_effect = lambda formats, defs: iter(records)
+
+        # Act
+        response = self.client.get('/api/configurations/export/?formats=bson')
+        lines = response.get_data(as_text=True).splitlines()
+        archive = self.client.get('/api/configurations/export/?output=zip')
+        archive_is_streamed = archive.is_streamed
+        archive_data = archive.get_data()
+        invalid = self.client.get('/api/configurations/export/?formats=xml')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertEqual([json.loads(line) for line in lines], records)
+        mock_configuration_class.export_schemas.assert_any_call(("bson",), None)
+        self.assertEqual(archive.status_code, 200)
+        self.assertEqual(archive.mimetype, "application/zip")
+        self.assertTrue(archive_is_streamed)
+        with zipfile.ZipFile(io.BytesIO(archive_data)) as archive_file:
+            self.assertEqual(archive_file.namelist(), ["bson_schema/sample.1.0.0.1.json", "errors.json"])
+        self.assertEqual(invalid.status_code, 500)
+        self.assertEqual(invalid.json["sub_events"][0]["id"], "EXP-01")
+
     @patch('configurator.routes.configuration_routes.Configuration')
     def test_get_json_schema_general_exception(self, mock_configuration_class):
         """Test GET /api/configurations/json_schema/<file_name>/<version>/ when Configuration raises a general exception."""
@@ -543,6 +632,37 @@ class TestConfigurationRoutes(unittest.TestCase):
         self.assertIn("data", response_data)
         self.assertEqual(response_data["status"], "FAILURE")
 
+    @patch('configurator.routes.configuration_routes.Configuration')
+    def test_get_schemas_success(self, mock_configuration_class):
+        """Test successful GET /api/configurations/schemas/<file_name>/<version>/."""
+        # Arrange
+        mock_configuration = Mock()
+        mock_configuration.get_schemas.return_value = {"json_schema": {"type": "object"}, "bson_schema": {"bsonType": "object"}}
+        mock_configuration_class.return_value = mock_configuration
+
+        # Act
+        response = self.client.get('/api/configurations/schemas/test_config/1.0.0/')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"json_schema": {"type": "object"}, "bson_schema": {"bsonType": "object"}})
+        mock_configuration.get_schemas.assert_called_once_with("1.0.0")
+
+    @patch('configurator.routes.configuration_routes.Configuration')
+    def test_get_schemas_general_exception(self, mock_configuration_class):
+        """Test GET /api/configurations/schemas/<file_name>/<version>/ when Configuration raises a general exception."""
+        # Arrange
+        mock_configuration = Mock()
+        mock_configuration.get_schemas.side_effect = Exception("Unexpected error")
+        mock_configuration_class.return_value = mock_configuration
+
+        # Act
+        response = self.client.get('/api/configurations/schemas/test_config/1.0.0/')
+
+        # Assert
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json["status"], "FAILURE")
+
     @patch('configurator.routes.configuration_routes.TemplateService.create_collection')
     def test_create_collection_configurator_exception(self, mock_create_collection):
         """Test POST /api/configurations/collection/<file_name> when TemplateService raises ConfiguratorException."""
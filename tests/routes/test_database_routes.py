@@ -80,7 +80,7 @@ class TestDatabaseRoutes(unittest.TestCase):
             "sub_events": []
         }
         mock_mongo_io.drop_database.return_value = mock_event
-        mock_mongo_io_class.return_value = mock_mongo_io
+        mock_mongo_io_class.get_instance.return_value = mock_mongo_io
 
         # Act
         response = self.client.delete('/api/database/')
@@ -92,7 +92,8 @@ class TestDatabaseRoutes(unittest.TestCase):
         self.assertIsInstance(response_data, dict)
         self.assertEqual(response_data["status"], "SUCCESS")
         mock_mongo_io.drop_database.assert_called_once()
-        mock_mongo_io.disconnect.assert_called_once()
+        # The shared client stays connected for the next request
+        mock_mongo_io.disconnect.assert_not_called()
 
     @patch('configurator.routes.database_routes.MongoIO')
     def test_drop_database_configurator_exception(self, mock_mongo_io_class):
@@ -102,7 +103,7 @@ class TestDatabaseRoutes(unittest.TestCase):
         mock_mongo_io = Mock()
         mock_event = ConfiguratorEvent("TEST-01", "TEST", {"error": "test"})
         mock_mongo_io.drop_database.side_effect = ConfiguratorException("Database error", mock_event)
-        mock_mongo_io_class.return_value = mock_mongo_io
+        mock_mongo_io_class.get_instance.return_value = mock_mongo_io
 
         # Act
         response = self.client.delete('/api/database/')
@@ -132,7 +133,7 @@ class TestDatabaseRoutes(unittest.TestCase):
             "Drop database Safety Limit Exceeded - Collections with >100 documents found", 
             mock_event
         )
-        mock_mongo_io_class.return_value = mock_mongo_io
+        mock_mongo_io_class.get_instance.return_value = mock_mongo_io
 
         # Act
         response = self.client.delete('/api/database/')
@@ -150,7 +151,7 @@ class TestDatabaseRoutes(unittest.TestCase):
         self._setup_config_for_local()
         mock_mongo_io = Mock()
         mock_mongo_io.drop_database.side_effect = Exception("Unexpected error")
-        mock_mongo_io_class.return_value = mock_mongo_io
+        mock_mongo_io_class.get_instance.return_value = mock_mongo_io
 
         # Act
         response = self.client.delete('/api/database/')
@@ -190,7 +191,7 @@ class TestDatabaseRoutes(unittest.TestCase):
             "Drop database not allowed when MONGO_CONNECTION_STRING is not from default",
             mock_event
         )
-        mock_mongo_io_class.return_value = mock_mongo_io
+        mock_mongo_io_class.get_instance.return_value = mock_mongo_io
 
         # Act
         response = self.client.delete('/api/database/')
@@ -83,6 +83,23 @@ class TestDictionaryRoutes(unittest.TestCase):
         # For successful responses, expect data directly, not wrapped in event envelope
         self.assertEqual(response_data, [{"name": "dict1.yaml"}, {"name": "dict2.yaml"}])
 
+    @patch('configurator.routes.dictionary_routes.FileIO')
+    def test_get_dictionaries_with_query(self, mock_file_io):
+        """Test GET /api/dictionaries passes the list query to FileIO."""
+        # Arrange
+        mock_file_io.get_documents.return_value = []
+
+        # Act
+        response = self.client.get('/api/dictionaries/?prefix=user.&sort=updated_at&order=desc&limit=10')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        query = mock_file_io.get_documents.call_args[0][1]
+        self.assertEqual(query.get("prefix"), "user.")
+        self.assertEqual(query.get("sort"), "updated_at")
+        self.assertEqual(query.get("order"), "desc")
+        self.assertEqual(query.get("limit"), "10")
+
     @patch('configurator.routes.dictionary_routes.FileIO')
     def test_get_dictionaries_general_exception(self, mock_file_io):
         """Test GET /api/dictionaries when FileIO raises a general exception."""
@@ -117,6 +134,22 @@ class TestDictionaryRoutes(unittest.TestCase):
         response_data = response.json
         self.assertEqual(response_data, {"name": "test_dict", "version": "1.0.0"})
 
+    @patch('configurator.routes.dictionary_routes.DependencyGraph')
+    def test_get_dictionary_dependents_success(self, mock_graph_class):
+        """Test successful GET /api/dictionaries/<file_name>/dependents/."""
+        # Arrange
+        impact = {"dependents": [{"kind": "dictionary", "name": "sample.1.0.0.yaml"}],
+                  "affected_schemas": [{"configuration": "sample.yaml", "version": "1.0.0.1"}]}
+        mock_graph_class.get_instance.return_value.impact.return_value = impact
+
+        # Act
+        response = self.client.get('/api/dictionaries/test.yaml/dependents/')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, impact)
+        mock_graph_class.get_instance.return_value.impact.assert_called_once_with("dictionary", "test.yaml")
+
     @patch('configurator.routes.dictionary_routes.Dictionary')
     def test_get_dictionary_general_exception(self, mock_dictionary_class):
         """Test GET /api/dictionaries/<file_name> when Dictionary raises a general exception."""
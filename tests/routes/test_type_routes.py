@@ -117,6 +117,22 @@ class TestTypeRoutes(unittest.TestCase):
         response_data = response.json
         self.assertEqual(response_data, {"name": "test_type", "_locked": False, "version": "1.0.0"})
 
+    @patch('configurator.routes.type_routes.DependencyGraph')
+    def test_get_type_dependents_success(self, mock_graph_class):
+        """Test successful GET /api/types/<file_name>/dependents/."""
+        # Arrange
+        impact = {"dependents": [{"kind": "dictionary", "name": "sample.1.0.0.yaml"}],
+                  "affected_schemas": [{"configuration": "sample.yaml", "version": "1.0.0.1"}]}
+        mock_graph_class.get_instance.return_value.impact.return_value = impact
+
+        # Act
+        response = self.client.get('/api/types/test.yaml/dependents/')
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, impact)
+        mock_graph_class.get_instance.return_value.impact.assert_called_once_with("type", "test.yaml")
+
     @patch('configurator.routes.type_routes.Type')
     def test_get_type_general_exception(self, mock_type_class):
         """Test GET /api/types/<file_name> when Type raises a general exception."""
@@ -1,5 +1,4 @@
 import unittest
-from unittest.mock import patch, Mock
 from configurator.services.property.base import BaseProperty
 from configurator.services.enumeration_service import Enumerations
 from configurator.utils.configurator_exception import ConfiguratorException
@@ -62,18 +61,23 @@ class TestBaseProperty(unittest.TestCase):
 
     def test_base_property_to_json_schema(self):
         """Test BaseProperty to_json_schema method"""
-        data = {"name": "test_prop", "type": "string"}
+        data = {"name": "test_prop", "description": "Test description", "type": "string"}
         prop = BaseProperty(data)
         result = prop.to_json_schema(None)
-        self.assertEqual(result["type"], "string")
+        self.assertEqual(result, {"description": "Test description", "type": "string"})
 
     def test_base_property_to_bson_schema(self):
         """Test BaseProperty to_bson_schema method"""
         data = {"name": "test_prop", "type": "string"}
         prop = BaseProperty(data)
         result = prop.to_bson_schema(None)
-        self.assertEqual(result["bsonType"], "string")
+        self.assertEqual(result, {"bsonType": "string"})
 
+    def test_base_property_to_schemas(self):
+        """Test BaseProperty to_schemas returns both renders"""
+        data = {"name": "test_prop", "description": "Test description", "type": "string"}
+        prop = BaseProperty(data)
+        self.assertEqual(prop.to_schemas(None), (prop.to_json_schema(None), prop.to_bson_schema(None)))
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,227 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import yaml
+from unittest.mock import Mock
+from configurator.utils.config import Config
+from configurator.utils.configurator_exception import ConfiguratorException
+from configurator.services.property import Property
+from configurator.services.property.compiled import CompiledProperty, OBJECT, ARRAY, SIMPLE, ENUM
+from configurator.services.dictionary_services import Dictionary
+from configurator.services.enumerators import Enumerators
+from tests.helpers import age_tree, reset_caches
+
+
+class TestCompiledProperty(unittest.TestCase):
+    """Test the CompiledProperty class"""
+
+    def setUp(self):
+        self.data = {
+            "name": "root",
+            "description": "Root",
+            "type": "object",
+            "additional_properties": True,
+            "properties": [
+                {"name": "id", "description": "Id", "type": "simple", "required": True, "schema": {"type": "string", "pattern": "^[0-9a-f]{24}$"}},
+                {"name": "tags", "description": "Tags", "type": "array", "items": {"description": "Tag", "type": "enum", "enums": "tags"}},
+                {"name": "kinds", "description": "Kinds", "type": "enum_array", "required": True, "enums": "kinds"},
+                {"name": "either", "description": "Either", "type": "one_of", "properties": [
+                    {"name": "text", "description": "Text", "type": "simple", "schema": {"type": "string"}},
+                    {"name": "when", "description": "When", "type": "complex", "json_type": {"type": "string", "format": "date-time"}, "bson_type": {"bsonType": "date"}}
+                ]},
+                {"name": "version", "description": "Version", "type": "constant", "constant": "1.0"}
+            ]
+        }
+        self.enumerations = Mock()
+        self.enumerations.get_enum_values.side_effect = lambda name: [f"{name}_a", f"{name}_b"]
+
+    def test_breadth_first_layout(self):
+        """Test nodes are laid out breadth first with consecutive children"""
+        compiled = CompiledProperty.compile(self.data)
+        self.assertEqual(len(compiled), 9)
+        self.assertEqual(compiled.kinds[0], OBJECT)
+        self.assertEqual((compiled.first_child[0], compiled.child_count[0]), (1, 5))
+        self.assertEqual(compiled.kinds[1], SIMPLE)
+        self.assertEqual(compiled.kinds[2], ARRAY)
+        self.assertEqual(compiled.kinds[compiled.first_child[2]], ENUM)
+        self.assertEqual(compiled.strings[compiled.names[compiled.first_child[2]]], "items")
+
+    def test_strings_are_interned(self):
+        """Test repeated strings are stored once"""
+        compiled = CompiledProperty.compile(self.data)
+        self.assertEqual(compiled.types[1], compiled.types[7])
+        self.assertEqual(len(compiled.strings), len(set(map(repr, compiled.strings))))
+
+    def test_renders(self):
+        """Test the emitters render every kind of property"""
+        compiled = CompiledProperty.compile(self.data)
+        json_schema = compiled.to_json_schema(self.enumerations)
+        self.assertEqual(json_schema, {
+            "description": "Root", "type": "object", "additionalProperties": True,
+            "properties": {
+                "id": {"description": "Id", "type": "string", "pattern": "^[0-9a-f]{24}$"},
+                "tags": {"description": "Tags", "type": "array", "items": {"description": "Tag", "type": "string", "enum": ["tags_a", "tags_b"]}},
+                "kinds": {"description": "Kinds", "type": "array", "items": {"type": "string", "enum": ["kinds_a", "kinds_b"]}},
+                "either": {"description": "Either", "oneOf": [
+                    {"description": "Text", "type": "string"},
+                    {"description": "When", "type": "string", "format": "date-time"},
+                ]},
+                "version": {"description": "Version", "type": "string", "const": "1.0"},
+            },
+            "required": ["id", "kinds"],
+        })
+        bson_schema = compiled.to_bson_schema(self.enumerations)
+        self.assertEqual(bson_schema, {
+            "bsonType": "object", "additionalProperties": True,
+            "properties": {
+                "id": {"bsonType": "string", "pattern": "^[0-9a-f]{24}$"},
+                "tags": {"bsonType": "array", "items": {"bsonType": "string", "enum": ["tags_a", "tags_b"]}},
+                "kinds": {"bsonType": "array", "items": {"bsonType": "string", "enum": ["kinds_a", "kinds_b"]}},
+                "either": {"oneOf": [{"bsonType": "string"}, {"bsonType": "date"}]},
+                "version": {"bsonType": "string", "enum": ["1.0"]},
+            },
+            "required": ["id", "kinds"],
+        })
+        self.assertEqual(compiled.to_schemas(self.enumerations), (json_schema, bson_schema))
+
+    def test_property_renders_through_compiled(self):
+        """Test the Property classes render as their compiled tree"""
+        prop = Property(self.data)
+        compiled = CompiledProperty.compile(self.data)
+        self.assertEqual(prop.to_json_schema(self.enumerations), compiled.to_json_schema(self.enumerations))
+        self.assertEqual(prop.to_schemas(self.enumerations), compiled.to_schemas(self.enumerations))
+
+    def test_own_size_counts_required(self):
+        """Test the size of an object includes its required list"""
+        compiled = CompiledProperty.compile(self.data)
+        for property in self.data["properties"]:
+            property["required"] = False
+        optional = CompiledProperty.compile(self.data)
+        rendered = len(json.dumps(compiled.to_json_schema(self.enumerations))) - len(json.dumps(optional.to_json_schema(self.enumerations)))
+        estimated = compiled._own_size()[1] - optional._own_size()[1]
+        self.assertGreater(estimated, 0)
+        self.assertAlmostEqual(estimated, rendered, delta=4)
+
+    def test_missing_name(self):
+        """Test a nested property without a name raises the Property error"""
+        self.data["properties"].append({"type": "simple", "schema": {"type": "string"}})
+        with self.assertRaises(ConfiguratorException) as context:
+            CompiledProperty.compile(self.data)
+        self.assertEqual(context.exception.event.id, "TYP-01")
+
+
+class TestCompiledReferences(unittest.TestCase):
+    """Test refs and custom types in compiled dictionaries"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_complex_refs", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def test_dictionary_renders_verified_output(self):
+        """Test a dictionary with refs and custom types renders its verified schemas"""
+        enumerations = Enumerators().get_version("workshop.1.0.0.0")
+        dictionary = Dictionary("workshop.1.0.0.yaml")
+        verified = os.path.join(self.temp_dir, "verified_output")
+        with open(os.path.join(verified, "json_schema", "workshop.1.0.0.0.yaml")) as f:
+            self.assertEqual(dictionary.to_json_schema(enumerations), yaml.safe_load(f))
+        with open(os.path.join(verified, "bson_schema", "workshop.1.0.0.0.json")) as f:
+            self.assertEqual(dictionary.to_bson_schema(enumerations), json.load(f))
+        self.assertEqual(dictionary.root.to_json_schema(enumerations), dictionary.to_json_schema(enumerations))
+
+    def test_missing_ref(self):
+        """Test a missing ref raises the RefType error"""
+        dictionary = Dictionary("missing.1.0.0.yaml", {"root": {"name": "root", "type": "object", "properties": [
+            {"name": "gone", "type": "ref", "ref": "does_not_exist.1.0.0"}
+        ]}})
+        with self.assertRaises(ConfiguratorException) as context:
+            dictionary.to_json_schema(Mock())
+        self.assertEqual(context.exception.event.id, "REF-01")
+        self.assertIn("'gone'", context.exception.event.data["error"])
+
+
+
+class TestCompiledRenderStack(unittest.TestCase):
+    """Test cycle detection and RENDER_STACK_MAX_DEPTH in compiled renders"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for folder in ["dictionaries", "types"]:
+            os.makedirs(os.path.join(self.temp_dir, folder))
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self._original_max_depth = self.config.RENDER_STACK_MAX_DEPTH
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        self.config.RENDER_STACK_MAX_DEPTH = self._original_max_depth
+        reset_caches()
+
+    def _write(self, folder, file_name, root):
+        with open(os.path.join(self.temp_dir, folder, file_name), 'w') as f:
+            yaml.dump({"root": root}, f)
+
+    def _chain(self, length):
+        """Dictionaries link_0 .. link_{length-1}, each referencing the next."""
+        for link in range(length):
+            properties = [{"name": "value", "type": "simple", "schema": {"type": "string"}}]
+            if link < length - 1:
+                properties.append({"name": "next", "type": "ref", "ref": f"link_{link + 1}.1.0.0"})
+            self._write("dictionaries", f"link_{link}.1.0.0.yaml", {"name": "root", "type": "object", "properties": properties})
+
+    def test_cycle_reports_the_path(self):
+        """Test a cycle through a dictionary and a custom type fails with the files in the cycle"""
+        self._write("dictionaries", "a.1.0.0.yaml", {"name": "root", "type": "object", "properties": [
+            {"name": "b", "type": "ref", "ref": "b.1.0.0"}]})
+        self._write("dictionaries", "b.1.0.0.yaml", {"name": "root", "type": "object", "properties": [
+            {"name": "looped", "type": "loop"}]})
+        self._write("types", "loop.yaml", {"name": "loop", "type": "object", "properties": [
+            {"name": "back", "type": "ref", "ref": "a.1.0.0"}]})
+        with self.assertRaises(ConfiguratorException) as context:
+            Dictionary("a.1.0.0.yaml").to_schemas(Mock())
+        event = context.exception.event
+        self.assertEqual(event.id, "REF-04")
+        self.assertEqual(event.data["path"], ["dictionaries/a.1.0.0.yaml", "dictionaries/b.1.0.0.yaml", "types/loop.yaml", "dictionaries/a.1.0.0.yaml"])
+        self.assertEqual(event.data["property_name"], "back")
+
+    def test_depth_limit(self):
+        """Test a chain of refs deeper than RENDER_STACK_MAX_DEPTH fails"""
+        self._chain(5)
+        self.config.RENDER_STACK_MAX_DEPTH = 4
+        with self.assertRaises(ConfiguratorException) as context:
+            Dictionary("link_0.1.0.0.yaml").to_json_schema(Mock())
+        self.assertEqual(context.exception.event.id, "REF-05")
+        self.assertEqual(len(context.exception.event.data["path"]), 5)
+        self.config.RENDER_STACK_MAX_DEPTH = 5
+        self.assertIn("next", Dictionary("link_0.1.0.0.yaml").to_json_schema(Mock())["properties"])
+
+    def test_deep_chain_does_not_recurse(self):
+        """Test a legal chain of refs deeper than the Python recursion limit renders"""
+        length = 1200
+        self._chain(length)
+        self.config.RENDER_STACK_MAX_DEPTH = 0
+        schema = Dictionary("link_0.1.0.0.yaml").to_bson_schema(Mock())
+        depth = 1
+        while "next" in schema["properties"]:
+            schema = schema["properties"]["next"]
+            depth += 1
+        self.assertEqual(depth, length)
+
+if __name__ == '__main__':
+    unittest.main()
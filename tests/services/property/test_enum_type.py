@@ -83,6 +83,25 @@ class TestEnumType(unittest.TestCase):
             self.assertEqual(result["bsonType"], "string")
             self.assertEqual(result["enum"], ["value1", "value2"])
 
+    def test_enum_type_to_schemas(self):
+        """Test EnumType to_schemas looks the values up once for both schemas"""
+        data = {
+            "name": "test_prop",
+            "description": "Test description",
+            "type": "enum",
+            "required": True,
+            "enums": "test_enum"
+        }
+        prop = EnumType(data)
+        mock_enum = Mock()
+        mock_enum.get_enum_values.return_value = ["value1", "value2"]
+
+        json_schema, bson_schema = prop.to_schemas(mock_enum)
+
+        self.assertEqual(json_schema, prop.to_json_schema(mock_enum))
+        self.assertEqual(bson_schema, prop.to_bson_schema(mock_enum))
+        self.assertIsNot(json_schema["enum"], bson_schema["enum"])
+        self.assertEqual(mock_enum.get_enum_values.call_count, 3)
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
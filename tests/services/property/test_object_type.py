@@ -47,6 +47,29 @@ class TestObjectType(unittest.TestCase):
         self.assertTrue(result["required"])
         self.assertEqual(len(result["properties"]), 2)
 
+    def test_object_type_to_schemas(self):
+        """Test ObjectType to_schemas matches to_json_schema and to_bson_schema"""
+        data = {
+            "name": "test_prop",
+            "description": "Test description",
+            "type": "object",
+            "required": True,
+            "properties": [
+                {"name": "prop1", "description": "First", "type": "simple", "required": True, "schema": {"type": "string", "maxLength": 10}},
+                {"name": "prop2", "description": "Second", "type": "array", "items": {"description": "Item", "type": "constant", "constant": "x"}},
+                {"name": "prop3", "description": "Third", "type": "one_of", "properties": [
+                    {"name": "a", "description": "A", "type": "complex", "json_type": {"type": "string"}, "bson_type": {"bsonType": "string"}}
+                ]}
+            ]
+        }
+        prop = ObjectType(data)
+        enumerations = Mock()
+
+        json_schema, bson_schema = prop.to_schemas(enumerations)
+
+        self.assertEqual(json_schema, prop.to_json_schema(enumerations))
+        self.assertEqual(bson_schema, prop.to_bson_schema(enumerations))
+        self.assertIsNot(json_schema["required"], bson_schema["required"])
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -1,6 +1,9 @@
+import glob
 import unittest
+import yaml
 from unittest.mock import patch, Mock
 from configurator.services.property import Property
+from configurator.services.property.property import property_to_dict
 from configurator.services.property.array_type import ArrayType
 from configurator.services.property.complex_type import ComplexType
 from configurator.services.property.constant_type import ConstantType
@@ -84,6 +87,54 @@ class TestPropertyFactory(unittest.TestCase):
             Property(data)
         self.assertIn("Missing required name", str(context.exception))
 
+    def test_property_classes_are_slotted(self):
+        """Test properties of every type are built without an instance __dict__"""
+        for data in [
+            {"name": "test", "type": "array", "items": {"type": "word"}},
+            {"name": "test", "type": "complex"},
+            {"name": "test", "type": "constant", "constant": "value"},
+            {"name": "test", "type": "enum_array", "enums": "test_enum"},
+            {"name": "test", "type": "enum", "enums": "test_enum"},
+            {"name": "test", "type": "object", "properties": []},
+            {"name": "test", "type": "one_of", "properties": []},
+            {"name": "test", "type": "ref", "ref": "test.1.0.0"},
+            {"name": "test", "type": "simple", "schema": {"type": "string"}},
+            {"name": "test", "type": "word"},
+        ]:
+            with self.subTest(type=data["type"]):
+                self.assertFalse(hasattr(Property(data), "__dict__"))
+
+    def test_children_are_parsed_on_first_access(self):
+        """Test object, one_of and array children are built when they are first used"""
+        data = {"name": "test", "type": "object", "properties": [
+            {"name": "list", "type": "array", "items": {"type": "word"}},
+            {"name": "either", "type": "one_of", "properties": [{"name": "text", "type": "word"}]},
+        ]}
+        prop = Property(data)
+        self.assertIsNone(prop._properties)
+        self.assertEqual(prop.to_dict(), property_to_dict(data))
+        self.assertIsNone(prop._properties)
+        array, one_of = prop.properties
+        self.assertIsNone(array._items)
+        self.assertIsNone(one_of._properties)
+        self.assertEqual(array.items.name, "items")
+        self.assertIsInstance(one_of.properties[0], CustomType)
+        self.assertEqual(prop.to_dict(), property_to_dict(data))
+
+    def test_property_to_dict_matches_parsed_to_dict(self):
+        """Test property_to_dict of every test case dictionary and type matches the parsed to_dict"""
+        def parse_all(prop):
+            for child in getattr(prop, "properties", []) if hasattr(prop, "_properties") else []:
+                parse_all(child)
+            if hasattr(prop, "_items"):
+                parse_all(prop.items)
+            return prop
+        for path in glob.glob("./tests/test_cases/passing_*/dictionaries/*.yaml") + glob.glob("./tests/test_cases/passing_*/types/*.yaml"):
+            with open(path) as f:
+                root = yaml.safe_load(f)["root"]
+            root = {**root, "name": root.get("name", "root")}
+            with self.subTest(path=path):
+                self.assertEqual(property_to_dict(root), parse_all(Property(root)).to_dict())
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
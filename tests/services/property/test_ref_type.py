@@ -87,13 +87,12 @@ class TestRefType(unittest.TestCase):
         filename = prop._get_dictionary_filename()
         self.assertEqual(filename, "observation_persona.1.0.0.yaml")
 
-    @patch('configurator.services.property.ref_type.Dictionary')
-    def test_to_json_schema_appends_yaml_extension(self, mock_dictionary_class):
+    @patch('configurator.services.property.compiled.ServiceRegistry')
+    def test_to_json_schema_appends_yaml_extension(self, mock_registry_class):
         """Test that to_json_schema appends .yaml when ref doesn't have extension"""
-        # Setup mock
-        mock_dictionary = MagicMock()
-        mock_dictionary.to_json_schema.return_value = {"type": "object"}
-        mock_dictionary_class.return_value = mock_dictionary
+        # Setup mock registry serving the referenced dictionary
+        mock_registry = mock_registry_class.get_instance.return_value
+        mock_registry.get.return_value = Dictionary("Circle.yaml", {"root": {"name": "root", "type": "simple", "schema": {"type": "object"}}})
         
         # Create RefType with ref without extension
         data = {
@@ -107,17 +106,16 @@ class TestRefType(unittest.TestCase):
         # Call to_json_schema
         result = prop.to_json_schema(enumerations)
         
-        # Verify Dictionary was called with "Circle.yaml"
-        mock_dictionary_class.assert_called_once_with("Circle.yaml")
-        self.assertEqual(result, {"type": "object"})
+        # Verify the dictionary was loaded as "Circle.yaml"
+        mock_registry.get.assert_called_once_with(Dictionary, "Circle.yaml")
+        self.assertEqual(result, {"description": "", "type": "object"})
 
-    @patch('configurator.services.property.ref_type.Dictionary')
-    def test_to_json_schema_preserves_yaml_extension(self, mock_dictionary_class):
+    @patch('configurator.services.property.compiled.ServiceRegistry')
+    def test_to_json_schema_preserves_yaml_extension(self, mock_registry_class):
         """Test that to_json_schema preserves .yaml extension when present"""
-        # Setup mock
-        mock_dictionary = MagicMock()
-        mock_dictionary.to_json_schema.return_value = {"type": "object"}
-        mock_dictionary_class.return_value = mock_dictionary
+        # Setup mock registry serving the referenced dictionary
+        mock_registry = mock_registry_class.get_instance.return_value
+        mock_registry.get.return_value = Dictionary("Circle.yaml", {"root": {"name": "root", "type": "simple", "schema": {"type": "object"}}})
         
         # Create RefType with ref with extension
         data = {
@@ -131,18 +129,19 @@ class TestRefType(unittest.TestCase):
         # Call to_json_schema
         result = prop.to_json_schema(enumerations)
         
-        # Verify Dictionary was called with "Circle.yaml" (no change)
-        mock_dictionary_class.assert_called_once_with("Circle.yaml")
-        self.assertEqual(result, {"type": "object"})
+        # Verify the dictionary was loaded as "Circle.yaml"
+        mock_registry.get.assert_called_once_with(Dictionary, "Circle.yaml")
+        self.assertEqual(result, {"description": "", "type": "object"})
 
-    @patch('configurator.services.property.ref_type.Dictionary')
-    def test_to_json_schema_error_handling(self, mock_dictionary_class):
+    @patch('configurator.services.property.compiled.ServiceRegistry')
+    def test_to_json_schema_error_handling(self, mock_registry_class):
         """Test that to_json_schema properly wraps ConfiguratorException"""
-        # Setup mock to raise ConfiguratorException
+        # Setup mock registry to raise ConfiguratorException
         from configurator.utils.configurator_exception import ConfiguratorEvent
         error_event = ConfiguratorEvent("DIC-01", "GET_DICTIONARY")
         error_event.record_failure("Dictionary not found")
-        mock_dictionary_class.side_effect = ConfiguratorException("Dictionary not found", error_event)
+        mock_registry = mock_registry_class.get_instance.return_value
+        mock_registry.get.side_effect = ConfiguratorException("Dictionary not found", error_event)
         
         # Create RefType
         data = {
@@ -157,7 +156,8 @@ class TestRefType(unittest.TestCase):
         with self.assertRaises(ConfiguratorException) as context:
             prop.to_json_schema(enumerations)
         
-        # Verify the exception has meaningful context
+        # Verify the dictionary was looked up and the exception has meaningful context
+        mock_registry.get.assert_called_once_with(Dictionary, "Missing.yaml")
         self.assertIn("test_prop", str(context.exception))
         self.assertIn("Missing", str(context.exception))
         # Verify the error event contains sub-events
@@ -1,8 +1,11 @@
+import shutil
+import tempfile
 import unittest
 from unittest.mock import Mock, patch
 from configurator.services.configuration_services import Configuration
 from configurator.utils.configurator_exception import ConfiguratorException, ConfiguratorEvent
 from configurator.utils.config import Config
+from configurator.utils.summary_index import SummaryIndex
 
 
 class TestConfiguration(unittest.TestCase):
@@ -198,6 +201,7 @@ class TestConfiguration(unittest.TestCase):
             with patch('configurator.services.configuration_version.Dictionary') as mock_dictionary:
                 mock_dictionary_instance = Mock()
                 mock_dictionary_instance.to_json_schema.return_value = {"schema": "json"}
+                mock_dictionary_instance.estimate.return_value = {"nodes": 1, "bytes": 100, "files": []}
                 mock_dictionary.return_value = mock_dictionary_instance
                 
                 config = Configuration(self.test_file_name, self.test_document)
@@ -253,6 +257,7 @@ class TestConfiguration(unittest.TestCase):
             with patch('configurator.services.configuration_version.Dictionary') as mock_dictionary:
                 mock_dictionary_instance = Mock()
                 mock_dictionary_instance.to_bson_schema.return_value = {"schema": "bson"}
+                mock_dictionary_instance.estimate.return_value = {"nodes": 1, "bytes": 100, "files": []}
                 mock_dictionary.return_value = mock_dictionary_instance
                 
                 config = Configuration(self.test_file_name, self.test_document)
@@ -322,13 +327,24 @@ class TestVersion(unittest.TestCase):
 class TestGetCollectionsSummary(unittest.TestCase):
     """Test cases for Configuration.get_collections_summary."""
 
+    def setUp(self):
+        self.config = Config.get_instance()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = tempfile.mkdtemp()
+        SummaryIndex._instance = None
+
+    def tearDown(self):
+        shutil.rmtree(self.config.INPUT_FOLDER, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        SummaryIndex._instance = None
+
     @patch('configurator.services.service_base.FileIO')
     @patch('configurator.services.configuration_services.FileIO')
     def test_get_collections_summary_returns_summaries(self, mock_file_io_cfg, mock_file_io_base):
         """Test get_collections_summary returns correct structure."""
-        mock_file = Mock()
-        mock_file.file_name = "sample.yaml"
+        mock_file = Mock(file_name="sample.yaml", size=10, _updated=1000.0)
         mock_file_io_cfg.get_documents.return_value = [mock_file]
+        mock_file_io_base.get_content.return_value = b"sample"
 
         config_doc = {
             "title": "Sample",
@@ -349,6 +365,54 @@ class TestGetCollectionsSummary(unittest.TestCase):
         self.assertEqual(result[0]["latest_version"], "1.0.0.0")
         self.assertFalse(result[0]["_locked"])
 
+    @patch('configurator.services.service_base.FileIO')
+    @patch('configurator.services.configuration_services.FileIO')
+    def test_get_collections_summary_skips_bad_files(self, mock_file_io_cfg, mock_file_io_base):
+        """Test the latest version is summarized, results keep file order and bad files are skipped."""
+        files = []
+        for name in ["users.yaml", "empty.yaml", "orders.yaml"]:
+            files.append(Mock(file_name=name, size=10, _updated=1000.0))
+        mock_file_io_cfg.get_documents.return_value = files
+        mock_file_io_base.get_content.side_effect = lambda folder_name, file_name: file_name.encode()
+
+        documents = {
+            "users.yaml": {"versions": [
+                {"version": "1.0.10.2", "_locked": True},
+                {"version": "1.0.9.5", "_locked": False},
+            ]},
+            "empty.yaml": {"versions": []},
+            "orders.yaml": {"description": "Orders", "versions": [{"version": "2.0.0"}]},
+        }
+        mock_file_io_base.get_document.side_effect = lambda folder_name, file_name: documents[file_name]
+
+        result = Configuration.get_collections_summary()
+
+        self.assertEqual([item["collection_name"] for item in result], ["users", "orders"])
+        self.assertEqual(result[0]["latest_version"], "1.0.10.2")
+        self.assertEqual(result[0]["latest_dictionary_file"], "users.1.0.10.yaml")
+        self.assertTrue(result[0]["_locked"])
+        self.assertEqual(result[1]["latest_version"], "2.0.0.0")
+        self.assertEqual(result[1]["description"], "Orders")
+
+    @patch('configurator.services.service_base.FileIO')
+    @patch('configurator.services.configuration_services.FileIO')
+    def test_get_collections_summary_uses_index(self, mock_file_io_cfg, mock_file_io_base):
+        """Test unchanged files are served from the index and touched files are not parsed."""
+        mock_file = Mock(file_name="sample.yaml", size=10, _updated=1000.0)
+        mock_file_io_cfg.get_documents.return_value = [mock_file]
+        mock_file_io_base.get_content.return_value = b"sample"
+        mock_file_io_base.get_document.return_value = {"versions": [{"version": "1.0.0"}]}
+
+        first = Configuration.get_collections_summary()
+        SummaryIndex.get_instance().clear()
+        self.assertEqual(Configuration.get_collections_summary(), first)
+        self.assertEqual(mock_file_io_base.get_content.call_count, 1)
+
+        mock_file._updated = 2000.0
+        self.assertEqual(Configuration.get_collections_summary(), first)
+        self.assertEqual(mock_file_io_base.get_content.call_count, 2)
+        self.assertEqual(mock_file_io_base.get_document.call_count, 1)
+
 
 class TestConfigurationLockAll(unittest.TestCase):
     """Test cases for Configuration.lock_all method."""
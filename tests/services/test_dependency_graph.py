@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.file_io import FileIO
+from configurator.utils.document_cache import FolderCache
+from configurator.services.dependency_graph import (
+    DependencyGraph, property_dependencies, CONFIGURATION, DICTIONARY, TYPE, ENUMERATOR
+)
+from configurator.utils.schema_cache import SchemaCache
+from configurator.services.configuration_services import Configuration
+from configurator.services.type_services import Type
+from tests.helpers import age, age_tree, reset_caches
+
+
+class TestPropertyDependencies(unittest.TestCase):
+    """Test cases for property_dependencies"""
+
+    def test_nested_dependencies(self):
+        """Test refs, custom types and enumerators are found at any depth"""
+        root = {"name": "root", "type": "object", "properties": [
+            {"name": "status", "type": "enum", "enums": "status"},
+            {"name": "tags", "type": "enum_array", "enums": "tags"},
+            {"name": "items", "type": "array", "items": {"type": "ref", "ref": "item.1.0.0"}},
+            {"name": "either", "type": "one_of", "properties": [{"name": "a", "type": "word"}]},
+            {"name": "text", "type": "simple", "schema": {"type": "string"}},
+        ]}
+        self.assertEqual(property_dependencies(root), {
+            (ENUMERATOR, "status"),
+            (ENUMERATOR, "tags"),
+            (DICTIONARY, "item.1.0.0.yaml"),
+            (TYPE, "word.yaml"),
+        })
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """Test cases for DependencyGraph"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_complex_refs", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+        self.graph = DependencyGraph.get_instance()
+        self.graph.refresh()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def test_forward_edges(self):
+        """Test the direct and transitive dependencies of a configuration"""
+        self.assertEqual(self.graph.dependencies(CONFIGURATION, "workshop.yaml"), {(DICTIONARY, "workshop.1.0.0.yaml")})
+        transitive = self.graph.dependencies(CONFIGURATION, "workshop.yaml", transitive=True)
+        self.assertIn((DICTIONARY, "observation_hills.1.0.0.yaml"), transitive)
+        self.assertIn((TYPE, "sentence.yaml"), transitive)
+        self.assertIn((ENUMERATOR, "workshop_status"), transitive)
+
+    def test_reverse_edges(self):
+        """Test the dictionaries using a type and the schemas to render again"""
+        dependents = self.graph.dependents(TYPE, "count.yaml")
+        self.assertEqual(dependents, {(DICTIONARY, "observation_persona.1.0.0.yaml")})
+        self.assertIn((DICTIONARY, "workshop.1.0.0.yaml"), self.graph.dependents(TYPE, "count.yaml", transitive=True))
+        self.assertEqual(self.graph.affected_schemas(TYPE, "count.yaml"), [("workshop.yaml", "1.0.0.0")])
+        self.assertEqual(self.graph.affected_schemas(TYPE, "us_phone.yaml"), [])
+
+    def test_save_and_delete_update_the_graph(self):
+        """Test saving and deleting a type through the service updates its edges"""
+        document = {"root": {"name": "tagged", "type": "object", "properties": [
+            {"name": "tag", "type": "word"},
+            {"name": "status", "type": "enum", "enums": "workshop_status"},
+        ]}}
+        Type("tagged.yaml", document).save()
+        self.assertEqual(self.graph.dependencies(TYPE, "tagged.yaml"), {(TYPE, "word.yaml"), (ENUMERATOR, "workshop_status")})
+        self.assertIn((TYPE, "tagged.yaml"), self.graph.dependents(ENUMERATOR, "workshop_status"))
+
+        Type("tagged.yaml").delete()
+        self.assertEqual(self.graph.dependencies(TYPE, "tagged.yaml"), set())
+        self.assertNotIn((TYPE, "tagged.yaml"), self.graph.dependents(TYPE, "word.yaml"))
+
+    def test_outside_edits_are_picked_up(self):
+        """Test a file edited outside of the API is read again on the next refresh"""
+        self.graph.dependencies(DICTIONARY, "observation_persona.1.0.0.yaml")
+        file_path = os.path.join(self.temp_dir, "dictionaries", "observation_persona.1.0.0.yaml")
+        with open(file_path) as f:
+            content = f.read()
+        with open(file_path, 'w') as f:
+            f.write(content.replace("type: count", "type: sentence"))
+        age(file_path, 5)
+        FolderCache.get_instance().clear()
+        self.assertIn((TYPE, "count.yaml"), self.graph.dependencies(DICTIONARY, "observation_persona.1.0.0.yaml"))
+        self.assertEqual(self.graph.impact(TYPE, "count.yaml"), {"dependents": [], "affected_schemas": []})
+        self.assertNotIn((TYPE, "count.yaml"), self.graph.dependencies(DICTIONARY, "observation_persona.1.0.0.yaml"))
+
+    def test_impact(self):
+        """Test impact lists the transitive dependents and affected schemas of a node"""
+        impact = self.graph.impact(TYPE, "count.yaml")
+        self.assertIn({"kind": DICTIONARY, "name": "observation_persona.1.0.0.yaml"}, impact["dependents"])
+        self.assertIn({"kind": DICTIONARY, "name": "workshop.1.0.0.yaml"}, impact["dependents"])
+        self.assertEqual(impact["affected_schemas"], [{"configuration": "workshop.yaml", "version": "1.0.0.0"}])
+
+    def test_schema_entries(self):
+        """Test the schemas and skeletons rendered from a type, enumerations or configuration file"""
+        self.assertEqual(self.graph.schema_entries("types", "count.yaml"), {
+            ("dictionaries", "observation_persona.1.0.0.yaml", None),
+            ("dictionaries", "workshop.1.0.0.yaml", None),
+            ("configurations", "workshop.yaml", "1.0.0.0"),
+        })
+        self.assertEqual(self.graph.schema_entries("enumerators", "enumerations.0.yaml"), {("configurations", "workshop.yaml", "1.0.0.0")})
+        self.assertEqual(self.graph.schema_entries("configurations", "workshop.yaml"), {("configurations", "workshop.yaml", "1.0.0.0")})
+        self.assertEqual(self.graph.schema_entries("test_data", "workshop.1.0.0.0.json"), set())
+
+    def test_write_invalidates_schema_cache(self):
+        """Test saving a type drops the cached schema of the configuration that uses it"""
+        Configuration("workshop.yaml").get_json_schema("1.0.0.0")
+        self.assertEqual(SchemaCache.get_instance().to_dict()["size"], 1)
+        count = Type("count.yaml")
+        count.root.description = "Edited"
+        count.save()
+        self.assertEqual(SchemaCache.get_instance().to_dict()["size"], 0)
+
+    def test_queries_do_not_refresh(self):
+        """Test the queries answer from memory, only refresh and impact read the folders"""
+        with patch.object(FileIO, 'get_documents') as mock_get_documents:
+            self.graph.dependencies(CONFIGURATION, "workshop.yaml", transitive=True)
+            self.graph.dependents(TYPE, "count.yaml", transitive=True)
+            self.graph.affected_schemas(TYPE, "count.yaml")
+            mock_get_documents.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -39,6 +39,9 @@ class TestDictionary(unittest.TestCase):
         self.assertEqual(dictionary.file_name, self.test_file_name)
         self.assertFalse(dictionary._locked)
         mock_file_io.get_document.assert_called_once()
+        mock_property.assert_not_called()  # The root is built on first use
+        self.assertIs(dictionary.root, mock_property_instance)
+        self.assertIs(dictionary.root, dictionary.root)
         mock_property.assert_called_once_with(self.test_document.get("root", {}))
 
     @patch('configurator.services.dictionary_services.Property')
@@ -54,6 +57,9 @@ class TestDictionary(unittest.TestCase):
         # Assert
         self.assertEqual(dictionary.file_name, self.test_file_name)
         self.assertFalse(dictionary._locked)
+        mock_property.assert_not_called()  # The root is built on first use
+        self.assertIs(dictionary.root, mock_property_instance)
+        self.assertIs(dictionary.root, dictionary.root)
         mock_property.assert_called_once_with(self.test_document.get("root", {}))
 
     def test_init_without_file_name(self):
@@ -108,41 +114,31 @@ class TestDictionary(unittest.TestCase):
         }
         self.assertEqual(result, expected)
 
-    @patch('configurator.services.dictionary_services.Property')
-    def test_to_json_schema(self, mock_property):
-        """Test Dictionary to_json_schema method"""
+    def test_to_json_schema(self):
+        """Test Dictionary to_json_schema renders the compiled root property"""
         # Arrange
-        mock_property_instance = Mock()
-        mock_property_instance.to_json_schema.return_value = {"type": "object"}
-        mock_property.return_value = mock_property_instance
-        
         dictionary = Dictionary(self.test_file_name, self.test_document)
         mock_enumerations = Mock()
-        
+
         # Act
         result = dictionary.to_json_schema(mock_enumerations)
-        
+
         # Assert
-        self.assertEqual(result, {"type": "object"})
-        mock_property_instance.to_json_schema.assert_called_once_with(mock_enumerations, [])
+        self.assertEqual(result, {"description": "Test dictionary", "type": "object", "additionalProperties": False, "properties": {}})
+        self.assertEqual(result, dictionary.root.to_json_schema(mock_enumerations))
 
-    @patch('configurator.services.dictionary_services.Property')
-    def test_to_bson_schema(self, mock_property):
-        """Test Dictionary to_bson_schema method"""
+    def test_to_bson_schema(self):
+        """Test Dictionary to_bson_schema renders the compiled root property"""
         # Arrange
-        mock_property_instance = Mock()
-        mock_property_instance.to_bson_schema.return_value = {"bsonType": "object"}
-        mock_property.return_value = mock_property_instance
-        
         dictionary = Dictionary(self.test_file_name, self.test_document)
         mock_enumerations = Mock()
-        
+
         # Act
         result = dictionary.to_bson_schema(mock_enumerations)
-        
+
         # Assert
-        self.assertEqual(result, {"bsonType": "object"})
-        mock_property_instance.to_bson_schema.assert_called_once_with(mock_enumerations, [])
+        self.assertEqual(result, {"bsonType": "object", "additionalProperties": False, "properties": {}})
+        self.assertEqual(result, dictionary.root.to_bson_schema(mock_enumerations))
 
     @patch('configurator.services.service_base.FileIO')
     @patch('configurator.services.dictionary_services.Property')
@@ -173,6 +173,49 @@ class TestEnumerations(unittest.TestCase):
             with self.assertRaises(ConfiguratorException):
                 enum.get_enum_values("nonexistent")
 
+    def test_get_enum_values_uses_index(self):
+        """Test get_enum_values returns the same sorted tuple on every call."""
+        # Arrange
+        test_data = {
+            "version": 0,
+            "enumerators": [
+                {"name": "test_enum", "values": [{"value": "b"}, {"value": "a"}, {"value": "b"}]},
+                {"name": "test_enum", "values": [{"value": "ignored"}]}
+            ]
+        }
+
+        with patch('configurator.utils.file_io.FileIO.get_document') as mock_get_document:
+            mock_get_document.return_value = test_data
+
+            # Act
+            enum = Enumerations("test.yaml")
+            result = enum.get_enum_values("test_enum")
+
+            # Assert
+            self.assertEqual(result, ("a", "b"))
+            self.assertIs(enum.get_enum_values("test_enum"), result)
+
+    def test_get_enum_values_suggests_close_matches(self):
+        """Test the not found error names close matches."""
+        # Arrange
+        test_data = {
+            "version": 0,
+            "enumerators": [
+                {"name": "status", "values": [{"value": "active"}]},
+                {"name": "priority", "values": [{"value": "high"}]}
+            ]
+        }
+
+        with patch('configurator.utils.file_io.FileIO.get_document') as mock_get_document:
+            mock_get_document.return_value = test_data
+
+            # Act & Assert
+            enum = Enumerations("test.yaml")
+            with self.assertRaises(ConfiguratorException) as context:
+                enum.get_enum_values("statuss")
+            self.assertEqual(context.exception.event.id, "ENU-02")
+            self.assertIn("did you mean status?", str(context.exception))
+
     def test_to_dict(self):
         """Test to_dict method."""
         # Arrange
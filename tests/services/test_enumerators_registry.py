@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.file_io import FileIO
+from configurator.utils.schema_cache import DependencyRecorder
+from configurator.services.enumerators import Enumerators
+from tests.helpers import age, age_tree, reset_caches
+
+
+class TestEnumeratorsRegistry(unittest.TestCase):
+    """Test cases for the process wide Enumerators registry"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_complex_refs", self.temp_dir, dirs_exist_ok=True)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        self.folder = os.path.join(self.temp_dir, self.config.ENUMERATOR_FOLDER)
+        self._age()
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def _age(self, seconds=10):
+        age_tree(self.folder, seconds)
+        age(self.folder, seconds)
+
+    def test_enumerations_are_loaded_once(self):
+        """Test a second Enumerators shares the loaded enumerations without reading files"""
+        first = Enumerators()
+        with patch('configurator.services.enumerators.FileIO.get_documents') as mock_get_documents:
+            second = Enumerators()
+            mock_get_documents.assert_not_called()
+        self.assertIs(second.get_version("workshop.1.0.0.0"), first.get_version("workshop.1.0.0.0"))
+        self.assertEqual([e.file_name for e in second.enumerations], [e.file_name for e in first.enumerations])
+
+    def test_hits_are_recorded_as_dependencies(self):
+        """Test a registry hit reports the enumerator files to the active recorders"""
+        Enumerators()
+        with DependencyRecorder() as dependencies:
+            Enumerators()
+        self.assertEqual({folder for folder, _ in dependencies}, {self.folder})
+        self.assertEqual(len(dependencies), len(os.listdir(self.folder)))
+
+    def test_changed_file_is_reloaded(self):
+        """Test an enumerator file changed in place is picked up"""
+        enumerations = Enumerators().get_version("workshop.1.0.0.0")
+        file_path = os.path.join(self.folder, enumerations.file_name)
+        with open(file_path) as f:
+            content = f.read()
+        with open(file_path, 'w') as f:
+            f.write(content + "\n# changed\n")
+        self._age(5)
+        self.assertIsNot(Enumerators().get_version("workshop.1.0.0.0"), enumerations)
+
+    def test_write_through_file_io_is_reloaded(self):
+        """Test an enumerator file written through FileIO is picked up"""
+        enumerations = Enumerators().get_version("workshop.1.0.0.0")
+        document = FileIO.get_document(self.config.ENUMERATOR_FOLDER, enumerations.file_name)
+        document["enumerators"][0]["values"].append({"value": "registry_value", "description": "Added"})
+        FileIO.put_document(self.config.ENUMERATOR_FOLDER, enumerations.file_name, document)
+        reloaded = Enumerators().get_version("workshop.1.0.0.0")
+        self.assertIn("registry_value", reloaded.get_enum_values(document["enumerators"][0]["name"]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,154 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import yaml
+from unittest.mock import Mock, patch
+from configurator.utils.config import Config
+from configurator.utils.configurator_exception import ConfiguratorException
+from configurator.services.configuration_services import Configuration
+from configurator.services.dictionary_services import Dictionary
+from configurator.services.enumerators import Enumerators
+from tests.helpers import reset_caches
+
+
+def count_nodes(schema: dict) -> int:
+    """The number of property schemas in a rendered JSON schema."""
+    count, stack = 0, [schema]
+    while stack:
+        schema = stack.pop()
+        count += 1
+        stack.extend((schema.get("properties") or {}).values())
+        stack.extend(schema.get("oneOf") or [])
+        if "items" in schema and "enum" not in schema["items"]:
+            stack.append(schema["items"])
+    return count
+
+
+class TestRenderBudget(unittest.TestCase):
+    """Test cases for render estimates, $defs renders and the render budget"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for folder in ["configurations", "dictionaries", "types", "enumerators"]:
+            os.makedirs(os.path.join(self.temp_dir, folder))
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        self._write("types", "word.yaml", {"root": {"name": "word", "description": "A word", "type": "simple", "schema": {"type": "string", "maxLength": 40}}})
+        self._write("enumerators", "enumerations.0.yaml", {"version": 0, "enumerators": [
+            {"name": "status", "values": [{"value": "active"}, {"value": "archived"}]}]})
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        self.config.initialize()
+        reset_caches()
+
+    def _write(self, folder, file_name, document):
+        with open(os.path.join(self.temp_dir, folder, file_name), 'w') as f:
+            yaml.dump(document, f)
+
+    def _fan(self, levels):
+        """Dictionaries level_0 .. level_{levels}, each using the next twice,
+        and the configuration fan.yaml with level_0 as version 1.0.0.0."""
+        for level in range(levels + 1):
+            properties = [
+                {"name": "label", "description": "Label", "type": "word"},
+                {"name": "status", "description": "Status", "type": "enum", "enums": "status"},
+            ]
+            if level < levels:
+                properties += [{"name": side, "description": side, "type": "ref", "ref": f"level_{level + 1}.1.0.0"} for side in ("left", "right")]
+            self._write("dictionaries", f"level_{level}.1.0.0.yaml", {"root": {"name": "root", "description": f"Level {level}", "type": "object", "properties": properties}})
+        with open(os.path.join(self.temp_dir, "dictionaries", "fan.1.0.0.yaml"), 'w') as f:
+            f.write(f"root:\n  name: root\n  type: ref\n  ref: level_0.1.0.0\n")
+        self._write("configurations", "fan.yaml", {"title": "Fan", "versions": [{"version": "1.0.0.0"}]})
+
+    def test_estimate_matches_render(self):
+        """Test the estimate counts the nodes of the render and is close to its size"""
+        self._fan(4)
+        enumerations = Enumerators().get_version("fan.1.0.0.0")
+        dictionary = Dictionary("level_0.1.0.0.yaml")
+        schema = dictionary.to_json_schema(enumerations)
+        estimate = dictionary.estimate(enumerations)
+        self.assertEqual(estimate["nodes"], count_nodes(schema))
+        self.assertAlmostEqual(estimate["bytes"] / len(json.dumps(schema)), 1, delta=0.25)
+        self.assertEqual(estimate["depth"], 6)
+        uses = {file["file"]: file["uses"] for file in estimate["files"]}
+        self.assertEqual(uses["dictionaries/level_4.1.0.0.yaml"], 16)
+        self.assertEqual(uses["types/word.yaml"], 31)
+
+    def test_estimate_does_not_render(self):
+        """Test a render too large to ever finish is estimated from each file once"""
+        self._fan(60)
+        enumerations = Enumerators().get_version("fan.1.0.0.0")
+        dictionary = Dictionary("level_0.1.0.0.yaml")
+        estimate = dictionary.estimate(enumerations)
+        self.assertEqual(estimate["nodes"], 3 * (2 ** 61 - 1))
+        self.assertLess(estimate["defs_nodes"], 400)
+
+    def test_estimate_cycle(self):
+        """Test a cycle raises the render error"""
+        self._write("dictionaries", "loop.1.0.0.yaml", {"root": {"name": "root", "type": "object", "properties": [
+            {"name": "again", "type": "ref", "ref": "loop.1.0.0"}]}})
+        with self.assertRaises(ConfiguratorException) as context:
+            Dictionary("loop.1.0.0.yaml").estimate(Mock())
+        self.assertEqual(context.exception.event.id, "REF-04")
+
+    def test_defs_render(self):
+        """Test a $defs render has each file once and resolves every $ref"""
+        self._fan(30)
+        enumerations = Enumerators().get_version("fan.1.0.0.0")
+        dictionary = Dictionary("level_0.1.0.0.yaml")
+        schema = dictionary.to_json_schema_defs(enumerations)
+        self.assertEqual(len(schema["$defs"]), 31)
+        self.assertEqual(schema["properties"]["left"], {"$ref": "#/$defs/level_1.1.0.0"})
+        self.assertEqual(schema["properties"]["label"], {"$ref": "#/$defs/word", "description": "Label"})
+        self.assertEqual(schema["$defs"]["level_30.1.0.0"]["properties"]["status"]["enum"], ["active", "archived"])
+        text = json.dumps(schema)
+        for name in schema["$defs"]:
+            self.assertIn(f'"#/$defs/{name}"', text)
+        self.assertAlmostEqual(dictionary.estimate(enumerations)["defs_bytes"] / len(text), 1, delta=0.25)
+
+    def test_over_budget_is_rejected(self):
+        """Test a render over budget is rejected before rendering"""
+        self._fan(40)
+        configuration = Configuration("fan.yaml")
+        with patch.object(Dictionary, "to_json_schema") as mock_render:
+            with self.assertRaises(ConfiguratorException) as context:
+                configuration.get_json_schema("1.0.0.0")
+            mock_render.assert_not_called()
+        self.assertIn("VER-05", json.dumps(context.exception.event.to_dict(), default=str))
+        analysis = configuration.analyze("1.0.0.0")
+        self.assertEqual(analysis["budget"]["mode"], "reject")
+        self.assertTrue(analysis["budget"]["over_budget"])
+
+    def test_over_budget_renders_with_defs(self):
+        """Test RENDER_OVER_BUDGET=defs renders JSON schemas over budget with $defs, BSON is still rejected"""
+        self._fan(40)
+        self.config.RENDER_OVER_BUDGET = "defs"
+        configuration = Configuration("fan.yaml")
+        schema = configuration.get_json_schema("1.0.0.0")
+        self.assertEqual(len(schema["$defs"]), 42)
+        with self.assertRaises(ConfiguratorException):
+            configuration.get_bson_schema("1.0.0.0")
+        self.assertEqual(configuration.analyze("1.0.0.0")["budget"]["mode"], "defs")
+
+    def test_within_budget_renders_inline(self):
+        """Test a render within budget, or without a budget, is inline"""
+        self._fan(3)
+        configuration = Configuration("fan.yaml")
+        self.assertNotIn("$defs", configuration.get_json_schema("1.0.0.0"))
+        self.assertEqual(configuration.analyze("1.0.0.0")["budget"]["mode"], "inline")
+        self._fan(40)
+        self.config.RENDER_MAX_NODES = 0
+        self.config.RENDER_MAX_BYTES = 0
+        with patch.object(Dictionary, "estimate") as mock_estimate, patch.object(Dictionary, "to_bson_schema", return_value={}):
+            Configuration("fan.yaml").get_bson_schema("1.0.0.0")
+            mock_estimate.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.schema_cache import DependencyRecorder
+from configurator.services.service_registry import ServiceRegistry
+from configurator.services.dictionary_services import Dictionary
+from configurator.services.type_services import Type
+from configurator.services.enumerators import Enumerators
+from tests.helpers import age, age_tree, reset_caches
+
+
+class TestServiceRegistry(unittest.TestCase):
+    """Test cases for ServiceRegistry"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_complex_refs", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+        self.registry = ServiceRegistry.get_instance()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def test_service_is_shared(self):
+        """Test a registered service is returned again while its file is unchanged"""
+        word = self.registry.get(Type, "word.yaml")
+        self.assertIs(self.registry.get(Type, "word.yaml"), word)
+        self.assertIsNot(self.registry.get(Dictionary, "workshop.1.0.0.yaml"), word)
+        self.assertEqual(self.registry.to_dict()["hits"], 1)
+
+    def test_changed_file_is_reconstructed(self):
+        """Test a service is constructed again when its file changes"""
+        word = self.registry.get(Type, "word.yaml")
+        file_path = os.path.join(self.temp_dir, "types", "word.yaml")
+        with open(file_path, 'a') as f:
+            f.write("# changed\n")
+        age(file_path, 5)
+        self.assertIsNot(self.registry.get(Type, "word.yaml"), word)
+
+    def test_hits_are_recorded_as_dependencies(self):
+        """Test a registry hit is reported to active dependency recorders"""
+        self.registry.get(Type, "word.yaml")
+        with DependencyRecorder() as dependencies:
+            self.registry.get(Type, "word.yaml")
+        self.assertEqual(set(dependencies), {(os.path.join(self.temp_dir, "types"), "word.yaml")})
+
+    def test_each_reference_is_constructed_once_per_render(self):
+        """Test a render builds each referenced dictionary and type once"""
+        enumerations = Enumerators().get_version("workshop.1.0.0.0")
+        dictionary = Dictionary("workshop.1.0.0.yaml")
+        with patch('configurator.services.service_registry.DependencyRecorder', wraps=DependencyRecorder) as constructions:
+            dictionary.to_json_schema(enumerations)
+            dictionary.to_bson_schema(enumerations)
+        self.assertEqual(constructions.call_count, self.registry.to_dict()["size"])
+        self.assertGreater(self.registry.to_dict()["hits"], constructions.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
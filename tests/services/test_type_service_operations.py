@@ -1,9 +1,12 @@
+import shutil
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock, Mock
 from configurator.services.type_services import Type
 import os
 from configurator.utils.configurator_exception import ConfiguratorException, ConfiguratorEvent
 from configurator.utils.config import Config
+from configurator.utils.summary_index import SummaryIndex
 
 
 class TestType(unittest.TestCase):
@@ -39,6 +42,9 @@ class TestType(unittest.TestCase):
         self.assertEqual(type_service.file_name, self.test_file_name)
         self.assertFalse(type_service._locked)
         mock_file_io.get_document.assert_called_once()
+        mock_property.assert_not_called()  # The root is built on first use
+        self.assertIs(type_service.root, mock_property_instance)
+        self.assertIs(type_service.root, type_service.root)
         mock_property.assert_called_once_with(self.test_document.get("root", {}))
 
     @patch('configurator.services.type_services.Property')
@@ -54,6 +60,9 @@ class TestType(unittest.TestCase):
         # Assert
         self.assertEqual(type_service.file_name, self.test_file_name)
         self.assertFalse(type_service._locked)
+        mock_property.assert_not_called()  # The root is built on first use
+        self.assertIs(type_service.root, mock_property_instance)
+        self.assertIs(type_service.root, type_service.root)
         mock_property.assert_called_once_with(self.test_document.get("root", {}))
 
     def test_init_without_file_name(self):
@@ -108,41 +117,31 @@ class TestType(unittest.TestCase):
         }
         self.assertEqual(result, expected)
 
-    @patch('configurator.services.type_services.Property')
-    def test_to_json_schema(self, mock_property):
-        """Test Type to_json_schema method"""
+    def test_to_json_schema(self):
+        """Test Type to_json_schema renders the compiled root property"""
         # Arrange
-        mock_property_instance = Mock()
-        mock_property_instance.to_json_schema.return_value = {"type": "object"}
-        mock_property.return_value = mock_property_instance
-        
         type_obj = Type(self.test_file_name, self.test_document)
         mock_enumerations = Mock()
-        
+
         # Act
         result = type_obj.to_json_schema(mock_enumerations)
-        
+
         # Assert
-        self.assertEqual(result, {"type": "object"})
-        mock_property_instance.to_json_schema.assert_called_once_with(mock_enumerations, [])
+        self.assertEqual(result, {"description": "Test type", "type": "object", "additionalProperties": False, "properties": {}})
+        self.assertEqual(result, type_obj.root.to_json_schema(mock_enumerations))
 
-    @patch('configurator.services.type_services.Property')
-    def test_to_bson_schema(self, mock_property):
-        """Test Type to_bson_schema method"""
+    def test_to_bson_schema(self):
+        """Test Type to_bson_schema renders the compiled root property"""
         # Arrange
-        mock_property_instance = Mock()
-        mock_property_instance.to_bson_schema.return_value = {"bsonType": "object"}
-        mock_property.return_value = mock_property_instance
-        
         type_obj = Type(self.test_file_name, self.test_document)
         mock_enumerations = Mock()
-        
+
         # Act
         result = type_obj.to_bson_schema(mock_enumerations)
-        
+
         # Assert
-        self.assertEqual(result, {"bsonType": "object"})
-        mock_property_instance.to_bson_schema.assert_called_once_with(mock_enumerations, [])
+        self.assertEqual(result, {"bsonType": "object", "additionalProperties": False, "properties": {}})
+        self.assertEqual(result, type_obj.root.to_bson_schema(mock_enumerations))
 
     @patch('configurator.services.service_base.FileIO')
     @patch('configurator.services.type_services.Property')
@@ -229,5 +228,45 @@ class TestType(unittest.TestCase):
             mock_type2.save.assert_called_once()
 
 
+class TestGetTypesSummary(unittest.TestCase):
+    """Test cases for Type.get_types_summary."""
+
+    def setUp(self):
+        self.config = Config.get_instance()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = tempfile.mkdtemp()
+        SummaryIndex._instance = None
+
+    def tearDown(self):
+        shutil.rmtree(self.config.INPUT_FOLDER, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        SummaryIndex._instance = None
+
+    @patch('configurator.services.service_base.FileIO')
+    @patch('configurator.services.type_services.FileIO')
+    def test_get_types_summary_keeps_order_and_bad_files(self, mock_file_io_type, mock_file_io_base):
+        """Test summaries are in file order and a bad file gets an empty summary."""
+        files = []
+        for name in ["a.yaml", "bad.yaml", "c.yaml"]:
+            mock_file = Mock(file_name=name, size=10, _updated=1000.0)
+            mock_file.to_dict.return_value = {"file_name": name}
+            files.append(mock_file)
+        mock_file_io_type.get_documents.return_value = files
+        mock_file_io_base.get_content.side_effect = lambda folder_name, file_name: file_name.encode()
+
+        def get_document(folder_name, file_name):
+            if file_name == "bad.yaml":
+                raise ConfiguratorException("Unparsable", ConfiguratorEvent("FIL-06", "GET_DOCUMENT"))
+            return {"_locked": file_name == "c.yaml", "root": {"description": f"Type {file_name}"}}
+        mock_file_io_base.get_document.side_effect = get_document
+
+        result = Type.get_types_summary()
+
+        self.assertEqual([item["file_name"] for item in result], ["a.yaml", "bad.yaml", "c.yaml"])
+        self.assertEqual(result[0]["description"], "Type a.yaml")
+        self.assertEqual(result[1], {"file_name": "bad.yaml", "_locked": False, "description": ""})
+        self.assertTrue(result[2]["_locked"])
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.corpus_snapshot import CorpusSnapshot, MAGIC
+from configurator.utils.document_cache import DocumentCache
+from configurator.utils.file_io import FileIO
+from configurator import cli
+from tests.helpers import age_tree
+
+
+class TestCorpusSnapshot(unittest.TestCase):
+    """Test cases for CorpusSnapshot"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.input_folder = os.path.join(self.temp_dir, "input")
+        shutil.copytree("./tests/test_cases/passing_template", self.input_folder)
+        age_tree(self.input_folder)
+        self.snapshot_path = os.path.join(self.temp_dir, "corpus.snapshot")
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.input_folder
+        self.cache = DocumentCache.get_instance()
+        self.cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        self.cache.clear()
+
+    def test_build_and_load(self):
+        """Test a loaded snapshot serves documents without parsing"""
+        summary = CorpusSnapshot.build(self.snapshot_path)
+        self.assertGreater(summary["documents"], 0)
+        self.assertEqual(summary["skipped"], [])
+
+        loaded = CorpusSnapshot.load(self.snapshot_path)
+        self.assertEqual(loaded, {"loaded": summary["documents"], "stale": 0, "missing": 0})
+
+        expected = FileIO.get_document("dictionaries", "sample.1.0.0.yaml")
+        self.assertEqual(self.cache.misses, 0)
+        self.cache.clear()
+        self.assertEqual(FileIO.get_document("dictionaries", "sample.1.0.0.yaml"), expected)
+
+    def test_changed_files_are_not_loaded(self):
+        """Test files that changed since the build fall back to parsing"""
+        CorpusSnapshot.build(self.snapshot_path)
+        file_path = os.path.join(self.input_folder, "dictionaries", "sample.1.0.0.yaml")
+        with open(file_path, 'a') as f:
+            f.write("# changed\n")
+        os.remove(os.path.join(self.input_folder, "types", "word.yaml"))
+
+        loaded = CorpusSnapshot.load(self.snapshot_path)
+        self.assertEqual(loaded["stale"], 1)
+        self.assertEqual(loaded["missing"], 1)
+        FileIO.get_document("dictionaries", "sample.1.0.0.yaml")
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_missing_snapshot_is_ignored(self):
+        """Test a missing snapshot does not fail startup"""
+        self.assertEqual(CorpusSnapshot.load(self.snapshot_path), {"loaded": 0, "stale": 0, "missing": 0})
+
+    def test_unsafe_snapshot_is_rejected(self):
+        """Test a snapshot can only contain parsed document types"""
+        with open(self.snapshot_path, 'wb') as f:
+            f.write(MAGIC)
+            pickle.dump({"format": 1, "payload": shutil.rmtree}, f)
+        with self.assertRaises(pickle.UnpicklingError):
+            CorpusSnapshot.read(self.snapshot_path)
+        self.assertEqual(CorpusSnapshot.load(self.snapshot_path)["loaded"], 0)
+
+    def test_cli_snapshot(self):
+        """Test the snapshot command writes a snapshot"""
+        with patch('builtins.print'):
+            self.assertEqual(cli.main(["snapshot", "--output", self.snapshot_path]), 0)
+        self.assertTrue(os.path.exists(self.snapshot_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
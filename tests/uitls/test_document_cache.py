@@ -0,0 +1,231 @@
+import os
+import unittest
+import tempfile
+import shutil
+import yaml
+from datetime import date
+from configurator.utils.config import Config
+from configurator.utils.document_cache import DocumentCache, FolderCache, MISSING, copy_document
+from configurator.utils.file_io import FileIO, sort_document
+from tests.helpers import age
+
+
+class TestDocumentCache(unittest.TestCase):
+    """Test cases for DocumentCache class"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "test.yaml")
+        with open(self.file_path, 'w') as f:
+            f.write("name: test\n")
+        age(self.file_path)
+        self.stat = os.stat(self.file_path)
+        self.cache = DocumentCache(max_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_miss_then_hit(self):
+        """Test a put document is returned on the next get"""
+        self.assertIs(self.cache.get(self.temp_dir, "test.yaml", self.stat), MISSING)
+        self.cache.put(self.temp_dir, "test.yaml", self.stat, {"name": "test"})
+        self.assertEqual(self.cache.get(self.temp_dir, "test.yaml", self.stat), {"name": "test"})
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_none_document_is_cached(self):
+        """Test an empty document is a hit, not a miss"""
+        self.cache.put(self.temp_dir, "test.yaml", self.stat, None)
+        self.assertIsNone(self.cache.get(self.temp_dir, "test.yaml", self.stat))
+
+    def test_changed_file_is_a_miss(self):
+        """Test a change in mtime or size invalidates the entry"""
+        self.cache.put(self.temp_dir, "test.yaml", self.stat, {"name": "test"})
+        with open(self.file_path, 'w') as f:
+            f.write("name: changed\n")
+        os.utime(self.file_path, ns=(self.stat.st_atime_ns, self.stat.st_mtime_ns + 1000))
+        self.assertIs(self.cache.get(self.temp_dir, "test.yaml", os.stat(self.file_path)), MISSING)
+
+    def test_returns_copies(self):
+        """Test callers can not corrupt cached documents"""
+        returned = self.cache.put(self.temp_dir, "test.yaml", self.stat, {"items": [{"a": 1}]})
+        returned["items"][0]["a"] = 2
+        cached = self.cache.get(self.temp_dir, "test.yaml", self.stat)
+        cached["items"].append({"b": 2})
+        self.assertEqual(self.cache.get(self.temp_dir, "test.yaml", self.stat), {"items": [{"a": 1}]})
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted"""
+        self.cache.put(self.temp_dir, "a.yaml", self.stat, "a")
+        self.cache.put(self.temp_dir, "b.yaml", self.stat, "b")
+        self.cache.get(self.temp_dir, "a.yaml", self.stat)
+        self.cache.put(self.temp_dir, "c.yaml", self.stat, "c")
+        self.assertEqual(self.cache.get(self.temp_dir, "a.yaml", self.stat), "a")
+        self.assertIs(self.cache.get(self.temp_dir, "b.yaml", self.stat), MISSING)
+        self.assertEqual(self.cache.to_dict()["size"], 2)
+
+    def test_disabled_cache(self):
+        """Test a max_size of 0 disables caching"""
+        cache = DocumentCache(max_size=0)
+        cache.put(self.temp_dir, "test.yaml", self.stat, {"name": "test"})
+        self.assertIs(cache.get(self.temp_dir, "test.yaml", self.stat), MISSING)
+
+    def test_racy_file_is_not_cached(self):
+        """Test a file modified in the last second is not cached"""
+        os.utime(self.file_path)
+        stat = os.stat(self.file_path)
+        self.cache.put(self.temp_dir, "test.yaml", stat, {"name": "test"})
+        self.assertIs(self.cache.get(self.temp_dir, "test.yaml", stat), MISSING)
+
+    def test_invalidate_and_clear(self):
+        """Test invalidate drops one entry and clear drops all"""
+        self.cache.put(self.temp_dir, "a.yaml", self.stat, "a")
+        self.cache.put(self.temp_dir, "b.yaml", self.stat, "b")
+        self.cache.invalidate(self.temp_dir, "a.yaml")
+        self.assertIs(self.cache.get(self.temp_dir, "a.yaml", self.stat), MISSING)
+        self.cache.clear()
+        self.assertEqual(self.cache.to_dict(), {"size": 0, "max_size": 2, "hits": 0, "misses": 0})
+
+    def test_copy_document_shares_scalars(self):
+        """Test copy_document copies containers and keeps scalars"""
+        created = date(2024, 1, 1)
+        document = {"list": [1, "two"], "created": created}
+        copy = copy_document(document)
+        self.assertEqual(copy, document)
+        self.assertIsNot(copy["list"], document["list"])
+        self.assertIs(copy["created"], created)
+
+
+class TestFileIODocumentCache(unittest.TestCase):
+    """Test FileIO integration with the DocumentCache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = Config.get_instance()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        self.cache = DocumentCache.get_instance()
+        with open(os.path.join(self.temp_dir, "test.yaml"), 'w') as f:
+            yaml.dump({"name": "test"}, f)
+        age(os.path.join(self.temp_dir, "test.yaml"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+
+    def test_get_document_hits_cache(self):
+        """Test a second read of an unchanged file is a cache hit"""
+        FileIO.get_document("", "test.yaml")
+        hits = self.cache.hits
+        self.assertEqual(FileIO.get_document("", "test.yaml"), {"name": "test"})
+        self.assertEqual(self.cache.hits, hits + 1)
+
+    def test_get_document_returns_copy(self):
+        """Test mutating a returned document does not change the next read"""
+        FileIO.get_document("", "test.yaml")["name"] = "changed"
+        self.assertEqual(FileIO.get_document("", "test.yaml"), {"name": "test"})
+
+    def test_put_document_invalidates(self):
+        """Test put_document replaces the cached document"""
+        FileIO.get_document("", "test.yaml")
+        FileIO.put_document("", "test.yaml", {"name": "new"})
+        self.assertEqual(FileIO.get_document("", "test.yaml"), {"name": "new"})
+
+    def test_put_document_key_order(self):
+        """Test the document put_document caches has the key order of a reread"""
+        document = {"b": 1, "a": {"d": [{"f": 1, "e": 2}], "c": 3}, 1: "mixed"}
+        returned = FileIO.put_document("", "test.yaml", {"b": 1, "a": {"d": [{"f": 1, "e": 2}], "c": 3}})
+        cached = FileIO.get_document("", "test.yaml")
+        self.cache.clear()
+        reread = FileIO.get_document("", "test.yaml")
+        self.assertEqual(list(reread), ["a", "b"])
+        for read in (returned, cached):
+            self.assertEqual(list(read), list(reread))
+            self.assertEqual(list(read["a"]), list(reread["a"]))
+            self.assertEqual(list(read["a"]["d"][0]), list(reread["a"]["d"][0]))
+        self.assertEqual(list(sort_document(document)), list(document))
+
+    def test_delete_document_invalidates(self):
+        """Test delete_document drops the cached document"""
+        FileIO.get_document("", "test.yaml")
+        FileIO.delete_document("", "test.yaml")
+        folder = os.path.join(self.temp_dir, "")
+        self.assertNotIn((folder, "test.yaml"), self.cache._entries)
+
+
+class TestFolderCache(unittest.TestCase):
+    """Test cases for FolderCache class"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = Config.get_instance()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        self.folder = os.path.join(self.temp_dir, "")
+        for name in ["a.yaml", "b.yaml"]:
+            with open(os.path.join(self.temp_dir, name), 'w') as f:
+                f.write("name: test\n")
+        age(self.temp_dir)
+        self.cache = FolderCache(use_inotify=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+
+    def test_miss_then_hit(self):
+        """Test a cached listing is returned while the folder is unchanged"""
+        self.assertIs(self.cache.get(self.folder), MISSING)
+        self.cache.put(self.folder, os.stat(self.folder), ["a", "b"])
+        self.assertEqual(self.cache.get(self.folder), ["a", "b"])
+        self.assertEqual(self.cache.to_dict()["hits"], 1)
+
+    def test_added_file_is_a_miss(self):
+        """Test adding a file to the folder invalidates the listing"""
+        self.cache.put(self.folder, os.stat(self.folder), ["a", "b"])
+        with open(os.path.join(self.temp_dir, "c.yaml"), 'w') as f:
+            f.write("name: test\n")
+        self.assertIs(self.cache.get(self.folder), MISSING)
+
+    def test_racy_folder_is_not_cached(self):
+        """Test a folder modified in the last second is not cached"""
+        os.utime(self.temp_dir)
+        self.cache.put(self.folder, os.stat(self.folder), ["a", "b"])
+        self.assertIs(self.cache.get(self.folder), MISSING)
+
+    def test_returns_copies(self):
+        """Test callers can not change the cached listing"""
+        self.cache.put(self.folder, os.stat(self.folder), ["a", "b"]).append("c")
+        self.cache.get(self.folder).append("d")
+        self.assertEqual(self.cache.get(self.folder), ["a", "b"])
+
+    def test_inotify_detects_in_place_change(self):
+        """Test an in place file change is detected when inotify is enabled"""
+        cache = FolderCache(use_inotify=True)
+        if not cache.use_inotify:
+            self.skipTest("inotify not available")
+        self.assertIs(cache.get(self.folder), MISSING)
+        cache.put(self.folder, os.stat(self.folder), ["a", "b"])
+        self.assertEqual(cache.get(self.folder), ["a", "b"])
+        with open(os.path.join(self.temp_dir, "a.yaml"), 'a') as f:
+            f.write("description: changed\n")
+        self.assertIs(cache.get(self.folder), MISSING)
+
+    def test_get_documents_uses_cache(self):
+        """Test FileIO.get_documents returns the cached listing"""
+        folder_cache = FolderCache.get_instance()
+        first = FileIO.get_documents("")
+        hits = folder_cache.hits
+        second = FileIO.get_documents("")
+        self.assertEqual(folder_cache.hits, hits + 1)
+        self.assertEqual(sorted(f.file_name for f in first), sorted(f.file_name for f in second))
+
+    def test_put_document_invalidates_listing(self):
+        """Test put_document invalidates the folder listing"""
+        FileIO.get_documents("")
+        FileIO.put_document("", "c.yaml", {"name": "c"})
+        file_names = [f.file_name for f in FileIO.get_documents("")]
+        self.assertIn("c.yaml", file_names)
+
+
+if __name__ == '__main__':
+    unittest.main()
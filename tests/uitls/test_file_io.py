@@ -1,13 +1,15 @@
 import os
 import unittest
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
 from configurator.utils.config import Config
-from configurator.utils.file_io import FileIO, File
+from configurator.utils.file_io import FileIO, File, load_yaml, dump_yaml
 import tempfile
 import json
 import yaml
 from unittest.mock import Mock, patch, mock_open
 from configurator.utils.configurator_exception import ConfiguratorException
+from tests.helpers import reset_caches
 
 class TestFile(unittest.TestCase):
     """Test cases for File class"""
@@ -65,6 +67,18 @@ class TestFile(unittest.TestCase):
         self.assertEqual(file_dict["file_name"], "test_file.txt")
         self.assertGreater(file_dict["size"], 0)
 
+    def test_file_from_stat(self):
+        """Test File uses a provided stat and formats timestamps on demand"""
+        with open(self.test_file_path, 'w') as f:
+            f.write("test content")
+        stat = os.stat(self.test_file_path)
+        
+        file_obj = File(self.test_file_path, stat)
+        
+        self.assertEqual(file_obj.size, stat.st_size)
+        self.assertEqual(file_obj.updated_at, datetime.fromtimestamp(stat.st_mtime).isoformat())
+        self.assertFalse(hasattr(file_obj, "__dict__"))
+
     def test_file_with_different_extensions(self):
         """Test File class with different file extensions"""
         extensions = [".yaml", ".yml", ".json", ".txt", ".md", ".py"]
@@ -125,6 +139,41 @@ class TestFileIO(unittest.TestCase):
         self.assertIn("test.yaml", file_names)
         self.assertIn("test.json", file_names)
 
+    def test_get_documents_with_query(self):
+        """Test get_documents applies a list query"""
+        for name in ["b.yaml", "a.yaml", "c.json"]:
+            with open(os.path.join(self.temp_dir, name), 'w') as f:
+                f.write("{}")
+        
+        files = self.file_io.get_documents("", {"extension": "yaml", "sort": "file_name"})
+        self.assertEqual([f.file_name for f in files], ["a.yaml", "b.yaml"])
+
+    def test_select_documents(self):
+        """Test select_documents filters, sorts and pages files"""
+        files = []
+        for name, size in [("user.1.0.0.yaml", 30), ("user.1.0.1.yaml", 10), ("media.1.0.0.yaml", 20), ("notes.json", 5)]:
+            file_obj = Mock(spec=File)
+            file_obj.file_name = name
+            file_obj.size = size
+            files.append(file_obj)
+        
+        def names(query):
+            return [f.file_name for f in self.file_io.select_documents(files, query)]
+        
+        self.assertEqual(names({}), ["user.1.0.0.yaml", "user.1.0.1.yaml", "media.1.0.0.yaml", "notes.json"])
+        self.assertEqual(names({"prefix": "user."}), ["user.1.0.0.yaml", "user.1.0.1.yaml"])
+        self.assertEqual(names({"extension": ".json"}), ["notes.json"])
+        self.assertEqual(names({"sort": "size"}), ["notes.json", "user.1.0.1.yaml", "media.1.0.0.yaml", "user.1.0.0.yaml"])
+        self.assertEqual(names({"sort": "file_name", "order": "desc", "limit": "2"}), ["user.1.0.1.yaml", "user.1.0.0.yaml"])
+        self.assertEqual(names({"sort": "file_name", "offset": "1", "limit": "2"}), ["notes.json", "user.1.0.0.yaml"])
+
+    def test_select_documents_invalid_query(self):
+        """Test select_documents rejects invalid list queries"""
+        for query in [{"limit": "ten"}, {"offset": "-1"}, {"sort": "owner"}, {"order": "up"}]:
+            with self.assertRaises(ConfiguratorException) as context:
+                self.file_io.select_documents([], query)
+            self.assertEqual(context.exception.event.status, "FAILURE")
+
     def test_get_document_yaml(self):
         """Test get_document with YAML file"""
         # Create test YAML file
@@ -178,6 +227,41 @@ class TestFileIO(unittest.TestCase):
             content = yaml.safe_load(f)
         self.assertEqual(content, self.yaml_data)
 
+    def test_dump_yaml_matches_yaml_dump(self):
+        """Test the fast YAML dumper emits the same bytes as yaml.dump"""
+        document = {"root": {"name": "root", "description": "A " * 60, "properties": [{"name": "é", "required": True}]}}
+        self.assertEqual(dump_yaml(document), yaml.dump(document))
+        self.assertEqual(load_yaml(dump_yaml(document)), document)
+
+    def test_put_document_yaml_round_trips(self):
+        """Test every template document, and dates, read back as written"""
+        source = os.path.join(os.path.dirname(os.path.dirname(__file__)), "test_cases", "passing_template")
+        for folder_name in ["configurations", "dictionaries", "types", "enumerators"]:
+            os.makedirs(os.path.join(self.temp_dir, folder_name))
+            for file_name in sorted(os.listdir(os.path.join(source, folder_name))):
+                with open(os.path.join(source, folder_name, file_name), 'r') as f:
+                    document = load_yaml(f)
+                result = self.file_io.put_document(folder_name, file_name, document)
+                reset_caches()
+                self.assertEqual(self.file_io.get_document(folder_name, file_name), result)
+                self.assertEqual(result, document)
+
+        document = {"day": date(2024, 1, 2), "at": datetime(2024, 1, 2, 3, 4, 5), "none": None, "ratio": 0.5, "tags": {"a"}, "pair": (1, 2)}
+        result = self.file_io.put_document("", "test.yaml", document)
+        reset_caches()
+        self.assertEqual(self.file_io.get_document("", "test.yaml"), result)
+        self.assertEqual(result, {**document, "pair": [1, 2]})
+
+    def test_put_document_yaml_rejects_non_yaml_values(self):
+        """Test values the safe loader could not read back are refused"""
+        self.file_io.put_document("", "test.yaml", self.yaml_data)
+        for value in [object(), Decimal("1.5")]:
+            with self.assertRaises(ConfiguratorException) as context:
+                self.file_io.put_document("", "test.yaml", {"name": value})
+            self.assertEqual(context.exception.event.id, "FIL-08")
+        reset_caches()
+        self.assertEqual(self.file_io.get_document("", "test.yaml"), self.yaml_data)
+
     def test_put_document_json(self):
         """Test put_document with JSON file"""
         result = self.file_io.put_document("", "test.json", self.json_data)
@@ -190,6 +274,49 @@ class TestFileIO(unittest.TestCase):
             content = json.load(f)
         self.assertEqual(content, self.json_data)
 
+    def test_put_document_json_is_normalized(self):
+        """Test put_document returns the document as it will be read back"""
+        result = self.file_io.put_document("", "test.json", {"items": (1, 2), 3: "three"})
+        self.assertEqual(result, {"items": [1, 2], "3": "three"})
+        self.assertEqual(result, self.file_io.get_document("", "test.json"))
+
+    def test_put_document_returns_copy(self):
+        """Test changing the document after a put does not change the next read"""
+        document = {"items": [{"name": "a"}]}
+        self.file_io.put_document("", "test.yaml", document)
+        document["items"].append({"name": "b"})
+        self.assertEqual(self.file_io.get_document("", "test.yaml"), {"items": [{"name": "a"}]})
+
+    def test_put_document_unchanged_is_not_written(self):
+        """Test putting identical content leaves the file untouched"""
+        self.file_io.put_document("", "test.yaml", self.yaml_data)
+        os.utime(self.test_yaml_path, ns=(0, 1_000_000_000))
+        result = self.file_io.put_document("", "test.yaml", self.yaml_data)
+        self.assertEqual(result, self.yaml_data)
+        self.assertEqual(os.stat(self.test_yaml_path).st_mtime_ns, 1_000_000_000)
+
+    def test_put_document_leaves_no_temp_files(self):
+        """Test the temporary file is renamed into place, or removed on failure"""
+        self.file_io.put_document("", "test.yaml", self.yaml_data)
+        with patch('configurator.utils.file_io.os.replace', side_effect=OSError("rename failed")):
+            with self.assertRaises(ConfiguratorException):
+                self.file_io.put_document("", "test.yaml", {"name": "changed"})
+        self.assertEqual(os.listdir(self.temp_dir), ["test.yaml"])
+        self.assertEqual(self.file_io.get_document("", "test.yaml"), self.yaml_data)
+
+    def test_put_document_keeps_file_mode(self):
+        """Test replacing a file keeps its permissions"""
+        self.file_io.put_document("", "test.yaml", self.yaml_data)
+        os.chmod(self.test_yaml_path, 0o640)
+        self.file_io.put_document("", "test.yaml", {"name": "changed"})
+        self.assertEqual(os.stat(self.test_yaml_path).st_mode & 0o777, 0o640)
+
+    def test_get_documents_skips_temp_files(self):
+        """Test in flight temporary files are not listed"""
+        with open(os.path.join(self.temp_dir, ".test.yaml.1.1.tmp"), 'w') as f:
+            f.write("partial")
+        self.assertEqual(self.file_io.get_documents(""), [])
+
     def test_put_document_unsupported_type(self):
         """Test put_document with unsupported file type"""
         with self.assertRaises(ConfiguratorException) as context:
@@ -344,6 +344,119 @@ class TestMongoIODropDatabase(unittest.TestCase):
         Config._instance = None
 
 
+class TestMongoIOInstances(unittest.TestCase):
+    """Unit tests for the shared MongoIO instances of MongoIO.get_instance."""
+
+    def setUp(self):
+        Config._instance = None
+        os.environ['MONGODB_REQUIRE_TLS'] = 'false'
+        self.config = Config.get_instance()
+        self.config.MONGO_CONNECTION_STRING = "mongodb://localhost:27017/"
+        MongoIO._instances = {}
+        patcher = patch('configurator.utils.mongo_io.MongoClient', side_effect=lambda *args, **kwargs: MagicMock())
+        self.mock_mongo_client = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        MongoIO._instances = {}
+        del os.environ['MONGODB_REQUIRE_TLS']
+        Config._instance = None
+
+    def test_instance_is_shared(self):
+        """Test one client is connected per connection string and database"""
+        mongo_io = MongoIO.get_instance()
+        self.assertIs(MongoIO.get_instance(), mongo_io)
+        self.assertIs(MongoIO.get_instance("mongodb://localhost:27017/", "configurator"), mongo_io)
+        self.assertIsNot(MongoIO.get_instance(database_name="other"), mongo_io)
+        self.assertEqual(self.mock_mongo_client.call_count, 2)
+
+    def test_connection_errors_are_not_shared(self):
+        """Test a failed connection raises and is tried again on the next use"""
+        self.mock_mongo_client.side_effect = Exception("No server")
+        with self.assertRaises(ConfiguratorException) as context:
+            MongoIO.get_instance()
+        self.assertEqual(context.exception.event.id, "MON-01")
+        self.mock_mongo_client.side_effect = lambda *args, **kwargs: MagicMock()
+        self.assertIsNotNone(MongoIO.get_instance().client)
+
+    def test_disconnected_instance_is_replaced(self):
+        """Test an instance a caller disconnected is reconnected"""
+        mongo_io = MongoIO.get_instance()
+        mongo_io.disconnect()
+        self.assertIsNotNone(MongoIO.get_instance().client)
+        self.assertIsNot(MongoIO.get_instance(), mongo_io)
+
+    def test_health_check(self):
+        """Test an instance used within MONGODB_HEALTH_CHECK_SECONDS is not pinged, and one that fails its ping is replaced"""
+        mongo_io = MongoIO.get_instance()
+        client = mongo_io.client
+        client.admin.command.reset_mock()
+        MongoIO.get_instance()
+        client.admin.command.assert_not_called()
+
+        self.config.MONGODB_HEALTH_CHECK_SECONDS = 0
+        self.assertIs(MongoIO.get_instance(), mongo_io)
+        client.admin.command.assert_called_once_with('ping')
+        client.admin.command.side_effect = Exception("Connection reset")
+        replaced = MongoIO.get_instance()
+        self.assertIsNot(replaced, mongo_io)
+        client.close.assert_called_once()
+
+    def test_health_check_runs_outside_the_lock(self):
+        """Test the ping, and connecting a replacement, do not hold the lock other callers wait on"""
+        self.config.MONGODB_HEALTH_CHECK_SECONDS = 0
+        mongo_io = MongoIO.get_instance()
+        locked = []
+        def ping(*args, **kwargs):
+            locked.append(MongoIO._lock.locked())
+            raise Exception("Connection reset")
+        mongo_io.client.admin.command.side_effect = ping
+        self.mock_mongo_client.side_effect = lambda *args, **kwargs: locked.append(MongoIO._lock.locked()) or MagicMock()
+        self.assertIsNot(MongoIO.get_instance(), mongo_io)
+        self.assertEqual(locked, [False, False])
+
+    def test_concurrent_replacement_is_kept(self):
+        """Test an instance another caller swapped in while this one pinged is used, and the extra client is closed"""
+        self.config.MONGODB_HEALTH_CHECK_SECONDS = 0
+        key = (self.config.MONGO_CONNECTION_STRING, self.config.MONGO_DB_NAME)
+        mongo_io = MongoIO.get_instance()
+        other = MongoIO(*key)
+        def ping(*args, **kwargs):
+            MongoIO._instances[key] = other
+            raise Exception("Connection reset")
+        mongo_io.client.admin.command.side_effect = ping
+        clients = []
+        self.mock_mongo_client.side_effect = lambda *args, **kwargs: clients.append(MagicMock()) or clients[-1]
+        self.assertIs(MongoIO.get_instance(), other)
+        self.assertEqual(len(clients), 1)
+        clients[0].close.assert_called_once()
+        self.assertIs(MongoIO._instances[key], other)
+
+    def test_fork_safety(self):
+        """Test an instance inherited through a fork is replaced, and its client is left to the parent"""
+        mongo_io = MongoIO.get_instance()
+        mongo_io._pid = -1
+        replaced = MongoIO.get_instance()
+        self.assertIsNot(replaced, mongo_io)
+        mongo_io.client.close.assert_not_called()
+
+        MongoIO._instances[("inherited", "configurator")] = mongo_io
+        client = replaced.client
+        MongoIO.shutdown()
+        mongo_io.client.close.assert_not_called()
+        client.close.assert_called_once()
+
+    def test_shutdown(self):
+        """Test shutdown disconnects the shared instances, the next use connects again"""
+        mongo_io = MongoIO.get_instance()
+        client = mongo_io.client
+        MongoIO.shutdown()
+        client.close.assert_called_once()
+        self.assertIsNone(mongo_io.client)
+        self.assertEqual(MongoIO._instances, {})
+        self.assertIsNot(MongoIO.get_instance(), mongo_io)
+
+
 if __name__ == '__main__':
     unittest.main()
 
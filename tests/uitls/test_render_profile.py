@@ -0,0 +1,132 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.configurator_exception import ConfiguratorException
+from configurator.utils.render_profile import RenderProfile, current_profile, profile_option
+from configurator.services.configuration_services import Configuration
+from configurator import cli
+from tests.helpers import age_tree, reset_caches
+
+
+class TestRenderProfile(unittest.TestCase):
+    """Test cases for RenderProfile"""
+
+    def test_profile_option(self):
+        """Test the profile query parameter"""
+        self.assertFalse(profile_option({}))
+        self.assertTrue(profile_option({"profile": "true"}))
+        self.assertFalse(profile_option({"profile": "false"}))
+
+    def test_active_profile(self):
+        """Test profiles are active only in their context, and nest"""
+        self.assertIsNone(current_profile())
+        with RenderProfile() as outer:
+            self.assertIs(current_profile(), outer)
+            with RenderProfile() as inner:
+                self.assertIs(current_profile(), inner)
+            self.assertIs(current_profile(), outer)
+        self.assertIsNone(current_profile())
+
+    def test_stacks(self):
+        """Test frames are timed per render stack and written as collapsed stacks"""
+        with RenderProfile() as profile:
+            profile.enter("dictionaries/a.yaml", 3)
+            time.sleep(0.002)
+            profile.tick("[resolve] types/b.yaml")
+            profile.enter("types/b.yaml", 1)
+            time.sleep(0.002)
+            profile.leave("b_property")
+            profile.leave()
+        self.assertEqual(profile.depth, 0)
+        self.assertEqual(profile.max_ref_depth, 1)
+        self.assertEqual(set(profile.stacks), {
+            ("dictionaries/a.yaml",),
+            ("dictionaries/a.yaml", "[resolve] types/b.yaml"),
+            ("dictionaries/a.yaml", "types/b.yaml"),
+        })
+        files = {file["file"]: file for file in profile.to_dict()["files"]}
+        self.assertGreaterEqual(files["dictionaries/a.yaml"]["total_ms"], files["types/b.yaml"]["total_ms"] + files["dictionaries/a.yaml"]["self_ms"])
+        self.assertEqual(profile.to_dict()["nodes"][0]["renders"], "types/b.yaml")
+        lines = profile.to_collapsed().splitlines()
+        self.assertIn("dictionaries/a.yaml;types/b.yaml", [line.rsplit(" ", 1)[0] for line in lines])
+        self.assertTrue(all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines))
+
+
+class TestConfigurationProfile(unittest.TestCase):
+    """Test cases for Configuration.profile_schema"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_complex_refs", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def test_profile_schema(self):
+        """Test a profiled render returns the schema with its files, nodes, loads and lookups"""
+        configuration = Configuration("workshop.yaml")
+        schema, profile = configuration.profile_schema("1.0.0.0")
+        self.assertEqual(schema, configuration.get_json_schema("1.0.0.0"))
+        the_dict = profile.to_dict()
+        files = {file["file"] for file in the_dict["files"]}
+        self.assertIn("dictionaries/workshop.1.0.0.yaml", files)
+        self.assertIn("dictionaries/observation_persona.1.0.0.yaml", files)
+        self.assertIn(("dictionaries/workshop.1.0.0.yaml", "dictionaries/observation_persona.1.0.0.yaml"),
+                      {(node["file"], node["renders"]) for node in the_dict["nodes"]})
+        self.assertGreaterEqual(the_dict["max_ref_depth"], 1)
+        self.assertGreaterEqual(the_dict["loads"]["Dictionary"]["count"], 8)
+        self.assertGreater(the_dict["enum_lookups"]["count"], 0)
+        self.assertIsNone(current_profile())
+
+    def test_profile_bypasses_caches(self):
+        """Test a cached schema is rendered again to be profiled, reusing registered services"""
+        configuration = Configuration("workshop.yaml")
+        configuration.get_json_schema("1.0.0.0")
+        _, profile = configuration.profile_schema("1.0.0.0")
+        self.assertTrue(profile.files)
+        self.assertGreater(profile.registry_hits, 0)
+        self.assertNotIn("Type", profile.loads)
+
+    def test_profile_both_formats(self):
+        """Test both schemas are profiled in one render"""
+        configuration = Configuration("workshop.yaml")
+        schemas, _ = configuration.profile_schema("1.0.0.0", "both")
+        self.assertEqual(schemas, configuration.get_schemas("1.0.0.0"))
+
+    def test_profile_errors(self):
+        """Test unknown formats and versions raise, and leave no frames behind"""
+        configuration = Configuration("workshop.yaml")
+        with self.assertRaises(ConfiguratorException) as context:
+            configuration.profile_schema("1.0.0.0", "xml")
+        self.assertEqual(context.exception.event.id, "CFG-11")
+        with self.assertRaises(ConfiguratorException):
+            configuration.profile_schema("9.9.9.9")
+        os.remove(os.path.join(self.temp_dir, "dictionaries", "observation_hills.1.0.0.yaml"))
+        with RenderProfile() as profile:
+            with self.assertRaises(ConfiguratorException):
+                Configuration("workshop.yaml").get_schemas("1.0.0.0")
+        self.assertEqual(profile.depth, 0)
+
+    def test_cli_profile(self):
+        """Test the profile command writes collapsed stacks"""
+        output = os.path.join(self.temp_dir, "profile.folded")
+        with patch('builtins.print'):
+            self.assertEqual(cli.main(["profile", "workshop.yaml", "1.0.0.0", "--output", output]), 0)
+        with open(output) as f:
+            stacks = [line.rsplit(" ", 1)[0] for line in f]
+        self.assertTrue(all(stack.startswith("dictionaries/workshop.1.0.0.yaml") for stack in stacks))
+
+if __name__ == '__main__':
+    unittest.main()
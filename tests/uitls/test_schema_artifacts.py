@@ -0,0 +1,135 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.schema_artifacts import SchemaArtifacts
+from configurator.utils.schema_cache import SchemaCache
+from configurator.utils.file_io import FileIO
+from configurator.services.configuration_services import Configuration
+from configurator.services.dictionary_services import Dictionary
+from configurator.services.enumeration_service import Enumerations
+from configurator.services.type_services import Type
+from configurator.services.property.compiled import RENDERER_VERSION
+from tests.helpers import age, age_tree, reset_caches
+
+
+class TestSchemaArtifacts(unittest.TestCase):
+    """Test cases for SchemaArtifacts and their use for locked versions"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_template", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        self.artifact_dir = tempfile.mkdtemp()
+        self._original_artifact_folder = self.config.SCHEMA_ARTIFACT_FOLDER
+        self.config.SCHEMA_ARTIFACT_FOLDER = self.artifact_dir
+        self.folder = SchemaArtifacts.folder()
+        self._input_files_before = self._input_files()
+        self.dependency = os.path.join(self.temp_dir, "types", "sentence.yaml")
+        self.dependencies = {(os.path.dirname(self.dependency), "sentence.yaml"): os.stat(self.dependency)}
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.artifact_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        self.config.SCHEMA_ARTIFACT_FOLDER = self._original_artifact_folder
+        reset_caches()
+
+    def test_write_then_read(self):
+        """Test an artifact is read back with its hash and dependencies"""
+        content_hash = SchemaArtifacts.write("sample", "1.0.0.1", "json", {"type": "object"}, self.dependencies, RENDERER_VERSION)
+        content, read_hash, dependencies = SchemaArtifacts.read("sample", "1.0.0.1", "json", RENDERER_VERSION)
+        self.assertEqual(json.loads(content), {"type": "object"})
+        self.assertEqual(read_hash, content_hash)
+        self.assertEqual(set(dependencies), set(self.dependencies))
+        self.assertIsNone(SchemaArtifacts.read("sample", "1.0.0.1", "bson", RENDERER_VERSION))
+
+    def test_changed_dependency_or_content_is_ignored(self):
+        """Test an artifact is not served once a dependency or its content changed"""
+        SchemaArtifacts.write("sample", "1.0.0.1", "json", {"type": "object"}, self.dependencies, RENDERER_VERSION)
+        age(self.dependency, 5)
+        self.assertIsNotNone(SchemaArtifacts.read("sample", "1.0.0.1", "json", RENDERER_VERSION))
+        with open(self.dependency, 'a') as f:
+            f.write("_edited: true\n")
+        age(self.dependency, 4)
+        self.assertIsNone(SchemaArtifacts.read("sample", "1.0.0.1", "json", RENDERER_VERSION))
+        dependencies = {(os.path.dirname(self.dependency), "sentence.yaml"): os.stat(self.dependency)}
+        SchemaArtifacts.write("sample", "1.0.0.1", "json", {"type": "object"}, dependencies, RENDERER_VERSION)
+        self.assertIsNotNone(SchemaArtifacts.read("sample", "1.0.0.1", "json", RENDERER_VERSION))
+        with open(os.path.join(self.folder, SchemaArtifacts.file_name("sample", "1.0.0.1", "json")), 'w') as f:
+            f.write('{"type": "array"}')
+        self.assertIsNone(SchemaArtifacts.read("sample", "1.0.0.1", "json", RENDERER_VERSION))
+
+    def test_other_renderer_is_ignored(self):
+        """Test an artifact rendered by another renderer version is not served"""
+        SchemaArtifacts.write("sample", "1.0.0.1", "json", {"type": "object"}, self.dependencies, RENDERER_VERSION - 1)
+        self.assertIsNone(SchemaArtifacts.read("sample", "1.0.0.1", "json", RENDERER_VERSION))
+
+    def test_folder_is_outside_input_folder(self):
+        """Test artifacts are kept per input folder and disabled when the folder is empty or inside the input folder"""
+        self.assertEqual(os.path.dirname(self.folder), self.artifact_dir)
+        for folder in ["", os.path.join(self.temp_dir, "schema_artifacts"), self.temp_dir]:
+            self.config.SCHEMA_ARTIFACT_FOLDER = folder
+            self.assertIsNone(SchemaArtifacts.folder())
+            self.assertIsNone(SchemaArtifacts.write("sample", "1.0.0.1", "json", {}, self.dependencies, RENDERER_VERSION))
+            self.assertIsNone(SchemaArtifacts.read("sample", "1.0.0.1", "json", RENDERER_VERSION))
+
+    def test_reads_do_not_write(self):
+        """Test rendering a locked version writes no artifact, only lock_all does"""
+        configuration = Configuration("sample.yaml")
+        configuration.get_version("1.0.1.2")._locked = True
+        configuration.get_json_schema("1.0.1.2")
+        configuration.get_schemas("1.0.1.2")
+        self.assertFalse(os.path.exists(self.folder))
+        self.assertEqual(self._input_files(), self._input_files_before)
+
+    def _input_files(self):
+        return sorted(os.path.relpath(os.path.join(root, name), self.temp_dir) for root, _, files in os.walk(self.temp_dir) for name in files)
+
+    def test_racy_dependencies_are_not_written(self):
+        """Test a schema rendered from a file changed too recently is not kept"""
+        os.utime(self.dependency)
+        dependencies = {(os.path.dirname(self.dependency), "sentence.yaml"): os.stat(self.dependency)}
+        self.assertIsNone(SchemaArtifacts.write("sample", "1.0.0.1", "json", {}, dependencies, RENDERER_VERSION))
+        self.assertFalse(os.path.exists(self.folder))
+
+    def test_locked_versions_are_served_from_artifacts(self):
+        """Test lock_all writes artifacts that are served without rendering, and unlocking removes them"""
+        expected = Configuration("sample.yaml").get_schemas("1.0.1.2")
+        Configuration.lock_all()
+        self.assertFalse([f for f in self._input_files() if f.endswith(".meta.json")])
+        self.assertTrue(os.path.exists(os.path.join(self.folder, "sample.1.0.1.2.bson.json")))
+        SchemaCache.get_instance().clear()
+        with patch('configurator.services.configuration_version.Dictionary') as mock_dictionary:
+            self.assertEqual(Configuration("sample.yaml").get_json_schema("1.0.1.2"), expected["json_schema"])
+            self.assertEqual(Configuration("sample.yaml").get_schemas("1.0.1.2"), expected)
+            mock_dictionary.assert_not_called()
+        Configuration.lock_all(False)
+        self.assertFalse(os.path.exists(os.path.join(self.folder, "sample.1.0.1.2.bson.json")))
+
+    def test_artifacts_outlive_locking_their_dependencies(self):
+        """Test locking the dictionaries, types and enumerators after the configurations keeps the artifacts"""
+        for service_class in (Dictionary, Type, Enumerations):
+            service_class.lock_all(False)
+        age_tree(self.temp_dir)
+        reset_caches()
+        expected = Configuration("sample.yaml").get_schemas("1.0.1.2")
+        Configuration.lock_all()
+        for service_class in (Dictionary, Type, Enumerations):
+            service_class.lock_all()
+        self.assertTrue(FileIO.get_document("types", "sentence.yaml")["_locked"])
+        reset_caches()
+        with patch('configurator.services.configuration_version.Dictionary') as mock_dictionary:
+            self.assertEqual(Configuration("sample.yaml").get_schemas("1.0.1.2"), expected)
+            mock_dictionary.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
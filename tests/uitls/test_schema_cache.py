@@ -0,0 +1,175 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.document_cache import MISSING
+from configurator.utils.file_io import FileIO
+from configurator.utils.schema_cache import SchemaCache, DependencyRecorder, record_dependency
+from configurator.services.configuration_services import Configuration
+from configurator.services.dictionary_services import Dictionary
+from configurator.services.dependency_graph import DependencyGraph
+from tests.helpers import age, age_tree, reset_caches
+
+
+class TestSchemaCache(unittest.TestCase):
+    """Test cases for SchemaCache class"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "dictionary.yaml")
+        with open(self.file_path, 'w') as f:
+            f.write("root: {}\n")
+        age(self.file_path)
+        self.dependencies = {(self.temp_dir, "dictionary.yaml"): os.stat(self.file_path)}
+        self.cache = SchemaCache(max_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_miss_then_hit(self):
+        """Test a put schema is returned as a copy on the next get"""
+        self.assertIs(self.cache.get(("a", "1", "json")), MISSING)
+        self.cache.put(("a", "1", "json"), self.dependencies, {"type": "object"})
+        schema = self.cache.get(("a", "1", "json"))
+        schema["type"] = "changed"
+        self.assertEqual(self.cache.get(("a", "1", "json")), {"type": "object"})
+        self.assertEqual(self.cache.hits, 2)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_changed_dependency_is_a_miss(self):
+        """Test an entry is dropped when a file it was rendered from changes"""
+        self.cache.put(("a", "1", "json"), self.dependencies, {"type": "object"})
+        with open(self.file_path, 'w') as f:
+            f.write("root: {changed: true}\n")
+        age(self.file_path, 5)
+        self.assertIs(self.cache.get(("a", "1", "json")), MISSING)
+
+    def test_invalidate_file_drops_dependents_only(self):
+        """Test invalidating a file drops exactly the entries the DependencyGraph finds rendered from it"""
+        input_folder = Config.get_instance().INPUT_FOLDER
+        a, b = os.path.join(input_folder, "configurations", "a.yaml"), os.path.join(input_folder, "configurations", "b.yaml")
+        for key in [(a, "1", "json"), (a, "1", "bson"), (a, "2", "json"), (b, "1", "json")]:
+            self.cache.put(key, self.dependencies, {"type": "object"})
+        with patch.object(DependencyGraph, "schema_entries", return_value={("configurations", "a.yaml", "1")}) as mock_entries:
+            self.cache.invalidate_file(os.path.join(input_folder, "types"), "word.yaml")
+        mock_entries.assert_called_once_with("types", "word.yaml")
+        self.assertEqual(list(self.cache._entries), [(a, "2", "json"), (b, "1", "json")])
+
+    def test_renders_without_dependencies_are_not_cached(self):
+        """Test a render that read no files is not cached"""
+        self.cache.put(("a", "1", "json"), {}, {"type": "object"})
+        self.assertIs(self.cache.get(("a", "1", "json")), MISSING)
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted"""
+        for name in ["a", "b", "c"]:
+            self.cache.put((name, "1", "json"), self.dependencies, {"name": name})
+        self.assertIs(self.cache.get(("a", "1", "json")), MISSING)
+        self.assertEqual(list(self.cache._entries), [("b", "1", "json"), ("c", "1", "json")])
+
+    def test_nested_recorders(self):
+        """Test a read is recorded by every active recorder"""
+        stat = os.stat(self.file_path)
+        with DependencyRecorder() as outer:
+            record_dependency("folder", "outer.yaml", stat)
+            with DependencyRecorder() as inner:
+                record_dependency("folder", "inner.yaml", stat)
+        record_dependency("folder", "after.yaml", stat)
+        self.assertEqual(set(outer), {("folder", "outer.yaml"), ("folder", "inner.yaml")})
+        self.assertEqual(set(inner), {("folder", "inner.yaml")})
+
+    def test_nested_recorders_with_equal_dependencies(self):
+        """Test a recorder leaves the recorder it is nested in active, even when both are empty"""
+        stat = os.stat(self.file_path)
+        with DependencyRecorder() as outer:
+            with DependencyRecorder():
+                pass
+            record_dependency("folder", "outer.yaml", stat)
+        self.assertEqual(set(outer), {("folder", "outer.yaml")})
+
+
+class TestConfigurationSchemaCache(unittest.TestCase):
+    """Test cases for schema caching in Configuration.get_json_schema and get_bson_schema"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_template", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def _render_all(self):
+        configuration = Configuration("sample.yaml")
+        return {(version, schema_format): getattr(configuration, f"get_{schema_format}_schema")(version)
+                for version in ["1.0.0.1", "1.0.1.2"] for schema_format in ["json", "bson"]}
+
+    def _edit(self, folder_name, file_name, old, new):
+        file_path = os.path.join(self.temp_dir, folder_name, file_name)
+        with open(file_path) as f:
+            content = f.read()
+        with open(file_path, 'w') as f:
+            f.write(content.replace(old, new))
+        age(file_path, 5)
+
+    def test_warm_render_does_not_render(self):
+        """Test a second request is served without building the dictionary"""
+        expected = self._render_all()
+        with patch('configurator.services.configuration_version.Dictionary') as mock_dictionary:
+            self.assertEqual(self._render_all(), expected)
+            mock_dictionary.assert_not_called()
+        self.assertEqual(SchemaCache.get_instance().hits, 4)
+
+    def test_dependencies_are_recorded(self):
+        """Test the dictionary, its types and only its enumerators version are dependencies"""
+        self._render_all()
+        entry = SchemaCache.get_instance()._entries[(os.path.join(self.temp_dir, "configurations", "sample.yaml"), "1.0.1.2", "json")]
+        dependencies = {file_name for _, file_name in entry[0]}
+        self.assertIn("sample.1.0.1.yaml", dependencies)
+        self.assertIn("sentence.yaml", dependencies)
+        self.assertIn("enumerations.2.yaml", dependencies)
+        self.assertNotIn("enumerations.1.yaml", dependencies)
+        self.assertNotIn("sample.1.0.0.yaml", dependencies)
+
+    def test_outside_edit_invalidates_affected_entries(self):
+        """Test editing a type re-renders only the schemas that use it"""
+        self._render_all()
+        self._edit("types", "sentence.yaml", "description:", "description: Edited")
+        with patch.object(Dictionary, 'to_json_schema', autospec=True, side_effect=Dictionary.to_json_schema) as mock_render:
+            Configuration("sample.yaml").get_json_schema("1.0.0.1")
+            mock_render.assert_not_called()
+            Configuration("sample.yaml").get_json_schema("1.0.1.2")
+            mock_render.assert_called()
+
+    def test_put_document_invalidates_dependents(self):
+        """Test saving an enumerators file through FileIO drops the schemas of that version"""
+        self._render_all()
+        document = FileIO.get_document("enumerators", "enumerations.1.yaml")
+        document["enumerators"][0]["values"].append({"value": "new_value", "description": "Added"})
+        FileIO.put_document("enumerators", "enumerations.1.yaml", document)
+        self.assertEqual(SchemaCache.get_instance().to_dict()["size"], 2)
+
+    def test_get_schemas_renders_once(self):
+        """Test get_schemas walks the dictionary once and fills both cache entries"""
+        expected = self._render_all()
+        SchemaCache.get_instance().clear()
+        with patch.object(Dictionary, 'to_json_schema') as mock_json, patch.object(Dictionary, 'to_bson_schema') as mock_bson:
+            schemas = Configuration("sample.yaml").get_schemas("1.0.1.2")
+            mock_json.assert_not_called()
+            mock_bson.assert_not_called()
+        self.assertEqual(schemas, {"json_schema": expected[("1.0.1.2", "json")], "bson_schema": expected[("1.0.1.2", "bson")]})
+        with patch('configurator.services.configuration_version.Dictionary') as mock_dictionary:
+            self.assertEqual(Configuration("sample.yaml").get_bson_schema("1.0.1.2"), expected[("1.0.1.2", "bson")])
+            mock_dictionary.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import shutil
+import tempfile
+import unittest
+from configurator.utils.config import Config
+from configurator.utils.configurator_exception import ConfiguratorException
+from configurator.utils.schema_defs import factor_defs, defs_options
+from configurator.services.configuration_services import Configuration
+from tests.helpers import age_tree, reset_caches
+
+
+def resolve(schema, defs=None):
+    """Inline every $ref of a factored schema."""
+    defs = schema.get("$defs", {}) if defs is None else defs
+    if isinstance(schema, list):
+        return [resolve(item, defs) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    if "$ref" in schema:
+        return resolve(defs[schema["$ref"].split("/")[-1]], defs)
+    return {key: resolve(value, defs) for key, value in schema.items() if key != "$defs"}
+
+
+ADDRESS = {
+    "description": "An address",
+    "type": "object",
+    "properties": {
+        "street": {"description": "Street", "type": "string", "maxLength": 80},
+        "city": {"description": "City", "type": "string", "maxLength": 40},
+    },
+    "required": ["street"],
+    "additionalProperties": False,
+}
+
+
+class TestFactorDefs(unittest.TestCase):
+    """Test cases for factor_defs"""
+
+    def setUp(self):
+        self.schema = {
+            "description": "Root",
+            "type": "object",
+            "properties": {
+                "home": dict(ADDRESS),
+                "work": dict(ADDRESS),
+                "history": {"description": "Past addresses", "type": "array", "items": dict(ADDRESS)},
+                "name": {"description": "Name", "type": "string"},
+            },
+            "additionalProperties": False,
+        }
+
+    def test_repeated_subschema_is_defined_once(self):
+        """Test a subschema used three times is emitted once under $defs"""
+        factored = factor_defs(self.schema, min_size=0)
+        self.assertEqual(list(factored["$defs"]), ["home"])
+        self.assertEqual(factored["properties"]["home"], {"$ref": "#/$defs/home"})
+        self.assertEqual(factored["properties"]["work"], {"$ref": "#/$defs/home"})
+        self.assertEqual(factored["properties"]["history"]["items"], {"$ref": "#/$defs/home"})
+        self.assertEqual(resolve(factored), self.schema)
+
+    def test_nested_repeats_inside_a_def_are_not_split(self):
+        """Test subschemas only repeated inside a $defs entry stay inline"""
+        factored = factor_defs(self.schema, min_size=0)
+        self.assertEqual(factored["$defs"]["home"]["properties"]["street"]["type"], "string")
+
+    def test_thresholds(self):
+        """Test min_uses and min_size leave smaller or rarer subschemas inline"""
+        self.assertIs(factor_defs(self.schema, min_uses=4, min_size=0), self.schema)
+        self.assertIs(factor_defs(self.schema, min_size=10_000), self.schema)
+        self.assertEqual(list(factor_defs(self.schema, min_uses=2, min_size=0)["$defs"]), ["home"])
+
+    def test_leaf_repeats(self):
+        """Test repeated leaves get their own $defs entries with unique names"""
+        schema = {"type": "object", "properties": {
+            "a": {"type": "string", "description": "Same"},
+            "b": {"type": "string", "description": "Same"},
+            "c": {"type": "object", "properties": {"a": {"type": "number"}, "x": {"type": "number"}}},
+        }}
+        factored = factor_defs(schema, min_size=0)
+        self.assertEqual(sorted(factored["$defs"]), ["a", "a_2"])
+        self.assertEqual(resolve(factored), schema)
+
+    def test_input_is_not_changed(self):
+        """Test the schema passed in is left as it was"""
+        expected = {"properties": {name: dict(value) for name, value in self.schema["properties"].items()}}
+        factor_defs(self.schema, min_size=0)
+        self.assertEqual(self.schema["properties"], expected["properties"])
+        self.assertNotIn("$defs", self.schema)
+
+    def test_deep_schema_does_not_recurse(self):
+        """Test a schema deeper than the Python recursion limit is factored"""
+        schema = {"type": "string"}
+        for _ in range(1500):
+            schema = {"type": "object", "properties": {"next": schema, "flag": {"type": "boolean"}}}
+        factored = factor_defs(schema, min_size=0)
+        self.assertIn("flag", factored["$defs"])
+
+
+class TestDefsOptions(unittest.TestCase):
+    """Test cases for defs_options"""
+
+    def test_defaults(self):
+        """Test defs is off unless asked for, with default thresholds"""
+        self.assertIsNone(defs_options({}))
+        self.assertIsNone(defs_options({"defs": "false"}))
+        self.assertEqual(defs_options({"defs": "true"}), {"min_uses": 2, "min_size": 100})
+        self.assertEqual(defs_options({"defs": "true", "min_uses": "3", "min_size": "0"}), {"min_uses": 3, "min_size": 0})
+
+    def test_invalid_values(self):
+        """Test invalid thresholds raise DEF-01"""
+        for query in [{"defs": "true", "min_uses": "x"}, {"defs": "true", "min_uses": "1"}, {"defs": "true", "min_size": "-1"}]:
+            with self.assertRaises(ConfiguratorException) as context:
+                defs_options(query)
+            self.assertEqual(context.exception.event.id, "DEF-01")
+
+
+class TestConfigurationDefs(unittest.TestCase):
+    """Test cases for Configuration.get_json_schema with defs"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_complex_refs", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def test_factored_schema_resolves_to_the_inline_schema(self):
+        """Test the $defs schema of a version expands back to its inline schema"""
+        configuration = Configuration("workshop.yaml")
+        version = configuration.get_latest_version().version_str
+        inline = configuration.get_json_schema(version)
+        factored = configuration.get_json_schema(version, {"min_uses": 2, "min_size": 0})
+        self.assertIn("$defs", factored)
+        self.assertLess(len(str(factored)), len(str(inline)))
+        self.assertEqual(resolve(factored), inline)
+        self.assertEqual(configuration.get_json_schema(version), inline)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import io
+import os
+import json
+import shutil
+import zipfile
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.configurator_exception import ConfiguratorException
+from configurator.utils.schema_cache import SchemaCache
+from configurator.utils.schema_export import export_options, to_ndjson, to_zip, to_zip_stream
+from configurator.services.configuration_services import Configuration
+from configurator.services.dictionary_services import Dictionary
+from configurator import cli
+from tests.helpers import age_tree, reset_caches
+
+
+class TestExportOptions(unittest.TestCase):
+    """Test cases for export_options and the export writers"""
+
+    def test_defaults_and_values(self):
+        """Test the default and selected formats and outputs"""
+        self.assertEqual(export_options({}), (("json", "bson"), "ndjson"))
+        self.assertEqual(export_options({"formats": "bson", "output": "zip"}), (("bson",), "zip"))
+        self.assertEqual(export_options({"formats": "json, json"}), (("json",), "ndjson"))
+
+    def test_invalid_values(self):
+        """Test unknown formats and outputs raise EXP-01"""
+        for query in [{"formats": "xml"}, {"formats": ""}, {"output": "tar"}]:
+            with self.assertRaises(ConfiguratorException) as context:
+                export_options(query)
+            self.assertEqual(context.exception.event.id, "EXP-01")
+
+    def test_writers(self):
+        """Test records are written as NDJSON lines and zip entries"""
+        records = [
+            {"configuration": "sample.yaml", "version": "1.0.0.1", "format": "json", "schema": {"type": "object"}},
+            {"configuration": "broken.yaml", "version": None, "error": {"id": "CFG-01"}},
+        ]
+        lines = list(to_ndjson(records))
+        self.assertEqual([json.loads(line) for line in lines], records)
+        buffer = io.BytesIO()
+        self.assertEqual(to_zip(records, buffer), {"schemas": 1, "errors": 1})
+        with zipfile.ZipFile(buffer) as archive:
+            self.assertEqual(json.loads(archive.read("json_schema/sample.1.0.0.1.json")), {"type": "object"})
+            self.assertEqual(json.loads(archive.read("errors.json")), [records[1]])
+
+    def test_zip_stream(self):
+        """Test the zip archive is streamed one chunk per entry"""
+        records = [
+            {"configuration": "sample.yaml", "version": version, "format": "json", "schema": {"type": "object"}}
+            for version in ["1.0.0.1", "1.0.1.2"]
+        ] + [{"configuration": "broken.yaml", "version": None, "error": {"id": "CFG-01"}}]
+        chunks = list(to_zip_stream(iter(records)))
+        self.assertEqual(len(chunks), 4)  # two schemas, errors.json and the directory
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as archive:
+            self.assertEqual(archive.namelist(), ["json_schema/sample.1.0.0.1.json", "json_schema/sample.1.0.1.2.json", "errors.json"])
+            self.assertEqual(json.loads(archive.read("json_schema/sample.1.0.1.2.json")), {"type": "object"})
+            self.assertEqual(json.loads(archive.read("errors.json")), [records[2]])
+
+
+class TestConfigurationExport(unittest.TestCase):
+    """Test cases for Configuration.export_schemas"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_template", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def test_export_renders_every_version_and_format(self):
+        """Test every version is exported in both formats, each rendered once"""
+        configuration = Configuration("sample.yaml")
+        expected = [(version.version_str, schema_format, getattr(configuration, f"get_{schema_format}_schema")(version.version_str))
+                    for version in configuration.versions for schema_format in ("json", "bson")]
+        SchemaCache.get_instance().clear()
+        with patch.object(Dictionary, 'to_json_schema') as mock_json:
+            records = list(Configuration.export_schemas())
+            mock_json.assert_not_called()
+        self.assertEqual([(r["version"], r["format"], r["schema"]) for r in records], expected)
+        self.assertEqual({r["configuration"] for r in records}, {"sample.yaml"})
+
+    def test_failures_are_records(self):
+        """Test a configuration that can not be rendered is reported, not raised"""
+        with open(os.path.join(self.temp_dir, "configurations", "broken.yaml"), 'w') as f:
+            f.write("title: Broken\nversions:\n- version: 1.0.0.1\n")
+        records = list(Configuration.export_schemas(("json",)))
+        errors = [r for r in records if "error" in r]
+        self.assertEqual([(r["configuration"], r["version"]) for r in errors], [("broken.yaml", "1.0.0.1")])
+        self.assertEqual(len(records) - len(errors), 2)
+
+    def test_cli_export_zip(self):
+        """Test the export command writes a zip archive"""
+        output = os.path.join(self.temp_dir, "schemas.zip")
+        with patch('builtins.print'):
+            self.assertEqual(cli.main(["export", "--output", output, "--formats", "bson"]), 0)
+        with zipfile.ZipFile(output) as archive:
+            self.assertEqual(sorted(archive.namelist()), ["bson_schema/sample.1.0.0.1.json", "bson_schema/sample.1.0.1.2.json", "errors.json"])
+
+if __name__ == '__main__':
+    unittest.main()
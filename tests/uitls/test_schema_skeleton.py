@@ -0,0 +1,194 @@
+import os
+import shutil
+import tempfile
+import unittest
+import yaml
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.configurator_exception import ConfiguratorException
+from configurator.utils.schema_cache import SchemaCache
+from configurator.utils.schema_skeleton import SchemaSkeleton, SlotEnumerations, EnumSlot
+from configurator.services.configuration_services import Configuration
+from configurator.services.dictionary_services import Dictionary
+from configurator.services.enumeration_service import Enumerations
+from configurator.services.enumerators import Enumerators
+from configurator.services.property.compiled import CompiledProperty
+from tests.helpers import age_tree, reset_caches
+
+ROOT = {"name": "root", "description": "Root", "type": "object", "properties": [
+    {"name": "name", "description": "Name", "type": "simple", "schema": {"type": "string", "maxLength": 40}},
+    {"name": "status", "description": "Status", "type": "enum", "enums": "status"},
+    {"name": "tags", "description": "Tags", "type": "enum_array", "enums": "tags"},
+    {"name": "address", "description": "Address", "type": "object", "properties": [
+        {"name": "street", "description": "Street", "type": "simple", "schema": {"type": "string"}},
+    ]},
+    {"name": "items", "description": "Items", "type": "array", "items": {"name": "item", "description": "Item", "type": "one_of", "properties": [
+        {"name": "kind", "description": "Kind", "type": "enum", "enums": "status"},
+        {"name": "fixed", "description": "Fixed", "type": "constant", "constant": "fixed"},
+    ]}},
+]}
+
+
+def enumerations(version: int, status: list, tags: list = ("a", "b")) -> Enumerations:
+    return Enumerations(file_name=f"enumerations.{version}.yaml", document={"version": version, "enumerators": [
+        {"name": "status", "values": [{"value": value} for value in status]},
+        {"name": "tags", "values": [{"value": value} for value in tags]},
+    ]})
+
+
+class TestSchemaSkeleton(unittest.TestCase):
+    """Test cases for SchemaSkeleton"""
+
+    def setUp(self):
+        self.compiled = CompiledProperty.compile(ROOT)
+        self.first = enumerations(0, ["active", "archived"])
+        self.second = enumerations(1, ["draft", "active", "archived"], ["c"])
+
+    def test_fill_matches_render(self):
+        """Test a filled skeleton is the render with the same enumerations, in every format"""
+        for schema_format, render in [("json", self.compiled.to_json_schema), ("bson", self.compiled.to_bson_schema), ("both", self.compiled.to_schemas)]:
+            skeleton = self.compiled.to_skeleton(schema_format)
+            for the_enumerations in (self.first, self.second):
+                self.assertEqual(skeleton.fill(the_enumerations), render(the_enumerations))
+
+    def test_fill_shares_what_has_no_enums(self):
+        """Test fill copies the paths to the enum slots and shares the rest with the skeleton"""
+        skeleton = self.compiled.to_skeleton("json")
+        self.assertEqual(skeleton.slots, 3)
+        first, second = skeleton.fill(self.first), skeleton.fill(self.second)
+        self.assertIsNot(first, second)
+        self.assertIs(first["properties"]["address"], second["properties"]["address"])
+        self.assertIs(first["properties"]["name"], skeleton.schema["properties"]["name"])
+        self.assertIsNot(first["properties"]["items"]["items"]["oneOf"][0], second["properties"]["items"]["items"]["oneOf"][0])
+        self.assertEqual(second["properties"]["items"]["items"]["oneOf"][0]["enum"], ["active", "archived", "draft"])
+        self.assertIsInstance(skeleton.schema["properties"]["status"]["enum"][0], EnumSlot)
+
+    def test_fill_without_slots(self):
+        """Test a skeleton without enums is filled with a copy of its root"""
+        skeleton = SchemaSkeleton({"type": "object", "properties": {"name": {"type": "string"}}})
+        filled = skeleton.fill(self.first)
+        self.assertEqual(filled, skeleton.schema)
+        self.assertIsNot(filled, skeleton.schema)
+        self.assertEqual(skeleton.slots, 0)
+
+    def test_missing_enumerator(self):
+        """Test filling with enumerations that lack an enumerator raises its error"""
+        skeleton = SchemaSkeleton(self.compiled.to_json_schema(SlotEnumerations()))
+        with self.assertRaises(ConfiguratorException) as context:
+            skeleton.fill(Enumerations(file_name="enumerations.2.yaml", document={"version": 2, "enumerators": []}))
+        self.assertEqual(context.exception.event.id, "ENU-02")
+
+
+class TestConfigurationSkeleton(unittest.TestCase):
+    """Test cases for rendering the versions of a configuration that share a dictionary"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for folder in ["configurations", "dictionaries", "types", "enumerators"]:
+            os.makedirs(os.path.join(self.temp_dir, folder))
+        self._write("types", "label.yaml", {"root": {"name": "label", "description": "A label", "type": "object", "properties": [
+            {"name": "text", "description": "Text", "type": "simple", "schema": {"type": "string"}},
+            {"name": "tone", "description": "Tone", "type": "enum", "enums": "tags"},
+        ]}})
+        self._write("dictionaries", "shop.1.0.0.yaml", {"root": {**ROOT, "properties": [*ROOT["properties"],
+            {"name": "label", "description": "Label", "type": "label"}]}})
+        self._write("dictionaries", "shop.1.0.1.yaml", {"root": ROOT})
+        for version, status in enumerate([["active", "archived"], ["draft", "active"], ["active"]]):
+            self._write("enumerators", f"enumerations.{version}.yaml", {"version": version, "enumerators": [
+                {"name": "status", "values": [{"value": value} for value in status]},
+                {"name": "tags", "values": [{"value": "a"}, {"value": "b"}]},
+            ]})
+        self._write("enumerators", "enumerations.3.yaml", {"version": 3, "enumerators": [
+            {"name": "status", "values": [{"value": "active"}]}]})
+        self._write("configurations", "shop.yaml", {"title": "Shop", "versions": [
+            {"version": "1.0.0.0"}, {"version": "1.0.0.1"}, {"version": "1.0.0.3"}, {"version": "1.0.1.2"}]})
+        self.age()
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        reset_caches()
+
+    def age(self, seconds=10):
+        age_tree(self.temp_dir, seconds)
+
+    def _write(self, folder, file_name, document):
+        with open(os.path.join(self.temp_dir, folder, file_name), 'w') as f:
+            yaml.dump(document, f)
+
+    def _render(self, version_str: str, schema_format: str):
+        """The render of a version without its skeleton"""
+        enumerations = Enumerators().get_version(f"shop.{version_str}")
+        dictionary = Dictionary(Configuration("shop.yaml").get_version(version_str).version_number.get_schema_filename())
+        return {"json": dictionary.to_json_schema, "bson": dictionary.to_bson_schema}[schema_format](enumerations)
+
+    def test_shared_dictionary(self):
+        """Test only versions whose dictionary another version renders are filled from a skeleton"""
+        configuration = Configuration("shop.yaml")
+        shared = {version.version_str: version.shared_dictionary for version in configuration.versions}
+        self.assertEqual(shared, {"1.0.0.0": True, "1.0.0.1": True, "1.0.0.3": True, "1.0.1.2": False})
+
+    def test_versions_render_one_skeleton(self):
+        """Test the versions sharing a dictionary render it once and match their renders"""
+        configuration = Configuration("shop.yaml")
+        with patch.object(Dictionary, "to_skeleton", autospec=True, side_effect=Dictionary.to_skeleton) as mock_skeleton:
+            json_schemas = {version: configuration.get_json_schema(version) for version in ["1.0.0.0", "1.0.0.1", "1.0.1.2"]}
+            bson_schema = configuration.get_bson_schema("1.0.0.1")
+        self.assertEqual(mock_skeleton.call_count, 2)  # json and bson
+        self.assertEqual(json_schemas["1.0.0.1"]["properties"]["status"]["enum"], ["active", "draft"])
+        for version, schema in json_schemas.items():
+            self.assertEqual(schema, self._render(version, "json"))
+        self.assertEqual(bson_schema, self._render("1.0.0.1", "bson"))
+        self.assertEqual(configuration.get_schemas("1.0.0.0"), {"json_schema": json_schemas["1.0.0.0"], "bson_schema": self._render("1.0.0.0", "bson")})
+
+    def test_filled_schema_dependencies(self):
+        """Test a schema filled from a cached skeleton depends on the files of the skeleton"""
+        configuration = Configuration("shop.yaml")
+        configuration.get_json_schema("1.0.0.0")
+        configuration.get_json_schema("1.0.0.1")
+        key = configuration._schema_key(configuration.get_version("1.0.0.1"), "json")
+        dependencies = {file_name for _, file_name in SchemaCache.get_instance()._entries[key][0]}
+        self.assertEqual(dependencies, {"shop.1.0.0.yaml", "label.yaml", "enumerations.1.yaml"})
+
+        self._write("types", "label.yaml", {"root": {"name": "label", "description": "A label", "type": "simple", "schema": {"type": "string"}}})
+        self.age(5)
+        schema = configuration.get_json_schema("1.0.0.1")
+        self.assertEqual(schema["properties"]["label"]["type"], "string")
+        self.assertEqual(schema, self._render("1.0.0.1", "json"))
+
+    def test_missing_enumerator(self):
+        """Test a version without an enumerator its dictionary uses raises the error of a render"""
+        configuration = Configuration("shop.yaml")
+        configuration.get_json_schema("1.0.0.0")
+        with self.assertRaises(ConfiguratorException) as context:
+            configuration.get_json_schema("1.0.0.3")
+        with self.assertRaises(ConfiguratorException) as render_context:
+            self._render("1.0.0.3", "json")
+        error, render_error = context.exception.event.sub_events[0].sub_events[0], render_context.exception.event
+        self.assertEqual((error.id, error.data), (render_error.id, render_error.data))
+        self.assertEqual(error.id, "ENU-02")
+
+    def test_profiled_render_is_not_filled(self):
+        """Test a profiled render renders the dictionary and its enumerators"""
+        configuration = Configuration("shop.yaml")
+        configuration.get_json_schema("1.0.0.0")
+        with patch.object(Dictionary, "to_skeleton") as mock_skeleton:
+            _, profile = configuration.profile_schema("1.0.0.1")
+            mock_skeleton.assert_not_called()
+        self.assertGreater(profile.to_dict()["enum_lookups"]["count"], 0)
+
+    def test_no_schema_cache(self):
+        """Test versions are rendered without skeletons when SCHEMA_CACHE_SIZE is 0"""
+        SchemaCache._instance = SchemaCache(max_size=0)
+        configuration = Configuration("shop.yaml")
+        with patch.object(Dictionary, "to_skeleton") as mock_skeleton:
+            self.assertEqual(configuration.get_json_schema("1.0.0.1"), self._render("1.0.0.1", "json"))
+            mock_skeleton.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
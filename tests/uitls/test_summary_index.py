@@ -0,0 +1,132 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from configurator.utils.config import Config
+from configurator.utils.document_cache import FolderCache
+from configurator.utils.file_io import FileIO, dump_yaml
+from configurator.utils.summary_index import SummaryIndex, index_file_name
+from configurator.services.configuration_services import Configuration
+from configurator.services.type_services import Type
+from configurator import cli
+from tests.helpers import age, age_tree, reset_caches
+
+
+class TestSummaryIndex(unittest.TestCase):
+    """Test cases for SummaryIndex"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        shutil.copytree("./tests/test_cases/passing_template", self.temp_dir, dirs_exist_ok=True)
+        age_tree(self.temp_dir)
+        self.config = Config.get_instance()
+        self.config.initialize()
+        self._original_input_folder = self.config.INPUT_FOLDER
+        self.config.INPUT_FOLDER = self.temp_dir
+        self.index_dir = tempfile.mkdtemp()
+        self._original_index_folder = self.config.SUMMARY_INDEX_FOLDER
+        self.config.SUMMARY_INDEX_FOLDER = self.index_dir
+        self.folder = self.config.get_output_folder("SUMMARY_INDEX_FOLDER")
+        self.type_index = os.path.join(self.folder, index_file_name("types"))
+        self._input_files_before = self._input_files()
+        reset_caches()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        shutil.rmtree(self.index_dir, ignore_errors=True)
+        self.config.INPUT_FOLDER = self._original_input_folder
+        self.config.SUMMARY_INDEX_FOLDER = self._original_index_folder
+        reset_caches()
+
+    def _input_files(self):
+        return sorted(os.path.relpath(os.path.join(root, name), self.temp_dir) for root, _, files in os.walk(self.temp_dir) for name in files)
+
+    def _write_outside_api(self, folder_name, file_name, document):
+        file_path = os.path.join(self.temp_dir, folder_name, file_name)
+        with open(file_path, 'w') as f:
+            f.write(dump_yaml(document))
+        age(file_path, 5)
+        # An in place edit does not change the folder mtime (see FolderCache)
+        FolderCache.get_instance().clear()
+
+    def test_summaries_are_indexed(self):
+        """Test the first summary read writes the sidecar and later reads use it"""
+        first = Type.get_types_summary()
+        with open(self.type_index) as f:
+            index = json.load(f)
+        self.assertEqual(set(index["files"]), {item["file_name"] for item in first})
+        self.assertEqual(self._input_files(), self._input_files_before)
+
+        with patch.object(FileIO, 'get_document') as mock_get_document:
+            SummaryIndex.get_instance().clear()
+            self.assertEqual(Type.get_types_summary(), first)
+            mock_get_document.assert_not_called()
+
+    def test_put_and_delete_update_the_index(self):
+        """Test FileIO writes keep the index current"""
+        Type.get_types_summary()
+        FileIO.put_document("types", "new_type.yaml", {"root": {"description": "New type"}, "_locked": True})
+        entries = SummaryIndex.get_instance().get_entries("types")
+        self.assertEqual(entries["new_type.yaml"]["summary"], {"_locked": True, "description": "New type"})
+
+        FileIO.delete_document("types", "new_type.yaml")
+        self.assertNotIn("new_type.yaml", SummaryIndex.get_instance().get_entries("types"))
+
+    def test_other_folders_are_not_indexed(self):
+        """Test writes to folders without a summarizer do not create an index"""
+        FileIO.put_document("enumerators", "extra.yaml", {"version": 9, "enumerators": {}})
+        self.assertFalse(os.path.exists(os.path.join(self.folder, index_file_name("enumerators"))))
+
+    def test_outside_edits_are_picked_up(self):
+        """Test a file changed outside of the API is summarized again"""
+        Configuration.get_collections_summary()
+        self._write_outside_api("configurations", "sample.yaml", {
+            "description": "Edited by hand",
+            "versions": [{"version": "1.0.0.1"}, {"version": "2.0.0.0"}],
+        })
+        summary = Configuration.get_collections_summary()
+        sample = [item for item in summary if item["configuration_file"] == "sample.yaml"][0]
+        self.assertEqual(sample["description"], "Edited by hand")
+        self.assertEqual(sample["latest_version"], "2.0.0.0")
+
+    def test_unreadable_sidecar_is_rebuilt(self):
+        """Test a corrupt sidecar is ignored and replaced"""
+        expected = Type.get_types_summary()
+        with open(self.type_index, 'w') as f:
+            f.write("not json")
+        SummaryIndex.get_instance().clear()
+        self.assertEqual(Type.get_types_summary(), expected)
+        with open(self.type_index) as f:
+            self.assertEqual(json.load(f)["format"], 1)
+
+    def test_in_memory_index(self):
+        """Test the index is kept in memory when SUMMARY_INDEX_FOLDER is empty or inside INPUT_FOLDER"""
+        for folder in ["", os.path.join(self.temp_dir, "index")]:
+            self.config.SUMMARY_INDEX_FOLDER = folder
+            SummaryIndex._instance = None
+            first = Type.get_types_summary()
+            with patch.object(FileIO, 'get_document') as mock_get_document:
+                self.assertEqual(Type.get_types_summary(), first)
+                mock_get_document.assert_not_called()
+            FileIO.put_document("types", "new_type.yaml", {"root": {"description": "New type"}})
+            self.assertIn("new_type.yaml", SummaryIndex.get_instance().get_entries("types"))
+            FileIO.delete_document("types", "new_type.yaml")
+            self.assertEqual(self._input_files(), self._input_files_before)
+        self.assertFalse(os.listdir(self.index_dir))
+
+    def test_cli_index_rebuilds(self):
+        """Test the index command drops and rebuilds the indexes"""
+        Type.get_types_summary()
+        with open(self.type_index, 'w') as f:
+            json.dump({"format": 1, "files": {"stale.yaml": {}}}, f)
+        with patch('builtins.print'):
+            self.assertEqual(cli.main(["index"]), 0)
+        with open(self.type_index) as f:
+            self.assertNotIn("stale.yaml", json.load(f)["files"])
+        self.assertTrue(os.path.exists(os.path.join(self.folder, index_file_name("configurations"))))
+
+
+if __name__ == '__main__':
+    unittest.main()
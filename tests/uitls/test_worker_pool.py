@@ -0,0 +1,66 @@
+import time
+import threading
+import unittest
+from unittest.mock import patch
+from configurator.utils.worker_pool import WorkerPool
+
+
+class TestWorkerPool(unittest.TestCase):
+    """Test cases for WorkerPool class"""
+
+    def setUp(self):
+        self.pool = WorkerPool(max_workers=4)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    def test_map_keeps_item_order(self):
+        """Test results are returned in item order, not completion order"""
+        def slow_for_small(item):
+            time.sleep(0.01 * (5 - item))
+            return item * 2
+        self.assertEqual(self.pool.map(slow_for_small, range(5)), [0, 2, 4, 6, 8])
+
+    def test_map_runs_in_parallel(self):
+        """Test items are spread over several threads"""
+        threads = set()
+        barrier = threading.Barrier(4, timeout=5)
+
+        def record(item):
+            threads.add(threading.current_thread().name)
+            barrier.wait()
+            return item
+        self.pool.map(record, range(4))
+        self.assertEqual(len(threads), 4)
+
+    def test_nested_map_runs_inline(self):
+        """Test a map inside a worker does not wait on the pool"""
+        result = self.pool.map(lambda outer: self.pool.map(lambda inner: outer * inner, range(3)), range(8))
+        self.assertEqual(result[2], [0, 2, 4])
+
+    def test_map_raises_first_exception(self):
+        """Test an exception in a call is raised to the caller"""
+        def fail_on_two(item):
+            if item == 2:
+                raise ValueError("two")
+            return item
+        with self.assertRaises(ValueError):
+            self.pool.map(fail_on_two, range(4))
+
+    def test_single_worker_runs_inline(self):
+        """Test a pool of one worker does not start threads"""
+        pool = WorkerPool(max_workers=1)
+        self.assertEqual(pool.map(lambda item: threading.current_thread().name, range(2)),
+                         [threading.current_thread().name] * 2)
+        self.assertIsNone(pool._executor)
+
+    def test_auto_size(self):
+        """Test a max_workers of 0 sizes the pool to the available CPUs"""
+        with patch('configurator.utils.worker_pool.available_cpus', return_value=64):
+            self.assertEqual(WorkerPool(max_workers=0).max_workers, WorkerPool.DEFAULT_MAX_WORKERS)
+        with patch('configurator.utils.worker_pool.available_cpus', return_value=1):
+            self.assertEqual(WorkerPool(max_workers=0).max_workers, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()